@@ -1,9 +1,10 @@
-import tornado.web
-from backend.handler import AppHandler
-from backend.handler.websocket_handler import RocketWebSocketHandler
-
-
 def make_app(settings, logger):
+    # Imported here so that `import backend.<subpackage>` (env workers, tests)
+    # does not pull in tornado and the websocket stack.
+    import tornado.web
+    from backend.handler import AppHandler
+    from backend.handler.websocket_handler import RocketWebSocketHandler
+
     return tornado.web.Application(
         [
             (r"/", AppHandler, dict(logger=logger)),
@@ -1,37 +1,259 @@
 import os
+import copy
+import threading
 import yaml
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
 
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CONFIG_PATH = os.path.join(BASE_DIR, "config.yaml")
 
-class Config:
-    def __init__(self):
-        base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-        self.config_path = os.path.join(base_dir, "config.yaml")
-        self._config = self._load_config()
 
-    def _load_config(self) -> dict[str, Any]:
-        if not os.path.isfile(self.config_path):
-            raise FileNotFoundError(f"Config file not found: {self.config_path}")
+@dataclass(frozen=True)
+class PhysicsSettings:
+    time_step: float
+    gravity: float
+    air_density: float
+    thrust_power: float
+    cold_gas_thrust_power: float
+    fuel_consumption_rate: float
+    radius: float
+    reference_area: float
+    drag_coefficient: float
+    cold_gas_moment_arm: float
+    angular_damping: float
+
+
+@dataclass(frozen=True)
+class LandingGrade:
+    speed_vx: float
+    speed_vy: float
+    angle: float
+
+
+@dataclass(frozen=True)
+class LandingThresholds:
+    perfect: LandingGrade
+    good: LandingGrade
+    ok: LandingGrade
+
+
+@dataclass(frozen=True)
+class RewardSettings:
+    landing_perfect: float
+    landing_good: float
+    landing_ok: float
+    crash_ground: float
+    out_of_bounds: float
+    tipped_over: float
+    throttle_descent_reward_scale: float
+    cold_gas_reward_scale: float
+    free_fall_penalty_scale: float
+    angle_aware_throttle_scale: float
+    horizontal_correction_scale: float
+    throttle_penalty_factor: float
+    rcs_penalty_factor: float
+    correct_direction_bonus: float
+    time_penalty: float
+    gamma: float
+
+
+@dataclass(frozen=True)
+class RLLimits:
+    tip_over_angle: float
+    max_horizontal_position: float
+    max_altitude: float
+    max_episode_steps: int
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """
+    Immutable, typed view of config.yaml, parsed once per file version.
+
+    `raw` is the parsed YAML backing `Config.get`; treat it as read-only.
+    """
+
+    mtime: float
+    raw: dict
+    physics: PhysicsSettings
+    landing: LandingThresholds
+    rewards: RewardSettings
+    rl: RLLimits
+
+
+def _require(raw: dict, key_path: str) -> Any:
+    val: Any = raw
+    keys = key_path.split(".")
+    for i, key in enumerate(keys):
+        if not isinstance(val, dict):
+            raise KeyError(
+                f"Invalid config path: '{'.'.join(keys[:i])}' is not a dict. Cannot access '{key}'."
+            )
+        if key not in val:
+            raise KeyError(f"Missing config key: '{'.'.join(keys[:i+1])}'")
+        val = val[key]
+
+    if val is None:
+        raise ValueError(f"Config key '{key_path}' exists but has no value (None).")
+
+    return val
+
+
+def _landing_grade(raw: dict, grade: str) -> LandingGrade:
+    return LandingGrade(
+        speed_vx=float(_require(raw, f"landing.thresholds.{grade}.speed_vx")),
+        speed_vy=float(_require(raw, f"landing.thresholds.{grade}.speed_vy")),
+        angle=float(_require(raw, f"landing.thresholds.{grade}.angle")),
+    )
+
+
+def _build_snapshot(raw: dict, mtime: float) -> ConfigSnapshot:
+    physics = PhysicsSettings(
+        time_step=float(_require(raw, "simulation.time_step")),
+        gravity=float(_require(raw, "environment.gravity")),
+        air_density=float(_require(raw, "environment.air_density")),
+        thrust_power=float(_require(raw, "rocket.thrust_power")),
+        cold_gas_thrust_power=float(_require(raw, "rocket.cold_gas_thrust_power")),
+        fuel_consumption_rate=float(_require(raw, "rocket.fuel_consumption_rate")),
+        radius=float(_require(raw, "rocket.radius")),
+        reference_area=float(_require(raw, "rocket.reference_area")),
+        drag_coefficient=float(_require(raw, "rocket.drag_coefficient")),
+        cold_gas_moment_arm=float(_require(raw, "rocket.cold_gas_moment_arm")),
+        angular_damping=float(_require(raw, "rocket.angular_damping")),
+    )
+    landing = LandingThresholds(
+        perfect=_landing_grade(raw, "perfect"),
+        good=_landing_grade(raw, "good"),
+        ok=_landing_grade(raw, "ok"),
+    )
+    rewards = RewardSettings(
+        **{
+            name: float(_require(raw, f"rl.rewards.{name}"))
+            for name in RewardSettings.__dataclass_fields__
+        }
+    )
+    rl = RLLimits(
+        tip_over_angle=float(_require(raw, "rl.tip_over_angle")),
+        max_horizontal_position=float(_require(raw, "rl.max_horizontal_position")),
+        max_altitude=float(_require(raw, "rl.max_altitude")),
+        max_episode_steps=int(_require(raw, "rl.max_episode_steps")),
+    )
+    return ConfigSnapshot(
+        mtime=mtime, raw=raw, physics=physics, landing=landing, rewards=rewards, rl=rl
+    )
+
+
+def _parse_config_file(path: str) -> ConfigSnapshot:
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"Config file not found: {path}")
+    mtime = os.path.getmtime(path)
+    try:
+        with open(path, "r") as f:
+            raw = yaml.safe_load(f) or {}
+    except yaml.YAMLError as e:
+        raise ValueError(f"Failed to parse YAML config: {e}")
+    return _build_snapshot(raw, mtime)
+
+
+_lock = threading.Lock()
+_snapshot: Optional[ConfigSnapshot] = None
+_failed_mtime: Optional[float] = None
+_reload_listeners: List[Callable[[ConfigSnapshot], None]] = []
+
+
+def get_snapshot() -> ConfigSnapshot:
+    """Returns the process-wide config snapshot, parsing config.yaml on first use."""
+    global _snapshot
+    snapshot = _snapshot
+    if snapshot is None:
+        with _lock:
+            if _snapshot is None:
+                _snapshot = _parse_config_file(CONFIG_PATH)
+            snapshot = _snapshot
+    return snapshot
+
+
+def reload_if_changed() -> bool:
+    """
+    Re-parses config.yaml if its mtime differs from the current snapshot and
+    notifies reload listeners. A file that fails to parse keeps the previous
+    snapshot in place. Returns True if a new snapshot was installed.
+    """
+    global _snapshot, _failed_mtime
+    if _snapshot is None:
+        get_snapshot()
+        return False
+
+    try:
+        mtime = os.path.getmtime(CONFIG_PATH)
+    except OSError as e:
+        print(f"Config reload skipped, cannot stat {CONFIG_PATH}: {e}")
+        return False
+    if mtime == _snapshot.mtime or mtime == _failed_mtime:
+        return False
+
+    with _lock:
+        if mtime == _snapshot.mtime:
+            return False
         try:
-            with open(self.config_path, "r") as f:
-                return yaml.safe_load(f) or {}
-        except yaml.YAMLError as e:
-            raise ValueError(f"Failed to parse YAML config: {e}")
+            new_snapshot = _parse_config_file(CONFIG_PATH)
+        except (KeyError, ValueError, FileNotFoundError) as e:
+            # Don't retry the same broken file on every poll
+            _failed_mtime = mtime
+            print(f"Config reload failed, keeping previous config: {e}")
+            return False
+        _snapshot = new_snapshot
+        listeners = list(_reload_listeners)
 
-    def get(self, key_path: str) -> Any:
-        keys = key_path.split(".")
-        val: Any = self._config
+    for listener in listeners:
+        try:
+            listener(new_snapshot)
+        except Exception as e:
+            print(f"Config reload listener failed: {e}")
+    return True
 
-        for i, key in enumerate(keys):
-            if not isinstance(val, dict):
-                raise KeyError(
-                    f"Invalid config path: '{'.'.join(keys[:i])}' is not a dict. Cannot access '{key}'."
-                )
-            if key not in val:
-                raise KeyError(f"Missing config key: '{'.'.join(keys[:i+1])}'")
-            val = val[key]
 
-        if val is None:
-            raise ValueError(f"Config key '{key_path}' exists but has no value (None).")
+def add_reload_listener(listener: Callable[[ConfigSnapshot], None]):
+    """Registers `listener(snapshot)` to be called after each successful reload."""
+    with _lock:
+        if listener not in _reload_listeners:
+            _reload_listeners.append(listener)
 
+
+def remove_reload_listener(listener: Callable[[ConfigSnapshot], None]):
+    with _lock:
+        if listener in _reload_listeners:
+            _reload_listeners.remove(listener)
+
+
+class Config:
+    """
+    Dotted-path access to config.yaml.
+
+    Instances are cheap: they share the process-wide snapshot instead of
+    re-reading the file, and only re-parse it when its mtime has changed.
+    Hot paths should read the typed `snapshot` attributes instead of `get()`.
+    """
+
+    def __init__(self):
+        self.config_path = CONFIG_PATH
+        reload_if_changed()
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        return get_snapshot()
+
+    @property
+    def _config(self) -> dict:
+        return get_snapshot().raw
+
+    def get(self, key_path: str) -> Any:
+        """
+        Value at `key_path`. Dicts and lists are returned as copies, so a
+        caller modifying one never changes the shared snapshot.
+        """
+        val = _require(self._config, key_path)
+        if isinstance(val, (dict, list)):
+            return copy.deepcopy(val)
         return val
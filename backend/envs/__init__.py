@@ -1,3 +1,13 @@
 from .lander import RocketLandingEnv
 
-__all__ = ["RocketLandingEnv"]
+__all__ = ["RocketLandingEnv", "RocketLandingVecEnv"]
+
+
+def __getattr__(name):
+    # RocketLandingVecEnv subclasses the SB3 VecEnv, and importing
+    # stable_baselines3 pulls in torch; only pay for it when it is used.
+    if name == "RocketLandingVecEnv":
+        from .vec_lander import RocketLandingVecEnv
+
+        return RocketLandingVecEnv
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,141 @@
+import os
+import time
+import logging
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+
+from stable_baselines3.common.env_util import make_vec_env
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv, VecEnv
+
+from backend.envs.lander import RocketLandingEnv
+from backend.envs.vec_lander import OBS_DIM, RocketLandingVecEnv
+
+logger = logging.getLogger(__name__)
+
+VEC_ENV_KINDS = ("native", "subproc", "dummy")
+
+# RolloutBuffer keeps obs, actions and six scalar float32 columns per step
+_ROLLOUT_FLOATS_PER_STEP = OBS_DIM + 2 + 6
+
+
+def make_training_vec_env(kind: str, n_envs: int, seed: Optional[int] = None) -> VecEnv:
+    """
+    Builds the training VecEnv: "native" steps every env in one vectorized
+    pass, "subproc"/"dummy" wrap RocketLandingEnv instances.
+    """
+    if kind == "native":
+        return RocketLandingVecEnv(n_envs, seed=seed)
+    if kind in ("subproc", "dummy"):
+        vec_env_cls = SubprocVecEnv if kind == "subproc" and n_envs > 1 else DummyVecEnv
+        return make_vec_env(RocketLandingEnv, n_envs=n_envs, vec_env_cls=vec_env_cls, seed=seed)
+    raise ValueError(
+        f"Unknown rl.training.vec_env '{kind}'. Use auto, native, subproc or dummy."
+    )
+
+
+def _rss_bytes(pid: int) -> Optional[int]:
+    """Resident set size of `pid`, or None where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def rollout_buffer_bytes(n_envs: int, n_steps: int) -> int:
+    return n_envs * n_steps * _ROLLOUT_FLOATS_PER_STEP * 4
+
+
+def measure_vec_env(kind: str, n_envs: int, seconds: float) -> Dict:
+    """
+    Steps a `kind` x `n_envs` VecEnv with random actions for about `seconds`
+    and returns its env-steps/s and the memory it added: child process RSS
+    for subproc, the growth of this process's RSS otherwise.
+    """
+    rss_before = _rss_bytes(os.getpid())
+    vec_env = make_training_vec_env(kind, n_envs, seed=0)
+    try:
+        vec_env.reset()
+        rng = np.random.default_rng(0)
+        actions = rng.uniform([0.0, -1.0], [1.0, 1.0], (n_envs, 2)).astype(np.float32)
+        vec_env.step(actions)  # warm-up
+
+        steps = 0
+        start = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < seconds:
+            vec_env.step(actions)
+            steps += 1
+            elapsed = time.perf_counter() - start
+
+        if isinstance(vec_env, SubprocVecEnv):
+            sizes = [_rss_bytes(process.pid) for process in vec_env.processes]
+            memory = None if None in sizes else sum(sizes)
+        else:
+            rss_after = _rss_bytes(os.getpid())
+            memory = None if rss_before is None else max(rss_after - rss_before, 0)
+    finally:
+        vec_env.close()
+
+    return {
+        "vec_env": kind,
+        "n_envs": n_envs,
+        "steps_per_second": steps * n_envs / elapsed,
+        "memory_bytes": memory,
+    }
+
+
+def autotune_vec_env(
+    kinds: Sequence[str],
+    n_envs_options: Sequence[int],
+    seconds: float,
+    memory_budget_mb: float,
+    n_steps: int,
+) -> Dict:
+    """
+    Measures every vec-env kind and env count and picks the fastest one
+    whose memory (env memory plus the PPO rollout buffer) fits in
+    `memory_budget_mb`. For each kind, larger env counts are skipped once
+    one exceeds the budget. Subproc is skipped on a single CPU and for one
+    env, where it only adds IPC.
+
+    Returns a dict with the chosen "vec_env" and "n_envs", the budget and
+    every measurement, ready to be written to the run directory.
+    """
+    budget = memory_budget_mb * 1024**2
+    cpu_count = os.cpu_count() or 1
+    measurements: List[Dict] = []
+    for kind in kinds:
+        if kind not in VEC_ENV_KINDS:
+            raise ValueError(f"Unknown vec env kind '{kind}' in rl.training.autotune.")
+        for n_envs in sorted(n_envs_options):
+            if kind == "subproc" and (n_envs == 1 or cpu_count == 1):
+                continue
+            result = measure_vec_env(kind, n_envs, seconds)
+            result["memory_bytes_total"] = (result["memory_bytes"] or 0) + rollout_buffer_bytes(
+                n_envs, n_steps
+            )
+            result["fits_budget"] = result["memory_bytes_total"] <= budget
+            measurements.append(result)
+            logger.info(
+                f"autotune: {kind} x {n_envs}: {result['steps_per_second']:.0f} steps/s, "
+                f"{result['memory_bytes_total'] / 1024**2:.1f} MB"
+            )
+            if not result["fits_budget"]:
+                break
+
+    candidates = [m for m in measurements if m["fits_budget"]]
+    if not candidates:
+        raise RuntimeError(
+            f"No vec env configuration fits the {memory_budget_mb} MB memory budget."
+        )
+    best = max(candidates, key=lambda m: m["steps_per_second"])
+    return {
+        "vec_env": best["vec_env"],
+        "n_envs": best["n_envs"],
+        "steps_per_second": best["steps_per_second"],
+        "memory_budget_mb": memory_budget_mb,
+        "calibration_seconds": seconds,
+        "cpu_count": cpu_count,
+        "measurements": measurements,
+    }
@@ -2,9 +2,9 @@ import gymnasium as gym
 from gymnasium import spaces
 import numpy as np
 import logging
-from typing import Tuple, Dict, Any, Optional, TypeVar, cast
+from typing import Tuple, Dict, Any, Optional, TypeVar
 
-from backend.rl.reward import calculate_reward
+from backend.rl.reward import calculate_reward, reward_params
 from backend.rocket import Rocket
 from backend.simulation.config import get_rl_config
 from backend.config import Config
@@ -15,6 +15,51 @@ logger = logging.getLogger(__name__)
 SpaceT = TypeVar("SpaceT", bound=spaces.Space)
 
 
+def build_action_space() -> spaces.Box:
+    """
+    action[0]: Throttle (0.0 to 1.0)
+    action[1]: Cold Gas Control (-1.0 to 1.0)
+    """
+    return spaces.Box(
+        low=np.array([0.0, -1.0], dtype=np.float32),
+        high=np.array([1.0, 1.0], dtype=np.float32),
+        dtype=np.float32,
+    )
+
+
+def build_observation_space(config: Config) -> spaces.Box:
+    """[x, y, vx, vy, ax, ay, angle, angular_velocity] bounded by the initial-state limits."""
+    observation_low = np.array(
+        [
+            config.get("rocket.position_limits.x")[0],  # x min
+            0.0,  # y min (ground level)
+            config.get("rocket.velocity_limits.vx")[0],  # vx min
+            config.get("rocket.velocity_limits.vy")[0],  # vy min
+            config.get("rocket.acceleration_limits.ax")[0],  # ax min
+            config.get("rocket.acceleration_limits.ay")[0],  # ay min
+            config.get("rocket.attitude_limits.angle")[0],  # angle min
+            config.get("rocket.attitude_limits.angular_velocity")[0],
+        ],
+        dtype=np.float32,
+    )
+
+    observation_high = np.array(
+        [
+            config.get("rocket.position_limits.x")[1],  # x max
+            config.get("rocket.position_limits.y")[1],  # y max
+            config.get("rocket.velocity_limits.vx")[1],  # vx max
+            config.get("rocket.velocity_limits.vy")[1],  # vy max
+            config.get("rocket.acceleration_limits.ax")[1],  # ax max
+            config.get("rocket.acceleration_limits.ay")[1],  # ay max
+            config.get("rocket.attitude_limits.angle")[1],  # angle max
+            config.get("rocket.attitude_limits.angular_velocity")[1],
+        ],
+        dtype=np.float32,
+    )
+
+    return spaces.Box(low=observation_low, high=observation_high, dtype=np.float32)
+
+
 class RocketLandingEnv(gym.Env):
     """
     Custom Gymnasium Environment for Rocket Landing Simulation.
@@ -58,53 +103,13 @@ class RocketLandingEnv(gym.Env):
 
             self.rocket = Rocket()  # Rocket now loads its own config internally
             self.current_step = 0
+            # Pinned per episode: config reloads apply from the next reset
+            self.reward_params = reward_params()
 
-            # --- Action Space ---
-            # action[0]: Throttle (0.0 to 1.0)
-            # action[1]: Cold Gas Control (-1.0 to 1.0)
-            self.action_space = spaces.Box(
-                low=np.array([0.0, -1.0], dtype=np.float32),
-                high=np.array([1.0, 1.0], dtype=np.float32),
-                dtype=np.float32,
-            )
-
-            # --- Observation Space ---
-            # [x, y, vx, vy, ax, ay, angle, angular_velocity]
-            self.observation_low = np.array(
-                [
-                    self.config.get("rocket.position_limits.x")[0],  # x min
-                    0.0,  # y min (ground level)
-                    self.config.get("rocket.velocity_limits.vx")[0],  # vx min
-                    self.config.get("rocket.velocity_limits.vy")[0],  # vy min
-                    self.config.get("rocket.acceleration_limits.ax")[0],  # ax min
-                    self.config.get("rocket.acceleration_limits.ay")[0],  # ay min
-                    self.config.get("rocket.attitude_limits.angle")[0],  # angle min
-                    self.config.get("rocket.attitude_limits.angular_velocity")[0],
-                ],
-                dtype=np.float32,
-            )
-
-            self.observation_high = np.array(
-                [
-                    self.config.get("rocket.position_limits.x")[1],  # x max
-                    self.config.get("rocket.position_limits.y")[
-                        1
-                    ],  # y max (fixed from x to y)
-                    self.config.get("rocket.velocity_limits.vx")[1],  # vx max
-                    self.config.get("rocket.velocity_limits.vy")[1],  # vy max
-                    self.config.get("rocket.acceleration_limits.ax")[1],  # ax max
-                    self.config.get("rocket.acceleration_limits.ay")[1],  # ay max
-                    self.config.get("rocket.attitude_limits.angle")[1],  # angle max
-                    self.config.get("rocket.attitude_limits.angular_velocity")[1],
-                ],
-                dtype=np.float32,
-            )
-
-            self.observation_space = spaces.Box(
-                low=self.observation_low,
-                high=self.observation_high,
-                dtype=np.float32,
-            )
+            self.action_space = build_action_space()
+            self.observation_space = build_observation_space(self.config)
+            self.observation_low = self.observation_space.low
+            self.observation_high = self.observation_space.high
 
             logger.info("RocketLandingEnv Initialized Successfully.")
             logger.info(f"  Action Space: {self.action_space}")
@@ -124,29 +129,23 @@ class RocketLandingEnv(gym.Env):
     def _get_obs(self) -> np.ndarray:
         """Extracts the 8-element observation vector from the rocket's state."""
         try:
-            state = self.rocket.get_state()
+            state = self.rocket.state
             # Ensure the order matches the observation space definition
             obs = np.array(
                 [
-                    state.get("x", 0.0),
-                    state.get("y", 0.0),
-                    state.get("vx", 0.0),
-                    state.get("vy", 0.0),
-                    state.get("ax", 0.0),
-                    state.get("ay", 0.0),
-                    state.get("angle", 0.0),
-                    state.get(
-                        "angularVelocity", 0.0
-                    ),  # Note: matches the key from get_state()
+                    state.x,
+                    state.y,
+                    state.vx,
+                    state.vy,
+                    state.ax,
+                    state.ay,
+                    state.angle,
+                    state.angularVelocity,
                 ],
                 dtype=np.float32,
             )
 
-            # Get the actual observation space bounds for clipping
-            low = cast(spaces.Box, self.observation_space).low
-            high = cast(spaces.Box, self.observation_space).high
-
-            obs = np.clip(obs, low, high)
+            obs = np.clip(obs, self.observation_low, self.observation_high)
             return obs
         except Exception as e:
             logger.error(f"Error getting observation: {e}", exc_info=True)
@@ -156,11 +155,11 @@ class RocketLandingEnv(gym.Env):
 
     def _get_info(self) -> Dict[str, Any]:
         """Returns auxiliary information about the state (not used for RL training)."""
-        state = self.rocket.get_state()
+        state = self.rocket.state.copy()
         info = {
             "raw_state": state,
-            "speed": state.get("speed", 0.0),
-            "altitude": state.get("y", 0.0),
+            "speed": state.speed,
+            "altitude": state.y,
             "steps": self.current_step,
         }
         return info
@@ -178,6 +177,7 @@ class RocketLandingEnv(gym.Env):
             raise
 
         self.current_step = 0
+        self.reward_params = reward_params()
 
         observation = self._get_obs()
         info = self._get_info()
@@ -210,12 +210,12 @@ class RocketLandingEnv(gym.Env):
         cold_gas_control = float(action[1])
 
         # --- Store state before action ---
-        state_before = self.rocket.get_state()
+        state_before = self.rocket.state.copy()
 
         # --- Step the Physics Simulation ---
         try:
             self.rocket.apply_action(throttle, cold_gas_control)
-            state_after = self.rocket.get_state()
+            state_after = self.rocket.state
         except Exception as e:
             logger.error(f"Error during rocket physics step: {e}", exc_info=True)
             observation = self._get_obs()
@@ -232,6 +232,7 @@ class RocketLandingEnv(gym.Env):
             state_before,
             action,
             state_after,
+            self.reward_params,
         )
 
         max_steps_reached = self.current_step >= self.max_episode_steps
@@ -0,0 +1,177 @@
+import numpy as np
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+import gymnasium as gym
+from stable_baselines3.common.vec_env.base_vec_env import (
+    VecEnv,
+    VecEnvIndices,
+    VecEnvObs,
+    VecEnvStepReturn,
+)
+
+from backend.config import Config
+from backend.envs.lander import build_action_space, build_observation_space
+from backend.physics import BatchPhysicsEngine
+from backend.rl.reward import calculate_reward_batch, reward_params
+from backend.simulation.config import get_initial_state_batch, get_rl_config
+
+logger = logging.getLogger(__name__)
+
+# Observation order is the first 8 rows of the engine's state block:
+# [x, y, vx, vy, ax, ay, angle, angularVelocity]
+OBS_DIM = 8
+
+
+class RocketLandingVecEnv(VecEnv):
+    """
+    Single-process vectorized RocketLandingEnv.
+
+    Holds all `num_envs` rockets in one BatchPhysicsEngine and steps them in a
+    single array pass, instead of wrapping N RocketLandingEnv instances in a
+    DummyVecEnv/SubprocVecEnv. Follows the SB3 VecEnv contract: finished envs
+    are reset automatically, their last observation is stored under
+    `info["terminal_observation"]` and time-limit truncation is reported via
+    `info["TimeLimit.truncated"]`.
+
+    Per-env info carries `altitude`, `speed` and `steps`; `raw_state` is only
+    attached on the step an episode ends, to keep the hot path dict-free.
+    """
+
+    render_mode = None
+
+    def __init__(self, num_envs: int, seed: Optional[int] = None):
+        if num_envs < 1:
+            raise ValueError("num_envs must be at least 1.")
+
+        self.config = Config()
+        self.rl_config = get_rl_config()
+        self.max_episode_steps = self.rl_config["max_episode_steps"]
+
+        super().__init__(
+            num_envs, build_observation_space(self.config), build_action_space()
+        )
+
+        self.engine = BatchPhysicsEngine(num_envs)
+        self.rng = np.random.default_rng(seed)
+        self.current_steps = np.zeros(num_envs, dtype=np.int64)
+        self.actions = np.zeros((num_envs, 2), dtype=np.float32)
+        # Taken on reset(); envs auto-reset after an episode keep the batch's
+        # params, so config reloads apply from the next full reset
+        self.reward_params = reward_params()
+
+        self._obs_low = self.observation_space.low
+        self._obs_high = self.observation_space.high
+
+        logger.info(f"RocketLandingVecEnv initialized with {num_envs} envs.")
+
+    def _get_obs(self) -> np.ndarray:
+        obs = self.engine.state[:OBS_DIM].T.astype(np.float32)
+        return np.clip(obs, self._obs_low, self._obs_high)
+
+    def _reset_envs(self, indices: np.ndarray):
+        initial_states = get_initial_state_batch(len(indices), self.rng)
+        self.engine.load_state_arrays(initial_states, indices)
+        self.current_steps[indices] = 0
+
+    def _step_info(self, index: int) -> Dict[str, Any]:
+        return {
+            "speed": float(np.hypot(self.engine.vx[index], self.engine.vy[index])),
+            "altitude": float(self.engine.y[index]),
+            "steps": int(self.current_steps[index]),
+        }
+
+    def reset(self) -> VecEnvObs:
+        if self._seeds[0] is not None:
+            self.rng = np.random.default_rng(self._seeds[0])
+        self._reset_seeds()
+        self._reset_options()
+
+        self._reset_envs(np.arange(self.num_envs))
+        self.reward_params = reward_params()
+        self.reset_infos = [self._step_info(i) for i in range(self.num_envs)]
+        return self._get_obs()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self.actions = np.asarray(actions, dtype=np.float32).reshape(self.num_envs, 2)
+
+    def step_wait(self) -> VecEnvStepReturn:
+        actions = self.actions
+        state_before = self.engine.state.copy()
+
+        self.engine.step(actions[:, 0], actions[:, 1])
+        self.current_steps += 1
+
+        rewards, terminated, truncated = calculate_reward_batch(
+            state_before, actions, self.engine.state, self.reward_params
+        )
+        rewards = rewards.astype(np.float32)
+
+        truncated |= self.current_steps >= self.max_episode_steps
+        dones = terminated | truncated
+
+        obs = self._get_obs()
+        infos: List[Dict[str, Any]] = [self._step_info(i) for i in range(self.num_envs)]
+
+        done_indices = np.flatnonzero(dones)
+        if len(done_indices):
+            for i in done_indices:
+                infos[i]["TimeLimit.truncated"] = bool(
+                    truncated[i] and not terminated[i]
+                )
+                infos[i]["terminal_observation"] = obs[i].copy()
+                infos[i]["raw_state"] = self.engine.get_state(i)
+
+            self._reset_envs(done_indices)
+            obs[done_indices] = self._get_obs()[done_indices]
+            for i in done_indices:
+                self.reset_infos[i] = self._step_info(i)
+
+        return obs, rewards, dones, infos
+
+    def close(self) -> None:
+        logger.info("RocketLandingVecEnv Closed.")
+
+    def _get_indices(self, indices: VecEnvIndices) -> Sequence[int]:
+        if indices is None:
+            return range(self.num_envs)
+        if isinstance(indices, int):
+            return [indices]
+        return indices
+
+    def _require_whole_batch(self, indices: VecEnvIndices, what: str):
+        if sorted(set(self._get_indices(indices))) != list(range(self.num_envs)):
+            raise NotImplementedError(
+                f"RocketLandingVecEnv {what} applies to the whole batch; "
+                f"it cannot target env indices {indices}."
+            )
+
+    def get_attr(self, attr_name: str, indices: VecEnvIndices = None) -> List[Any]:
+        """All envs share this object, so attributes are read from it directly."""
+        value = getattr(self, attr_name)
+        return [value for _ in self._get_indices(indices)]
+
+    def set_attr(self, attr_name: str, value: Any, indices: VecEnvIndices = None) -> None:
+        """Attributes are batch-wide: setting one for a subset of envs raises."""
+        self._require_whole_batch(indices, f"attribute '{attr_name}'")
+        setattr(self, attr_name, value)
+
+    def env_method(
+        self,
+        method_name: str,
+        *method_args,
+        indices: VecEnvIndices = None,
+        **method_kwargs,
+    ) -> List[Any]:
+        """
+        Methods act on the whole batch, so the method is called once and its
+        result repeated per env; calling it for a subset of envs raises.
+        """
+        self._require_whole_batch(indices, f"method '{method_name}'")
+        result = getattr(self, method_name)(*method_args, **method_kwargs)
+        return [result for _ in range(self.num_envs)]
+
+    def env_is_wrapped(
+        self, wrapper_class: Type[gym.Wrapper], indices: VecEnvIndices = None
+    ) -> List[bool]:
+        return [False for _ in self._get_indices(indices)]
@@ -0,0 +1,174 @@
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple, Union
+
+from backend.protocol import BinaryProtocol, DeltaEncoder
+
+Payload = Union[str, bytes]
+
+_MESSAGE = 0
+_FRAME = 1
+
+
+class OutboxOverflow(Exception):
+    """Raised when a client has fallen too far behind on messages that are never dropped."""
+
+
+class ClientOutbox:
+    """
+    Bounded outbound queue of one WebSocket connection.
+
+    JSON messages (status, errors, initial state) are always delivered, in
+    order. Telemetry frames are droppable. At most `max_frames` wait in the
+    queue, and when a new one arrives the oldest waiting frame is dropped, so
+    a slow client gets the newest state instead of a growing backlog. Only
+    one write is in flight at a time, and the next starts when the socket
+    has taken the previous one.
+
+    Delta frames depend on their predecessor. After one is dropped the
+    remaining queued and incoming deltas are discarded until the next
+    keyframe, and `on_resync` is called to ask the encoder for one.
+
+    If more than `max_messages` JSON messages are waiting, `push_message`
+    raises OutboxOverflow; the connection should be closed.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[Payload, bool], Awaitable],
+        max_frames: int = 2,
+        max_messages: int = 256,
+        on_resync: Optional[Callable[[], None]] = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        if max_frames < 1 or max_messages < 1:
+            raise ValueError("max_frames and max_messages must be at least 1.")
+        self._write = write
+        self.max_frames = max_frames
+        self.max_messages = max_messages
+        self.on_resync = on_resync
+        self.clock = clock
+
+        self._queue: Deque[Tuple[int, Payload, float]] = deque()
+        self._frames = 0
+        self._pump: Optional[asyncio.Future] = None
+        self._awaiting_keyframe = False
+        self.closed = False
+
+        self.sent_frames = 0
+        self.sent_messages = 0
+        self.dropped_frames = 0
+        self.resyncs = 0
+        self.bytes_sent = 0
+        self.max_queued = 0
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self._lag_sum = 0.0
+
+    def push_message(self, message: Payload):
+        if self.closed:
+            return
+        if len(self._queue) - self._frames >= self.max_messages:
+            raise OutboxOverflow(
+                f"{self.max_messages} messages waiting; client is not reading"
+            )
+        self._queue.append((_MESSAGE, message, self.clock()))
+        self._wake()
+
+    def push_frame(self, frame: bytes):
+        if self.closed:
+            return
+        delta = frame[0] == BinaryProtocol.MSG_TELEMETRY_DELTA
+        keyframe = delta and bool(frame[1] & DeltaEncoder.FLAG_KEYFRAME)
+        if delta and self._awaiting_keyframe and not keyframe:
+            self.dropped_frames += 1
+            return
+        if self._frames >= self.max_frames:
+            self._drop_oldest_frame()
+            if delta and self._awaiting_keyframe and not keyframe:
+                self.dropped_frames += 1
+                return
+        if keyframe:
+            self._awaiting_keyframe = False
+
+        self._queue.append((_FRAME, frame, self.clock()))
+        self._frames += 1
+        self._wake()
+
+    def _drop_oldest_frame(self):
+        for i, (kind, payload, _) in enumerate(self._queue):
+            if kind == _FRAME:
+                del self._queue[i]
+                self._frames -= 1
+                self.dropped_frames += 1
+                if payload[0] == BinaryProtocol.MSG_TELEMETRY_DELTA:
+                    self._discard_deltas()
+                return
+
+    def _discard_deltas(self):
+        """Drops queued deltas after a gap and asks for a keyframe."""
+        kept = deque()
+        for entry in self._queue:
+            if entry[0] == _FRAME and entry[1][0] == BinaryProtocol.MSG_TELEMETRY_DELTA:
+                self._frames -= 1
+                self.dropped_frames += 1
+            else:
+                kept.append(entry)
+        self._queue = kept
+        self._awaiting_keyframe = True
+        self.resyncs += 1
+        if self.on_resync:
+            self.on_resync()
+
+    def _wake(self):
+        self.max_queued = max(self.max_queued, len(self._queue))
+        if self._pump is None or self._pump.done():
+            self._pump = asyncio.ensure_future(self._run())
+
+    async def _run(self):
+        while self._queue and not self.closed:
+            kind, payload, queued_at = self._queue.popleft()
+            if kind == _FRAME:
+                self._frames -= 1
+            try:
+                await self._write(payload, isinstance(payload, bytes))
+            except Exception:
+                # Socket closed; the handler's on_close cleans up
+                self.close()
+                return
+
+            lag = self.clock() - queued_at
+            self.lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            self._lag_sum += lag
+            self.bytes_sent += len(payload)
+            if kind == _FRAME:
+                self.sent_frames += 1
+            else:
+                self.sent_messages += 1
+
+    def close(self):
+        self.closed = True
+        self._queue.clear()
+        self._frames = 0
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        sent = self.sent_frames + self.sent_messages
+        return {
+            "queued": len(self._queue),
+            "max_queued": self.max_queued,
+            "sent_frames": self.sent_frames,
+            "sent_messages": self.sent_messages,
+            "dropped_frames": self.dropped_frames,
+            "resyncs": self.resyncs,
+            "bytes_sent": self.bytes_sent,
+            "lag_ms": round(self.lag * 1000.0, 3),
+            "avg_lag_ms": round(self._lag_sum / sent * 1000.0, 3) if sent else 0.0,
+            "max_lag_ms": round(self.max_lag * 1000.0, 3),
+        }
@@ -0,0 +1,483 @@
+import asyncio
+import re
+import uuid
+import numpy as np
+from tornado.ioloop import IOLoop
+from typing import Dict, List, Optional
+
+from backend.config import Config
+from backend.physics.batch import FIELD_INDEX
+from backend.protocol import DeltaEncoder, FleetEncoder
+from backend.rl.agent import RLAgent
+from backend.rl.registry import available_versions, get_model_registry
+from backend.simulation import SimulationController
+from backend.utils import (
+    evaluate_landing,
+    evaluate_landing_batch,
+    get_landing_thresholds,
+)
+
+ROOM_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+CONTROL_POLICIES = ("owner", "anyone")
+
+
+class SimulationRoom:
+    """
+    One simulation shared by every connection subscribed to it.
+
+    The room owns the SimulationController and the agent reference, encodes
+    each telemetry frame once per wire format and sends the same bytes to
+    all subscribers. Subscribers are RocketWebSocketHandlers; a subscriber's
+    `precision` attribute selects its format: None for full v1 frames, or
+    the delta-frame precision. Rooms with delta subscribers keep one
+    DeltaEncoder per precision, shared by all of them.
+
+    Under the "owner" control policy only the owner may change the
+    simulation; the first subscriber owns the room and ownership passes to
+    the longest-connected viewer when the owner leaves. Under "anyone"
+    every subscriber may control it. Everything runs on the IOLoop thread.
+    """
+
+    def __init__(self, name: str, logger, control: str = "owner"):
+        if control not in CONTROL_POLICIES:
+            raise ValueError(
+                f"Unknown room control policy '{control}', expected one of {CONTROL_POLICIES}"
+            )
+        self.name = name
+        self.logger = logger
+        self.control = control
+        self.config = Config()
+        self.num_rockets = self.config.get("environment.num_rockets")
+        self.model_version = self.config.get("model.version")
+        self.telemetry_config = self.config.get("app.telemetry")
+        self.rl_agent_instance: Optional[RLAgent] = None
+        self.sim = SimulationController(self.num_rockets)
+        self.fleet_encoder = FleetEncoder(self.num_rockets)
+        self.delta_encoders: Dict[str, DeltaEncoder] = {}
+        self.subscribers: List = []
+        self.owner = None
+        self.io_loop = IOLoop.current()
+        self._ready = None
+        self._closed = False
+        self._landing_thresholds = get_landing_thresholds(self.config.snapshot.landing)
+        self._reset_outcomes()
+
+    @property
+    def empty(self) -> bool:
+        return not self.subscribers
+
+    def can_control(self, handler) -> bool:
+        return self.control == "anyone" or handler is self.owner
+
+    async def join(self, handler):
+        """Subscribes `handler`, starting the simulation for the first one."""
+        self.subscribers.append(handler)
+        if self.owner is None:
+            self.owner = handler
+        if self._ready is None:
+            self._ready = asyncio.ensure_future(self._start())
+        await self._ready
+        if handler not in self.subscribers:
+            return  # disconnected while the room was starting
+
+        handler.send_json(self._room_info(handler))
+        handler.send_json(
+            {
+                "step": {
+                    "state": self.sim.render(),
+                    "reward": None,
+                    "done": self._done_mask.tolist(),
+                    "prev_action_taken": None,
+                },
+                "initial": True,
+            }
+        )
+        if handler.precision:
+            self.delta_encoder(handler.precision).request_keyframe()
+        self.broadcast_status()
+
+    async def _start(self):
+        if self.model_version:
+            self.rl_agent_instance = await self._acquire_model(self.model_version)
+            if self._closed:
+                self._release_model()
+                return
+            self.sim.set_agent(self.rl_agent_instance)
+        self.sim.reset()
+        self._reset_outcomes()
+
+    def leave(self, handler):
+        """Unsubscribes `handler`, handing ownership on and closing an empty room."""
+        if handler not in self.subscribers:
+            return
+        self.subscribers.remove(handler)
+        if handler is self.owner:
+            self.owner = self.subscribers[0] if self.subscribers else None
+            if self.owner is not None:
+                self.owner.send_json(self._room_info(self.owner))
+        if self.subscribers:
+            self.broadcast_status()
+        else:
+            self.close()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self.sim.close()
+        self.sim.set_agent(None)
+        self._release_model()
+
+    def _room_info(self, handler) -> dict:
+        return {
+            "room": {
+                "name": self.name,
+                "owner": handler is self.owner,
+                "can_control": self.can_control(handler),
+            }
+        }
+
+    def _require_control(self, handler) -> bool:
+        if self.can_control(handler):
+            return True
+        handler.send_json(
+            {"error": f"Only the owner of room '{self.name}' can control the simulation"}
+        )
+        return False
+
+    async def _acquire_model(self, version: str) -> Optional[RLAgent]:
+        """
+        Takes a reference on the shared agent for `version`. Loading (or
+        waiting for a preload in progress) runs off the IOLoop thread.
+        """
+        registry = get_model_registry()
+        try:
+            agent = await self.io_loop.run_in_executor(None, registry.acquire, version)
+        except Exception as e:
+            self.logger.error(
+                f"Failed to initialize RL Agent (version {version}): {e}", exc_info=True
+            )
+            return None
+        self.logger.info(f"RL Agent (version {version}) ready for room '{self.name}'.")
+        return agent
+
+    def _release_model(self):
+        get_model_registry().release(self.rl_agent_instance)
+        self.rl_agent_instance = None
+
+    async def switch_model(self, handler, version: str):
+        if not self._require_control(handler):
+            return
+        if version == self.model_version and self.rl_agent_instance:
+            self.broadcast_status()
+            return
+        if version not in available_versions():
+            self.logger.warning(f"Unknown model version requested: {version}")
+            handler.send_json({"error": f"Unknown model version '{version}'"})
+            return
+
+        agent = await self._acquire_model(version)
+        if agent is None:
+            handler.send_json({"error": f"Failed to load model version '{version}'"})
+            return
+        if self._closed:
+            get_model_registry().release(agent)
+            return
+
+        # The old agent is swapped out between two simulation steps
+        self._release_model()
+        self.rl_agent_instance = agent
+        self.model_version = version
+        self.sim.set_agent(agent)
+        self.broadcast_status()
+
+    def toggle_agent(self, handler):
+        if not self._require_control(handler):
+            return
+        if self.sim.rl_agent:
+            self.sim.agent_enabled = not self.sim.agent_enabled
+            self.broadcast_status()
+
+    def set_action(self, handler, action: dict, rocket_index: int):
+        if self._require_control(handler):
+            self.sim.set_action(action, rocket_index)
+
+    def set_speed(self, handler, speed):
+        if not self._require_control(handler):
+            return
+        try:
+            speed = float(speed)
+        except (TypeError, ValueError):
+            speed = float("nan")
+        if not speed > 0:
+            handler.send_json({"error": f"Invalid speed '{speed}', must be positive"})
+            return
+        self.sim.set_speed(speed)
+        self.broadcast_status()
+
+    def handle_command(self, handler, command: str):
+        if command == "stats":
+            handler.send_json(
+                {
+                    "stats": {
+                        **self.sim.pipeline_stats,
+                        "viewers": len(self.subscribers),
+                        "client": handler.send_stats,
+                    }
+                }
+            )
+            return
+        if not self._require_control(handler):
+            return
+        if command == "pause":
+            self.sim.pause()
+        elif command == "start":
+            self.sim.start(self.send_state_update)
+        elif command == "restart":
+            self.io_loop.call_later(0.1, self._initiate_restart)
+        self.broadcast_status()
+
+    def delta_encoder(self, precision: str) -> DeltaEncoder:
+        """The shared delta encoder for `precision`, created on first use."""
+        encoder = self.delta_encoders.get(precision)
+        if encoder is None:
+            encoder = DeltaEncoder(
+                self.num_rockets,
+                precision=precision,
+                float32_fields=self.telemetry_config["float32_fields"],
+                keyframe_interval=self.telemetry_config["keyframe_interval"],
+            )
+            self.delta_encoders[precision] = encoder
+        return encoder
+
+    def broadcast_status(self):
+        self.broadcast_json(
+            {
+                "status": "paused" if self.sim.paused else "playing",
+                "agent_enabled": self.sim.agent_enabled,
+                "speed": self.sim.speed,
+                "model_version": self.model_version if self.sim.rl_agent else None,
+                "room": self.name,
+                "viewers": len(self.subscribers),
+            }
+        )
+
+    def broadcast_json(self, payload: dict):
+        for handler in list(self.subscribers):
+            handler.send_json(payload)
+
+    def broadcast_records(self, records: np.ndarray, sim_time: float):
+        """Encodes the filled records once per wire format and fans them out."""
+        encoded: Dict[Optional[str], bytes] = {}
+        for handler in list(self.subscribers):
+            precision = handler.precision
+            data = encoded.get(precision)
+            if data is None:
+                data = (
+                    self.delta_encoder(precision).encode(records, sim_time)
+                    if precision
+                    else self.fleet_encoder.tobytes()
+                )
+                encoded[precision] = data
+            handler.send_binary(data)
+
+    def send_binary_telemetry(
+        self,
+        states: List[Optional[dict]],
+        rewards: List[Optional[float]],
+        actions: List[Dict[str, float]],
+        landing_statuses: List[Optional[str]],
+        sim_time: float = 0.0,
+    ):
+        try:
+            if self.final_outcomes:
+                landing_statuses = [
+                    self.final_outcomes[i]["status"]
+                    if status is None and i in self.final_outcomes
+                    else status
+                    for i, status in enumerate(landing_statuses)
+                ]
+            records = self.fleet_encoder.fill(
+                states, rewards, actions, landing_statuses
+            )
+            self.broadcast_records(records, sim_time)
+        except Exception as e:
+            self.logger.error(f"Failed to send binary telemetry: {e}")
+
+    def send_array_telemetry(
+        self,
+        states: np.ndarray,
+        rewards: np.ndarray,
+        throttle: np.ndarray,
+        cold_gas: np.ndarray,
+        landing_codes: np.ndarray,
+        active: np.ndarray,
+        sim_time: float = 0.0,
+    ):
+        try:
+            records = self.fleet_encoder.fill_arrays(
+                states, rewards, throttle, cold_gas, landing_codes, active
+            )
+            self.broadcast_records(records, sim_time)
+        except Exception as e:
+            self.logger.error(f"Failed to send binary telemetry: {e}")
+
+    def send_state_update(
+        self,
+        states: List[Optional[dict]],
+        rewards: List[Optional[float]],
+        dones: List[bool],
+    ):
+        if isinstance(states, np.ndarray):
+            self.send_array_update(states, rewards, dones)
+            return
+        try:
+            prev_actions = self.sim.published_actions
+            actions_for_payload: List[Dict[str, float]] = []
+            landing_statuses: List[Optional[str]] = [None] * self.num_rockets
+
+            for i in range(self.num_rockets):
+                actions_for_payload.append(
+                    prev_actions[i]
+                    if states[i] and not dones[i]
+                    else {"throttle": 0.0, "coldGas": 0.0}
+                )
+                if dones[i] and states[i] is not None:
+                    landing_eval = evaluate_landing(states[i], self.config.snapshot.landing)
+                    status_str = landing_eval["landing_message"]
+                    landing_statuses[i] = status_str
+                    self.final_outcomes[i] = {
+                        "status": status_str,
+                        "reward": rewards[i],
+                    }
+            self._done_mask[:] = dones
+
+            self.io_loop.add_callback(
+                self.send_binary_telemetry,
+                states,
+                rewards,
+                actions_for_payload,
+                landing_statuses,
+                self.sim.published_sim_time,
+            )
+
+            if all(dones):
+                self._finish_episode()
+        except Exception as e:
+            self.logger.error(f"Failed to prepare state update: {e}")
+
+    def send_array_update(
+        self, states: np.ndarray, rewards: np.ndarray, dones: np.ndarray
+    ):
+        """
+        `send_state_update` for array frames from a sharded simulation: a
+        (fields, N) state block, (N,) rewards and (N,) done mask. Landing is
+        graded once per rocket, in the frame it finishes.
+        """
+        try:
+            finished = dones & ~self._done_mask
+            if finished.any():
+                codes = evaluate_landing_batch(
+                    states[FIELD_INDEX["vx"], finished],
+                    states[FIELD_INDEX["vy"], finished],
+                    states[FIELD_INDEX["angle"], finished],
+                    self._landing_thresholds,
+                )
+                # Protocol landing codes are 1-based: 1=safe ... 4=unsafe
+                self._landing_codes[finished] = codes + 1
+            self._done_mask |= dones
+
+            actions = self.sim.published_actions
+            flying = ~dones
+            self.io_loop.add_callback(
+                self.send_array_telemetry,
+                states.T,
+                rewards,
+                np.where(flying, actions[:, 0], 0.0),
+                np.where(flying, actions[:, 1], 0.0),
+                self._landing_codes.copy(),
+                flying | finished,
+                self.sim.published_sim_time,
+            )
+
+            if dones.all():
+                self._finish_episode()
+        except Exception as e:
+            self.logger.error(f"Failed to prepare state update: {e}")
+
+    def _finish_episode(self):
+        self.broadcast_status()
+        if self.config.get("simulation.loop"):
+            self.io_loop.call_later(0.1, self._initiate_restart)
+
+    def _reset_outcomes(self):
+        self.final_outcomes = {}
+        self._done_mask = np.zeros(self.num_rockets, dtype=bool)
+        self._landing_codes = np.zeros(self.num_rockets, dtype=np.float32)
+        for encoder in self.delta_encoders.values():
+            encoder.request_keyframe()
+
+    def _initiate_restart(self):
+        if self._closed:
+            return
+        states = self.sim.reset()
+        self._reset_outcomes()
+        self.broadcast_json(
+            {
+                "step": {
+                    "state": states,
+                    "reward": None,
+                    "done": [False] * self.num_rockets,
+                    "prev_action_taken": None,
+                },
+                "restart": True,
+            }
+        )
+        self.broadcast_status()
+
+
+class RoomManager:
+    """
+    Named SimulationRooms of this process. A room is created by its first
+    subscriber and closed when its last one leaves. Connections that do not
+    name a room get a private one.
+    """
+
+    def __init__(self, logger, control: str = "owner"):
+        self.logger = logger
+        self.control = control
+        self.rooms: Dict[str, SimulationRoom] = {}
+
+    async def join(self, name: Optional[str], handler) -> SimulationRoom:
+        if name is None:
+            name = f"private-{uuid.uuid4().hex}"
+        elif not ROOM_NAME_PATTERN.match(name):
+            raise ValueError(
+                f"Invalid room name '{name}': use 1-64 letters, digits, '-' or '_'"
+            )
+        room = self.rooms.get(name)
+        if room is None:
+            room = SimulationRoom(name, self.logger, control=self.control)
+            self.rooms[name] = room
+            self.logger.info(f"Room '{name}' created.")
+        await room.join(handler)
+        return room
+
+    def leave(self, room: SimulationRoom, handler):
+        room.leave(handler)
+        if room.empty and self.rooms.get(room.name) is room:
+            del self.rooms[room.name]
+            self.logger.info(f"Room '{room.name}' closed.")
+
+
+_room_manager: Optional[RoomManager] = None
+
+
+def get_room_manager(logger) -> RoomManager:
+    """Returns the process-wide room manager, see `app.rooms.control`."""
+    global _room_manager
+    if _room_manager is None:
+        _room_manager = RoomManager(
+            logger, control=Config().get("app.rooms.control") or "owner"
+        )
+    return _room_manager
@@ -1,203 +1,159 @@
-import os
 from tornado.ioloop import IOLoop
 from backend.config import Config
 import tornado.websocket
 import json
-from typing import Dict, List, Optional
-from backend.simulation import SimulationController
-from backend.utils import evaluate_landing
-from backend.rl.agent import RLAgent
-from backend.protocol import BinaryProtocol
+from typing import Dict, Optional
+from backend.handler.outbox import ClientOutbox, OutboxOverflow
+from backend.handler.room import SimulationRoom, get_room_manager
+from backend.protocol import (
+    PROTOCOL_VERSION_DELTA,
+    PROTOCOL_VERSION_FULL,
+    DeltaEncoder,
+)
 
 
 class RocketWebSocketHandler(tornado.websocket.WebSocketHandler):
+    """
+    One client connection. The simulation lives in a SimulationRoom
+    (`/ws?room=<name>` shares one, without it the connection gets a private
+    room); the handler forwards requests to it and picks the wire format
+    this client receives.
+    """
+
     def check_origin(self, _origin):
         return True
 
     def initialize(self, logger):
         self.logger = logger
         self.config = Config()
-        self.num_rockets = self.config.get("environment.num_rockets")
-        self.model_version = self.config.get("model.version")
-        self.rl_agent_instance: Optional[RLAgent] = None
-        self._get_model()
-        self.sim = SimulationController(
-            self.num_rockets, rl_agent=self.rl_agent_instance
-        )
+        self.telemetry_config = self.config.get("app.telemetry")
+        # None: full v1 frames; otherwise the precision of delta frames
+        self.precision: Optional[str] = None
+        if self.telemetry_config["protocol"] == PROTOCOL_VERSION_DELTA:
+            self.precision = self.telemetry_config["precision"]
+        self.room: Optional[SimulationRoom] = None
         self.client_connected = False
         self.io_loop = IOLoop.current()
-        self.final_outcomes = {}
-
-    def _get_model(self):
-        if self.model_version:
-            try:
-                base_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-                model_path = os.path.join(
-                    base_dir, "assets", "model", self.model_version, "best_model.zip"
-                )
-                stats_path = os.path.join(
-                    base_dir, "assets", "model", self.model_version, "vecnormalize.pkl"
-                )
-                if os.path.exists(model_path) and os.path.exists(stats_path):
-                    self.rl_agent_instance = RLAgent(
-                        model_path=model_path, vec_normalize_path=stats_path
-                    )
-                    self.logger.info(
-                        f"RL Agent (version {self.model_version}) loaded successfully."
-                    )
-            except Exception as e:
-                self.logger.error(f"Failed to initialize RL Agent: {e}", exc_info=True)
+        queue_config = self.config.get("app.send_queue")
+        self.outbox = ClientOutbox(
+            lambda payload, binary: self.write_message(payload, binary=binary),
+            max_frames=queue_config["max_frames"],
+            max_messages=queue_config["max_messages"],
+            on_resync=self._request_keyframe,
+        )
 
-    def open(self):
+    async def open(self):
         self.logger.info("WebSocket opened")
         self.client_connected = True
+        name = self.get_argument("room", None)
+        rooms = get_room_manager(self.logger)
         try:
-            states = self.sim.reset()
-            self.final_outcomes = {}
-            self.send_json(
-                {
-                    "step": {
-                        "state": states,
-                        "reward": None,
-                        "done": [False] * self.num_rockets,
-                        "prev_action_taken": None,
-                    },
-                    "initial": True,
-                }
-            )
-            self.broadcast_status()
+            room = await rooms.join(name, self)
+        except ValueError as e:
+            self.send_json({"error": str(e)})
+            self.close()
+            return
         except Exception as e:
-            self.logger.error(f"Failed to send initial state: {e}")
+            self.logger.error(f"Failed to join room '{name}': {e}")
+            self.close()
+            return
+        if not self.client_connected:
+            rooms.leave(room, self)
+            return
+        self.room = room
 
     def on_close(self):
-        self.logger.info("WebSocket closed")
+        self.logger.info(f"WebSocket closed, send stats: {self.outbox.stats}")
         self.client_connected = False
-        self.sim.stop()
+        self.outbox.close()
+        if self.room:
+            get_room_manager(self.logger).leave(self.room, self)
+            self.room = None
 
     def on_message(self, message):
+        room = self.room
+        if room is None:
+            return
         try:
             data = json.loads(message)
             if "command" in data:
                 command = data["command"]
                 if command == "toggle_agent":
-                    if self.sim.rl_agent:
-                        self.sim.agent_enabled = not self.sim.agent_enabled
-                        self.broadcast_status()
-                    return
+                    room.toggle_agent(self)
                 else:
-                    self.handle_command(command)
-                    return
+                    room.handle_command(self, command)
+                return
+            if "speed" in data:
+                room.set_speed(self, data["speed"])
+                return
+            if "protocol" in data:
+                self.set_protocol(data["protocol"])
+                return
+            if "model_version" in data:
+                self.io_loop.add_callback(
+                    room.switch_model, self, str(data["model_version"])
+                )
+                return
             if "action" in data and "rocket_index" in data:
-                self.sim.set_action(data["action"], int(data["rocket_index"]))
+                room.set_action(self, data["action"], int(data["rocket_index"]))
                 return
         except Exception as e:
             self.logger.error(f"WebSocket message handling failed: {e}")
 
-    def handle_command(self, command: str):
-        if command == "pause":
-            self.sim.pause()
-        elif command == "start":
-            self.sim.start(self.send_state_update)
-        elif command == "restart":
-            self.io_loop.call_later(0.1, self._initiate_restart)
-        self.broadcast_status()
-
-    def broadcast_status(self):
-        status_msg = "paused" if self.sim.paused else "playing"
-        self.send_json(
-            {
-                "status": status_msg,
-                "agent_enabled": self.sim.agent_enabled,
-            }
-        )
+    def set_protocol(self, options: dict):
+        """
+        Selects the telemetry wire format for this connection, e.g.
+        {"version": 2, "precision": "float32"}. {"keyframe": true} asks the
+        delta encoder for a full frame, e.g. after a sequence gap.
+        """
+        try:
+            version = int(options.get("version", 0))
+            if version == PROTOCOL_VERSION_FULL:
+                self.precision = None
+            elif version == PROTOCOL_VERSION_DELTA:
+                precision = options.get("precision", self.telemetry_config["precision"])
+                self.room.delta_encoder(precision)  # validates the precision
+                self.precision = precision
+            elif options.get("keyframe") and self.precision:
+                self._delta_encoder().request_keyframe()
+                return
+            else:
+                raise ValueError(f"Unsupported protocol version {version}")
+        except ValueError as e:
+            self.send_json({"error": str(e)})
+            return
+
+        if self.precision:
+            # The encoder is shared by the room, so every delta subscriber
+            # gets the keyframe this client needs to start decoding
+            encoder = self._delta_encoder()
+            encoder.request_keyframe()
+            self.send_json({"protocol": encoder.describe()})
+        else:
+            self.send_json({"protocol": {"version": PROTOCOL_VERSION_FULL}})
+
+    def _delta_encoder(self) -> DeltaEncoder:
+        return self.room.delta_encoder(self.precision)
+
+    def _request_keyframe(self):
+        """Outbox dropped a delta frame; the next frame must be a keyframe."""
+        if self.room and self.precision:
+            self._delta_encoder().request_keyframe()
+
+    @property
+    def send_stats(self) -> Dict[str, float]:
+        return self.outbox.stats
 
     def send_json(self, payload: dict):
         try:
-            self.write_message(json.dumps(payload))
+            self.outbox.push_message(json.dumps(payload))
+        except OutboxOverflow as e:
+            self.logger.warning(f"Closing slow WebSocket client: {e}")
+            self.outbox.close()
+            self.close()
         except Exception as e:
             self.logger.error(f"Failed to send message: {e}")
 
-    def send_binary_telemetry(
-        self,
-        states: List[Optional[dict]],
-        rewards: List[Optional[float]],
-        _dones: List[bool],
-        actions: List[Dict[str, float]],
-        landing_statuses: List[Optional[str]],
-    ):
-        try:
-            data = bytearray()
-            data.extend(BinaryProtocol.encode_telemetry_header())
-            for i in range(self.num_rockets):
-                landing_str = landing_statuses[i]
-                if landing_str is None and i in self.final_outcomes:
-                    landing_str = self.final_outcomes[i]["status"]
-
-                chunk = BinaryProtocol.encode_rocket_state(
-                    state=states[i],
-                    reward=rewards[i],
-                    action=actions[i],
-                    landing_status=landing_str,
-                )
-                data.extend(chunk)
-            self.write_message(bytes(data), binary=True)
-        except Exception as e:
-            self.logger.error(f"Failed to send binary telemetry: {e}")
-
-    def send_state_update(
-        self,
-        states: List[Optional[dict]],
-        rewards: List[Optional[float]],
-        dones: List[bool],
-    ):
-        try:
-            prev_actions = self.sim.prev_action_taken.copy()
-            actions_for_payload: List[Dict[str, float]] = []
-            landing_statuses: List[Optional[str]] = [None] * self.num_rockets
-
-            for i in range(self.num_rockets):
-                actions_for_payload.append(
-                    prev_actions[i]
-                    if states[i] and not dones[i]
-                    else {"throttle": 0.0, "coldGas": 0.0}
-                )
-                if dones[i] and states[i] is not None:
-                    landing_eval = evaluate_landing(states[i], self.config)
-                    status_str = landing_eval["landing_message"]
-                    landing_statuses[i] = status_str
-                    self.final_outcomes[i] = {
-                        "status": status_str,
-                        "reward": rewards[i],
-                    }
-
-            self.io_loop.add_callback(
-                self.send_binary_telemetry,
-                states,
-                rewards,
-                dones,
-                actions_for_payload,
-                landing_statuses,
-            )
-
-            if all(dones):
-                self.broadcast_status()
-                if self.config.get("simulation.loop"):
-                    self.io_loop.call_later(0.1, self._initiate_restart)
-        except Exception as e:
-            self.logger.error(f"Failed to prepare state update: {e}")
-
-    def _initiate_restart(self):
-        states = self.sim.reset()
-        self.final_outcomes = {}
-        self.send_json(
-            {
-                "step": {
-                    "state": states,
-                    "reward": None,
-                    "done": [False] * self.num_rockets,
-                    "prev_action_taken": None,
-                },
-                "restart": True,
-            }
-        )
-        self.broadcast_status()
+    def send_binary(self, data: bytes):
+        """Queues a telemetry frame; frames are dropped if the client lags."""
+        self.outbox.push_frame(data)
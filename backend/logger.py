@@ -2,8 +2,15 @@ import logging
 import os
 import json
 import sys
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Deque, Dict, Optional, Union
 from backend.settings import settings
 
+WRITER_POLICIES = ("drop", "block", "sample")
+
 
 class JsonFormatter(logging.Formatter):
     """
@@ -24,10 +31,228 @@ class JsonFormatter(logging.Formatter):
         return json.dumps(log_record)
 
 
+class LogWriter:
+    """
+    Background writer for one log file.
+
+    Producers (the simulation tick) only append to a deque; a dedicated
+    thread formats the records and writes them in batches. The deque append
+    is atomic, so the hot path takes no lock unless it wakes the writer.
+
+    Entries are either LogRecords or `(created, name, step_entry)` tuples
+    from `submit_step`, whose JSON encoding is deferred to the writer
+    thread. When `max_queue` entries are waiting, `policy` decides what
+    happens to new DEBUG entries:
+
+        drop    discard them
+        block   wait for the writer to catch up
+        sample  keep one in `sample_every` once the queue is half full,
+                and discard them when it is full
+
+    INFO and above are always queued.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        formatter: logging.Formatter,
+        policy: str = "drop",
+        max_queue: int = 100000,
+        batch_size: int = 1000,
+        flush_interval: float = 0.5,
+        sample_every: int = 10,
+    ):
+        if policy not in WRITER_POLICIES:
+            raise ValueError(
+                f"Unknown log writer policy '{policy}', expected one of {WRITER_POLICIES}"
+            )
+        if max_queue < 1 or batch_size < 1 or sample_every < 1:
+            raise ValueError("max_queue, batch_size and sample_every must be at least 1.")
+        self.file_path = file_path
+        self.formatter = formatter
+        self.policy = policy
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sample_every = sample_every
+
+        self._queue: Deque = deque()
+        self._wakeup = threading.Event()
+        self._space = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._closing = False
+        self._sample_count = 0
+
+        self.written = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.batches = 0
+        self.max_queued = 0
+
+        self._file = open(file_path, "a", encoding="utf-8", buffering=1 << 20)
+        self._thread = threading.Thread(
+            target=self._run, name=f"log-writer-{os.path.basename(file_path)}", daemon=True
+        )
+        self._thread.start()
+        _writers.add(self)
+
+    def submit(self, entry: Union[logging.LogRecord, tuple], levelno: int = logging.DEBUG) -> bool:
+        """Queues an entry; returns False if the policy discarded it."""
+        if self._closing:
+            return False
+        if levelno < logging.INFO and not self._admit(len(self._queue)):
+            return False
+        queued = len(self._queue)
+        self._queue.append(entry)
+        self._idle.clear()
+        if queued + 1 > self.max_queued:
+            self.max_queued = queued + 1
+        if queued + 1 >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def submit_step(self, name: str, entry: Dict) -> bool:
+        """Queues a StepLog entry; `entry` must not be mutated afterwards."""
+        return self.submit((time.time(), name, entry))
+
+    def _admit(self, queued: int) -> bool:
+        if self.policy == "sample" and queued >= self.max_queue // 2:
+            self._sample_count += 1
+            if self._sample_count % self.sample_every:
+                self.sampled_out += 1
+                return False
+        if queued < self.max_queue:
+            return True
+        if self.policy == "block":
+            while len(self._queue) >= self.max_queue and not self._closing:
+                self._space.clear()
+                self._wakeup.set()
+                self._space.wait(0.1)
+            return not self._closing
+        self.dropped += 1
+        return False
+
+    def _format(self, entry) -> str:
+        if isinstance(entry, logging.LogRecord):
+            return self.formatter.format(entry)
+        created, name, step_entry = entry
+        record = logging.makeLogRecord(
+            {
+                "name": name,
+                "levelno": logging.DEBUG,
+                "levelname": "DEBUG",
+                "msg": f"StepLog: {json.dumps(step_entry)}",
+                "created": created,
+            }
+        )
+        return self.formatter.format(record)
+
+    def _write_batch(self) -> int:
+        lines = []
+        queue = self._queue
+        while queue and len(lines) < self.batch_size:
+            try:
+                entry = queue.popleft()
+            except IndexError:
+                break
+            try:
+                lines.append(self._format(entry))
+            except Exception as e:
+                lines.append(json.dumps({"level": "ERROR", "message": f"Unformattable log entry: {e}"}))
+        self._space.set()
+        if lines:
+            self._file.write("\n".join(lines) + "\n")
+            self.written += len(lines)
+            self.batches += 1
+        return len(lines)
+
+    def _run(self):
+        try:
+            while True:
+                self._wakeup.wait(self.flush_interval)
+                self._wakeup.clear()
+                while self._write_batch():
+                    pass
+                self._file.flush()
+                if not self._queue:
+                    self._idle.set()
+                if self._closing and not self._queue:
+                    break
+        except Exception as e:
+            print(f"Log writer for {self.file_path} failed: {e}")
+        finally:
+            self._idle.set()
+            self._space.set()
+            self._file.close()
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Writes everything queued so far; returns False on timeout."""
+        if not self._thread.is_alive():
+            return not self._queue
+        self._wakeup.set()
+        return self._idle.wait(timeout)
+
+    def close(self, wait: bool = True, timeout: float = 5.0):
+        """Drains the queue and stops the writer; `wait=False` drains in the background."""
+        self._closing = True
+        self._wakeup.set()
+        self._space.set()
+        if wait:
+            self._thread.join(timeout)
+        _writers.discard(self)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": len(self._queue),
+            "max_queued": self.max_queued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "sampled_out": self.sampled_out,
+            "batches": self.batches,
+        }
+
+
+class LogWriterHandler(logging.Handler):
+    """Hands records to a LogWriter; formatting happens on its thread."""
+
+    def __init__(self, writer: LogWriter):
+        super().__init__()
+        self.writer = writer
+
+    def emit(self, record):
+        self.writer.submit(record, record.levelno)
+
+    def close(self):
+        # Drain in the background so closing never blocks the caller
+        self.writer.close(wait=False)
+        super().close()
+
+
+_writers: "weakref.WeakSet[LogWriter]" = weakref.WeakSet()
+
+
+def drain_log_writers(timeout: float = 5.0):
+    """Flushes and stops every open LogWriter, e.g. on server shutdown."""
+    deadline = time.monotonic() + timeout
+    for writer in list(_writers):
+        writer.close(wait=True, timeout=max(0.0, deadline - time.monotonic()))
+
+
 class Logger:
     def __init__(
-        self, file_name=None, log_dir=None, stream_handler=True, file_handler=True
+        self,
+        file_name=None,
+        log_dir=None,
+        stream_handler=True,
+        file_handler=True,
+        writer_options: Optional[Dict] = None,
     ):
+        """
+        With `writer_options`, the file is written by a LogWriter thread
+        (see LogWriter for the options) instead of a blocking FileHandler.
+        """
         if not file_name:
             raise ValueError("Log file name must be specified.")
 
@@ -39,9 +264,14 @@ class Logger:
 
         formatter = JsonFormatter(datefmt="%Y-%m-%d %H:%M:%S")
 
+        self.writer: Optional[LogWriter] = None
         if file_handler:
             file_path = os.path.join(self.log_dir, file_name)
-            fh = logging.FileHandler(file_path)
+            if writer_options is not None:
+                self.writer = LogWriter(file_path, formatter, **writer_options)
+                fh = LogWriterHandler(self.writer)
+            else:
+                fh = logging.FileHandler(file_path)
             fh.setLevel(logging.DEBUG)
             fh.setFormatter(formatter)
             self.logger.addHandler(fh)
@@ -1,3 +1,4 @@
 from .engine import PhysicsEngine
+from .batch import BatchPhysicsEngine
 
-__all__ = ["PhysicsEngine"]
+__all__ = ["PhysicsEngine", "BatchPhysicsEngine"]
@@ -0,0 +1,262 @@
+import numpy as np
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from backend.physics.engine import PhysicsEngine
+
+# Row layout of the struct-of-arrays state block. Every field is a contiguous
+# float64 row of shape (N,), so whole-fleet updates are single array operations.
+STATE_FIELDS = (
+    "x",
+    "y",
+    "vx",
+    "vy",
+    "ax",
+    "ay",
+    "angle",
+    "angularVelocity",
+    "angularAcceleration",
+    "mass",
+    "fuelMass",
+)
+
+# Positions at t - dt, needed by the Verlet update.
+PREVIOUS_FIELDS = ("prev_x", "prev_y", "prev_angle")
+
+FIELD_INDEX = {name: i for i, name in enumerate(STATE_FIELDS + PREVIOUS_FIELDS)}
+
+
+class BatchPhysicsEngine(PhysicsEngine):
+    """
+    Vectorized physics for a fleet of N rockets.
+
+    Shares its constants (and their validation) with the scalar PhysicsEngine,
+    but keeps the fleet state in a single (fields, N) float64 block instead of
+    one dict per rocket. `step` advances every rocket with the same forces,
+    damped Verlet update and fuel burn as `Rocket.apply_action`.
+    """
+
+    def __init__(self, num_rockets: int, data: Optional[np.ndarray] = None):
+        """
+        Args:
+            num_rockets: Fleet size N.
+            data: Optional existing (len(STATE_FIELDS) + len(PREVIOUS_FIELDS), N)
+                float64 block to operate on in place, e.g. a slice of a shared
+                memory buffer. A zeroed block is allocated if omitted.
+        """
+        super().__init__()
+        if num_rockets < 0:
+            raise ValueError("num_rockets cannot be negative.")
+
+        self.num_rockets = num_rockets
+        shape = (len(STATE_FIELDS) + len(PREVIOUS_FIELDS), num_rockets)
+        if data is None:
+            data = np.zeros(shape, dtype=np.float64)
+        elif data.shape != shape or data.dtype != np.float64:
+            raise ValueError(
+                f"State block must be float64 with shape {shape}, got {data.dtype} {data.shape}."
+            )
+        self.data = data
+
+        # Zero-copy row views into the state block
+        self.x = self.data[FIELD_INDEX["x"]]
+        self.y = self.data[FIELD_INDEX["y"]]
+        self.vx = self.data[FIELD_INDEX["vx"]]
+        self.vy = self.data[FIELD_INDEX["vy"]]
+        self.ax = self.data[FIELD_INDEX["ax"]]
+        self.ay = self.data[FIELD_INDEX["ay"]]
+        self.angle = self.data[FIELD_INDEX["angle"]]
+        self.angular_velocity = self.data[FIELD_INDEX["angularVelocity"]]
+        self.angular_acceleration = self.data[FIELD_INDEX["angularAcceleration"]]
+        self.mass = self.data[FIELD_INDEX["mass"]]
+        self.fuel_mass = self.data[FIELD_INDEX["fuelMass"]]
+        self.prev_x = self.data[FIELD_INDEX["prev_x"]]
+        self.prev_y = self.data[FIELD_INDEX["prev_y"]]
+        self.prev_angle = self.data[FIELD_INDEX["prev_angle"]]
+
+        # Per-rocket constants folded once
+        self._drag_factor = (
+            0.5 * self.air_density * self.drag_coefficient * self.reference_area
+        )
+        self._inertia_factor = 0.5 * self.rocket_radius**2
+        self._torque_per_unit = self.cold_gas_thrust_power * self.cold_gas_moment_arm
+
+    @property
+    def state(self) -> np.ndarray:
+        """(len(STATE_FIELDS), N) view of the current state, without previous positions."""
+        return self.data[: len(STATE_FIELDS)]
+
+    def field(self, name: str) -> np.ndarray:
+        """Returns the (N,) row view for a state field by its dict key."""
+        return self.data[FIELD_INDEX[name]]
+
+    def load_states(
+        self, states: Sequence[Dict], indices: Optional[Sequence[int]] = None
+    ):
+        """
+        Writes state dicts into the given rocket slots (all slots by default) and
+        derives a consistent previous state for them, as `Rocket` does on reset.
+        """
+        if indices is None:
+            indices = range(self.num_rockets)
+        if len(indices) != len(states):
+            raise ValueError("Number of states must match number of indices.")
+
+        columns = {
+            name: np.array([s.get(name, 0.0) for s in states], dtype=np.float64)
+            for name in STATE_FIELDS
+        }
+        self.load_state_arrays(columns, indices)
+
+    def load_state_arrays(
+        self, states: Mapping[str, np.ndarray], indices: Optional[Sequence[int]] = None
+    ):
+        """
+        Column-wise `load_states`: `states` maps state keys to arrays with one
+        entry per selected rocket. Missing keys are zero-filled.
+        """
+        idx = (
+            np.arange(self.num_rockets)
+            if indices is None
+            else np.asarray(indices, dtype=np.intp)
+        )
+        for name in STATE_FIELDS:
+            self.data[FIELD_INDEX[name], idx] = states.get(name, 0.0)
+        self.initialize_previous_state(idx)
+
+    def initialize_previous_state(self, indices=None):
+        """
+        Vectorized `Rocket.calculate_consistent_previous_state` for the selected
+        rockets: previous positions assume zero controls at t=0.
+        """
+        idx = slice(None) if indices is None else indices
+        dt = self.dt
+
+        total_mass = self.mass[idx] + self.fuel_mass[idx]
+        zeros = np.zeros_like(total_mass)
+        ax, ay = self.compute_linear_acceleration(
+            total_mass, zeros, self.angle[idx], self.vx[idx], self.vy[idx]
+        )
+        alpha = self.compute_angular_acceleration(zeros, total_mass)
+
+        self.prev_x[idx] = self.x[idx] - self.vx[idx] * dt + 0.5 * ax * dt**2
+        self.prev_y[idx] = self.y[idx] - self.vy[idx] * dt + 0.5 * ay * dt**2
+        self.prev_angle[idx] = self.normalize_angle_180_batch(
+            self.angle[idx] - self.angular_velocity[idx] * dt + 0.5 * alpha * dt**2
+        )
+
+    def compute_linear_acceleration(
+        self,
+        total_mass: np.ndarray,
+        throttle: np.ndarray,
+        angle_degrees: np.ndarray,
+        vx: np.ndarray,
+        vy: np.ndarray,
+    ):
+        """Gravity + thrust + drag divided by mass, for every rocket at once."""
+        angle_radians = np.deg2rad(angle_degrees)
+        thrust = np.where(throttle > 1e-6, throttle, 0.0) * self.thrust_power
+
+        # |drag| = k * v^2 opposing v, i.e. drag = -k * |v| * v
+        speed = np.sqrt(vx * vx + vy * vy)
+        drag_scale = np.where(speed * speed > 1e-9, self._drag_factor * speed, 0.0)
+
+        fx = thrust * np.sin(angle_radians) - drag_scale * vx
+        fy = (
+            np.maximum(total_mass, 0.0) * self.gravity
+            + thrust * np.cos(angle_radians)
+            - drag_scale * vy
+        )
+
+        has_mass = total_mass > 1e-6
+        safe_mass = np.where(has_mass, total_mass, 1.0)
+        ax = np.where(has_mass, fx / safe_mass, 0.0)
+        ay = np.where(has_mass, fy / safe_mass, 0.0)
+        return ax, ay
+
+    def compute_angular_acceleration(
+        self, cold_gas_control: np.ndarray, total_mass: np.ndarray
+    ) -> np.ndarray:
+        """Cold gas torque over solid-cylinder inertia, in degrees/s^2."""
+        inertia = self._inertia_factor * total_mass
+        valid = (total_mass > 1e-6) & (inertia >= 1e-6)
+        safe_inertia = np.where(valid, inertia, 1.0)
+        alpha = np.rad2deg(self._torque_per_unit * cold_gas_control / safe_inertia)
+        return np.where(valid, alpha, 0.0)
+
+    @staticmethod
+    def normalize_angle_180_batch(angle_degrees: np.ndarray) -> np.ndarray:
+        """Normalize angles to the range [-180, 180) degrees."""
+        wrapped = np.mod(angle_degrees, 360.0)
+        return np.where(wrapped >= 180.0, wrapped - 360.0, wrapped)
+
+    def step(
+        self,
+        throttle: np.ndarray,
+        cold_gas_control: np.ndarray,
+        active: Optional[np.ndarray] = None,
+    ):
+        """
+        Advances every active rocket by one time step in place.
+
+        Args:
+            throttle: (N,) main engine throttle, clipped to [0, 1].
+            cold_gas_control: (N,) cold gas control, clipped to [-1, 1].
+            active: Optional (N,) bool mask; inactive rockets are left untouched.
+        """
+        dt = self.dt
+        throttle = np.clip(np.asarray(throttle, dtype=np.float64), 0.0, 1.0)
+        cold_gas_control = np.clip(
+            np.asarray(cold_gas_control, dtype=np.float64), -1.0, 1.0
+        )
+        if active is None:
+            active = np.ones(self.num_rockets, dtype=bool)
+
+        # No fuel, no main thrust
+        out_of_fuel = active & (self.fuel_mass <= 0.0)
+        throttle = np.where(out_of_fuel, 0.0, throttle)
+        self.fuel_mass[out_of_fuel] = 0.0
+
+        total_mass = self.mass + self.fuel_mass
+        live = active & (total_mass > 1e-6)
+
+        ax, ay = self.compute_linear_acceleration(
+            total_mass, throttle, self.angle, self.vx, self.vy
+        )
+        alpha = self.compute_angular_acceleration(cold_gas_control, total_mass)
+
+        # Damped position Verlet, velocities by backward difference
+        new_x = 2.0 * self.x - self.prev_x + ax * dt**2
+        new_y = 2.0 * self.y - self.prev_y + ay * dt**2
+        damping_factor = max(0.0, 1.0 - (self.angular_damping * dt))
+        new_angle = (
+            self.angle + (self.angle - self.prev_angle) * damping_factor + alpha * dt**2
+        )
+
+        new_fuel = np.maximum(
+            0.0, self.fuel_mass - throttle * self.fuel_consumption_rate * dt
+        )
+
+        np.copyto(self.ax, ax, where=live)
+        np.copyto(self.ay, ay, where=live)
+        np.copyto(self.angular_acceleration, alpha, where=live)
+        np.copyto(self.vx, (new_x - self.x) / dt, where=live)
+        np.copyto(self.vy, (new_y - self.y) / dt, where=live)
+        np.copyto(self.angular_velocity, (new_angle - self.angle) / dt, where=live)
+        np.copyto(self.prev_x, self.x, where=live)
+        np.copyto(self.prev_y, self.y, where=live)
+        np.copyto(self.prev_angle, self.angle, where=live)
+        np.copyto(self.x, new_x, where=live)
+        np.copyto(self.y, new_y, where=live)
+        np.copyto(self.angle, self.normalize_angle_180_batch(new_angle), where=live)
+        np.copyto(self.fuel_mass, new_fuel, where=live)
+
+    def get_state(self, index: int) -> Dict[str, float]:
+        """Returns rocket `index` as a dict with the same keys as `Rocket.get_state`."""
+        state = {name: float(self.data[FIELD_INDEX[name], index]) for name in STATE_FIELDS}
+        state["speed"] = float(np.hypot(state["vx"], state["vy"]))
+        state["relativeAngle"] = abs(state["angle"])
+        state["totalMass"] = state["mass"] + state["fuelMass"]
+        return state
+
+    def get_states(self) -> List[Dict[str, float]]:
+        return [self.get_state(i) for i in range(self.num_rockets)]
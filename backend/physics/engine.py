@@ -1,35 +1,27 @@
 import numpy as np
-from backend.simulation.config import get_physics_config, get_environment_config
-
-env_config = get_environment_config()
-physics_config = get_physics_config()
+from backend.config import get_snapshot
 
 
 class PhysicsEngine:
     def __init__(self):
-        self.gravity = env_config.get("gravity", -9.81)
-        self.dt = env_config.get("time_step", 0.1)  # s
+        physics = get_snapshot().physics
+        self.gravity = physics.gravity
+        self.dt = physics.time_step  # s
 
         # Rocket parameters
-        self.thrust_power = env_config.get("thrust_power", 5000000.0)  # N
-        self.cold_gas_thrust_power = env_config.get(
-            "cold_gas_thrust_power", 5000.0
-        )  # N
-        self.fuel_consumption_rate = env_config.get(
-            "fuel_consumption_rate", 1700.0
-        )  # kg/(s * throttle)
+        self.thrust_power = physics.thrust_power  # N
+        self.cold_gas_thrust_power = physics.cold_gas_thrust_power  # N
+        self.fuel_consumption_rate = physics.fuel_consumption_rate  # kg/(s * throttle)
 
         # Aerodynamics & physics
-        self.air_density = physics_config.get("air_density", 1.225)  # kg/m³
-        self.drag_coefficient = physics_config.get("drag_coefficient", 0.8)
-        self.reference_area = physics_config.get("reference_area", 10.8)  # m²
-        self.rocket_radius = physics_config.get("rocket_radius", 1.85)  # m
-        self.cold_gas_moment_arm = physics_config.get(
-            "cold_gas_moment_arm", self.rocket_radius
-        )  # m
+        self.air_density = physics.air_density  # kg/m³
+        self.drag_coefficient = physics.drag_coefficient
+        self.reference_area = physics.reference_area  # m²
+        self.rocket_radius = physics.radius  # m
+        self.cold_gas_moment_arm = physics.cold_gas_moment_arm  # m
 
         # Stability
-        self.angular_damping = physics_config.get("angular_damping", 0.05)
+        self.angular_damping = physics.angular_damping
 
         # Safety checks
         if self.dt <= 0:
@@ -1,5 +1,51 @@
 import struct
-from typing import Dict, Optional
+import numpy as np
+from itertools import chain
+from operator import itemgetter
+from typing import Dict, Optional, Sequence
+
+# Field order of one 64-byte rocket record, see BinaryProtocol
+STATE_FIELDS = (
+    "x",
+    "y",
+    "vx",
+    "vy",
+    "ax",
+    "ay",
+    "angle",
+    "angularVelocity",
+    "angularAcceleration",
+    "mass",
+    "fuelMass",
+)
+RECORD_FIELDS = STATE_FIELDS + (
+    "reward",
+    "throttle",
+    "coldGas",
+    "landing_code",
+    "is_active",
+)
+
+# Explicitly little-endian: the frontend reads with DataView(..., true)
+RECORD_DTYPE = np.dtype([(name, "<f4") for name in RECORD_FIELDS])
+
+LANDING_CODES = {
+    "safe": 1.0,
+    "good": 2.0,
+    "ok": 3.0,
+    "unsafe": 4.0,
+    "crash": 4.0,
+    "destroy": 4.0,
+    "failed": 4.0,
+}
+
+_state_getter = itemgetter(*STATE_FIELDS)
+
+PROTOCOL_VERSION_FULL = 1
+PROTOCOL_VERSION_DELTA = 2
+
+PRECISIONS = {"float16": "<f2", "float32": "<f4"}
+FLOAT16_MAX = float(np.finfo(np.float16).max)
 
 
 class BinaryProtocol:
@@ -30,18 +76,11 @@ class BinaryProtocol:
 
     # Message Types
     MSG_TELEMETRY = 1
+    MSG_TELEMETRY_DELTA = 2  # see DeltaEncoder
 
     @staticmethod
     def _get_landing_code(status: Optional[str]) -> float:
-        if status == "safe":
-            return 1.0
-        elif status == "good":
-            return 2.0
-        elif status == "ok":
-            return 3.0
-        elif status in ["unsafe", "crash", "destroy", "failed"]:
-            return 4.0
-        return 0.0
+        return LANDING_CODES.get(status, 0.0)
 
     @staticmethod
     def encode_telemetry_header() -> bytes:
@@ -94,3 +133,279 @@ class BinaryProtocol:
                 landing_code,
                 1.0,  # is_active = 1.0
             )
+
+
+class FleetEncoder:
+    """
+    Encodes a whole fleet into one telemetry message.
+
+    Produces exactly the bytes of the header followed by N
+    `BinaryProtocol.encode_rocket_state` chunks, but fills a preallocated
+    structured array column by column and serializes it with a single copy.
+    """
+
+    def __init__(self, num_rockets: int):
+        self.num_rockets = num_rockets
+        self._buffer = bytearray(1 + RECORD_DTYPE.itemsize * num_rockets)
+        self._buffer[0] = BinaryProtocol.MSG_TELEMETRY
+        self.records = np.frombuffer(self._buffer, dtype=RECORD_DTYPE, offset=1)
+        # Float view over the same memory: row i is rocket i's 16 floats
+        self._flat = self.records.view("<f4").reshape(num_rockets, len(RECORD_FIELDS))
+        self._states = np.zeros((num_rockets, len(STATE_FIELDS)), dtype=np.float64)
+
+    def encode(
+        self,
+        states: Sequence[Optional[Dict]],
+        rewards: Sequence[Optional[float]],
+        actions: Sequence[Dict[str, float]],
+        landing_statuses: Sequence[Optional[str]],
+    ) -> bytes:
+        """Encodes per-rocket dicts as produced by SimulationController.step."""
+        self.fill(states, rewards, actions, landing_statuses)
+        return self.tobytes()
+
+    def encode_arrays(self, *columns: np.ndarray) -> bytes:
+        """Encodes column arrays directly, see `fill_arrays`."""
+        self.fill_arrays(*columns)
+        return self.tobytes()
+
+    def tobytes(self) -> bytes:
+        """The message for the records as last filled."""
+        return bytes(self._buffer)
+
+    def fill(
+        self,
+        states: Sequence[Optional[Dict]],
+        rewards: Sequence[Optional[float]],
+        actions: Sequence[Dict[str, float]],
+        landing_statuses: Sequence[Optional[str]],
+    ) -> np.ndarray:
+        """Writes per-rocket dicts into `records` and returns it."""
+        active = np.array([s is not None for s in states], dtype=bool)
+        live = [s for s in states if s is not None]
+        if live:
+            try:
+                # One flat pass over all live states; avoids per-row conversion
+                values = np.fromiter(
+                    chain.from_iterable(map(_state_getter, live)),
+                    dtype=np.float64,
+                    count=len(live) * len(STATE_FIELDS),
+                )
+            except KeyError:
+                values = np.array(
+                    [[s.get(name, 0.0) for name in STATE_FIELDS] for s in live],
+                    dtype=np.float64,
+                )
+            self._states[active] = values.reshape(len(live), len(STATE_FIELDS))
+
+        reward = np.array([0.0 if r is None else r for r in rewards], dtype=np.float32)
+        throttle = np.array([a.get("throttle", 0.0) for a in actions], dtype=np.float32)
+        cold_gas = np.array([a.get("coldGas", 0.0) for a in actions], dtype=np.float32)
+        landing_codes = np.array(
+            [LANDING_CODES.get(status, 0.0) for status in landing_statuses],
+            dtype=np.float32,
+        )
+        return self.fill_arrays(
+            self._states, reward, throttle, cold_gas, landing_codes, active
+        )
+
+    def fill_arrays(
+        self,
+        states: np.ndarray,
+        rewards: np.ndarray,
+        throttle: np.ndarray,
+        cold_gas: np.ndarray,
+        landing_codes: np.ndarray,
+        active: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Writes column arrays into `records` and returns it.
+
+        Args:
+            states: (N, 11) array in STATE_FIELDS order.
+            rewards, throttle, cold_gas, landing_codes: (N,) arrays.
+            active: (N,) bool; inactive rockets get zeroed state and controls
+                and a NaN reward so the frontend keeps its last value.
+        """
+        flat = self._flat
+        inactive = ~np.asarray(active, dtype=bool)
+        flat[:, : len(STATE_FIELDS)] = states
+        records = self.records
+        records["reward"] = rewards
+        records["throttle"] = throttle
+        records["coldGas"] = cold_gas
+        records["landing_code"] = landing_codes
+        records["is_active"] = ~inactive
+
+        if inactive.any():
+            flat[inactive, : len(STATE_FIELDS)] = 0.0
+            records["reward"][inactive] = np.nan
+            records["throttle"][inactive] = 0.0
+            records["coldGas"][inactive] = 0.0
+
+        return records
+
+
+class DeltaEncoder:
+    """
+    Protocol version 2: delta-compressed telemetry frames.
+
+    Frame layout (little-endian):
+        header   u8 msg_type (=2), u8 flags (bit 0: keyframe),
+                 u32 sequence, f64 sim_time, u32 num_rockets   (18 bytes)
+        active   ceil(N / 8) bytes, bit i set if rocket i is active
+        changed  ceil(N / 8) bytes, bit i set if rocket i's record follows
+        records  one `layout` record per changed rocket, in index order
+
+    Bitmasks are LSB-first (rocket i is bit i % 8 of byte i // 8). A rocket is
+    sent when its quantized record differs from the last one sent, so a
+    finished rocket goes out once with its landing code and then stays
+    silent. Keyframes carry every rocket; they are sent every
+    `keyframe_interval` frames and after `request_keyframe()`, and let a
+    client that missed a frame (sequence gap) resynchronize.
+
+    Fields use `precision` unless listed in `float32_fields`; float16 fields
+    saturate at +/-65504, so large-magnitude fields (masses) belong in
+    `float32_fields`.
+    """
+
+    HEADER = struct.Struct("<BBIdI")
+    FLAG_KEYFRAME = 0x01
+
+    def __init__(
+        self,
+        num_rockets: int,
+        precision: str = "float16",
+        float32_fields: Sequence[str] = (),
+        keyframe_interval: int = 30,
+    ):
+        if precision not in PRECISIONS:
+            raise ValueError(
+                f"Unknown precision '{precision}', expected one of {sorted(PRECISIONS)}"
+            )
+        unknown = set(float32_fields) - set(RECORD_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown telemetry fields: {sorted(unknown)}")
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1.")
+
+        self.num_rockets = num_rockets
+        self.keyframe_interval = keyframe_interval
+        self.layout = [
+            (name, "<f4" if name in float32_fields else PRECISIONS[precision])
+            for name in RECORD_FIELDS
+        ]
+        self.dtype = np.dtype(self.layout)
+        self._half_fields = {name for name, code in self.layout if code == "<f2"}
+        self.sequence = 0
+        self._force_keyframe = True
+        self._quantized = np.zeros(num_rockets, dtype=self.dtype)
+        self._last_sent = np.zeros((num_rockets, self.dtype.itemsize), dtype=np.uint8)
+
+    def describe(self) -> Dict:
+        """Layout announcement sent to the client when it selects version 2."""
+        return {
+            "version": PROTOCOL_VERSION_DELTA,
+            "fields": [[name, np.dtype(code).name] for name, code in self.layout],
+            "keyframe_interval": self.keyframe_interval,
+        }
+
+    def request_keyframe(self):
+        self._force_keyframe = True
+
+    def encode(self, records: np.ndarray, sim_time: float) -> bytes:
+        """
+        Encodes a full-fleet `RECORD_DTYPE` array (e.g. `FleetEncoder.records`)
+        as the next frame.
+        """
+        quantized = self._quantized
+        for name in RECORD_FIELDS:
+            if name in self._half_fields:
+                # Saturate instead of overflowing to inf; NaN passes through
+                quantized[name] = np.clip(records[name], -FLOAT16_MAX, FLOAT16_MAX)
+            else:
+                quantized[name] = records[name]
+        # Byte-wise comparison, so NaN rewards of finished rockets compare equal
+        raw = quantized.view(np.uint8).reshape(self.num_rockets, self.dtype.itemsize)
+
+        keyframe = self._force_keyframe or self.sequence % self.keyframe_interval == 0
+        if keyframe:
+            changed = np.ones(self.num_rockets, dtype=bool)
+            self._force_keyframe = False
+        else:
+            changed = (raw != self._last_sent).any(axis=1)
+        self._last_sent[changed] = raw[changed]
+
+        active = records["is_active"] > 0.5
+        header = self.HEADER.pack(
+            BinaryProtocol.MSG_TELEMETRY_DELTA,
+            self.FLAG_KEYFRAME if keyframe else 0,
+            self.sequence,
+            sim_time,
+            self.num_rockets,
+        )
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+        return b"".join(
+            (
+                header,
+                np.packbits(active, bitorder="little").tobytes(),
+                np.packbits(changed, bitorder="little").tobytes(),
+                quantized[changed].tobytes(),
+            )
+        )
+
+
+class DeltaDecoder:
+    """
+    Reference decoder for DeltaEncoder frames.
+
+    Keeps the last known record of every rocket and applies each frame on top
+    of it. A delta frame that does not follow the previous sequence number
+    raises ValueError; the client should then ask for a keyframe.
+    """
+
+    def __init__(self, layout: Sequence[Sequence[str]]):
+        self.dtype = np.dtype(
+            [(name, np.dtype(code).newbyteorder("<")) for name, code in layout]
+        )
+        self.records: Optional[np.ndarray] = None
+        self.sequence: Optional[int] = None
+        self.sim_time = 0.0
+
+    def decode(self, frame: bytes) -> np.ndarray:
+        header = DeltaEncoder.HEADER
+        msg_type, flags, sequence, sim_time, num_rockets = header.unpack_from(frame)
+        if msg_type != BinaryProtocol.MSG_TELEMETRY_DELTA:
+            raise ValueError(f"Not a delta telemetry frame (type {msg_type}).")
+
+        keyframe = bool(flags & DeltaEncoder.FLAG_KEYFRAME)
+        if not keyframe:
+            if self.records is None or len(self.records) != num_rockets:
+                raise ValueError("Delta frame received before a keyframe.")
+            if sequence != (self.sequence + 1) & 0xFFFFFFFF:
+                raise ValueError(
+                    f"Sequence gap: expected {(self.sequence + 1) & 0xFFFFFFFF}, got {sequence}."
+                )
+        if self.records is None or len(self.records) != num_rockets:
+            self.records = np.zeros(num_rockets, dtype=RECORD_DTYPE)
+
+        mask_bytes = (num_rockets + 7) // 8
+        offset = header.size
+        masks = np.frombuffer(frame, dtype=np.uint8, count=2 * mask_bytes, offset=offset)
+        active = np.unpackbits(masks[:mask_bytes], count=num_rockets, bitorder="little")
+        changed = np.unpackbits(
+            masks[mask_bytes:], count=num_rockets, bitorder="little"
+        ).astype(bool)
+        offset += 2 * mask_bytes
+
+        updates = np.frombuffer(
+            frame, dtype=self.dtype, count=int(changed.sum()), offset=offset
+        )
+        indices = np.flatnonzero(changed)
+        for name in RECORD_FIELDS:
+            self.records[name][indices] = updates[name]
+        self.records["is_active"] = active
+
+        self.sequence = sequence
+        self.sim_time = sim_time
+        return self.records
@@ -1,4 +1,19 @@
-from .agent import RLAgent
-from .reward import calculate_reward
+from .reward import RewardParams, calculate_reward, calculate_reward_batch, reward_params
 
-__all__ = ["RLAgent", "calculate_reward"]
+__all__ = [
+    "RLAgent",
+    "RewardParams",
+    "calculate_reward",
+    "calculate_reward_batch",
+    "reward_params",
+]
+
+
+def __getattr__(name):
+    # RLAgent is resolved on first access so that physics, env and reward
+    # imports never touch the agent stack.
+    if name == "RLAgent":
+        from .agent import RLAgent
+
+        return RLAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
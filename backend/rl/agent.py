@@ -1,35 +1,45 @@
 import os
 import numpy as np
-from typing import Dict, Optional, List
+from typing import TYPE_CHECKING, Dict, Optional, List
 from datetime import datetime
 
 from backend.logger import Logger
+from backend.rl.numpy_policy import NumpyPolicy
 
-from stable_baselines3 import PPO
-from stable_baselines3.common.vec_env import DummyVecEnv, VecNormalize
-from backend.envs.lander import (
-    RocketLandingEnv,
-)
+if TYPE_CHECKING:
+    from stable_baselines3 import PPO
+    from stable_baselines3.common.vec_env import VecNormalize
 
-timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+_logger = None
 
-logger = Logger(
-    file_name=f"{timestamp}_agent.log",
-    log_dir="logs/agents",
-    stream_handler=False,
-).get_logger()
+
+def get_agent_logger():
+    """Creates the agent log file on first use rather than at import time."""
+    global _logger
+    if _logger is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        _logger = Logger(
+            file_name=f"{timestamp}_agent.log",
+            log_dir="logs/agents",
+            stream_handler=False,
+        ).get_logger()
+    return _logger
 
 
 class RLAgent:
     """
     Loads a trained Stable Baselines3 agent and its normalization statistics
     to predict actions based on raw simulation state dictionaries.
+
+    If `policy_path` points to an exported `.npz` policy, inference runs on
+    NumpyPolicy instead and torch is never imported.
     """
 
     def __init__(
         self,
         model_path: str = "assets/best_model.zip",
         vec_normalize_path: str = "assets/vecnormalize.pkl",
+        policy_path: Optional[str] = None,
     ):
         """
         Initializes the agent by loading the model and normalization stats.
@@ -37,27 +47,62 @@ class RLAgent:
         Args:
             model_path: Path to the saved SB3 model (.zip file).
             vec_normalize_path: Path to the saved VecNormalize statistics (.pkl file).
+            policy_path: Optional exported NumPy policy (.npz file, see
+                scripts/export_policy.py). Takes precedence over the SB3 model.
         """
+        self.logger = get_agent_logger()
         self.model_path = model_path
         self.vec_normalize_path = vec_normalize_path
-        self.model: Optional[PPO] = None
-        self.norm_env_wrapper: Optional[VecNormalize] = None
+        self.policy_path = policy_path
+        self.model: Optional["PPO"] = None
+        self.norm_env_wrapper: Optional["VecNormalize"] = None
+        self.numpy_policy: Optional[NumpyPolicy] = None
         self.observation_shape = None
 
-        self._load_agent()
+        if policy_path:
+            self._load_numpy_policy()
+        else:
+            self._load_agent()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.numpy_policy is not None or (
+            self.model is not None and self.norm_env_wrapper is not None
+        )
+
+    def _load_numpy_policy(self):
+        """Loads an exported actor for torch-free inference."""
+        self.logger.info(f"Loading NumPy policy: {self.policy_path}")
+        if not os.path.exists(self.policy_path):
+            self.logger.error(f"Policy file not found at: {self.policy_path}")
+            raise FileNotFoundError(f"Policy file not found: {self.policy_path}")
+        try:
+            self.numpy_policy = NumpyPolicy(self.policy_path)
+            self.observation_shape = (self.numpy_policy.obs_dim,)
+            self.logger.info(
+                f"NumPy policy loaded. Observation shape: {self.observation_shape}"
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to load NumPy policy: {e}", exc_info=True)
+            self.numpy_policy = None
+            raise
 
     def _load_agent(self):
         """Loads the SB3 model and VecNormalize statistics."""
-        logger.info(f"Attempting to load RL agent:")
-        logger.info(f"  Model path: {self.model_path}")
-        logger.info(f"  VecNormalize path: {self.vec_normalize_path}")
+        # Deferred: stable_baselines3 imports torch
+        from stable_baselines3 import PPO
+        from stable_baselines3.common.vec_env import DummyVecEnv, VecNormalize
+        from backend.envs.lander import RocketLandingEnv
+        self.logger.info(f"Attempting to load RL agent:")
+        self.logger.info(f"  Model path: {self.model_path}")
+        self.logger.info(f"  VecNormalize path: {self.vec_normalize_path}")
 
         if not os.path.exists(self.model_path):
-            logger.error(f"Model file not found at: {self.model_path}")
+            self.logger.error(f"Model file not found at: {self.model_path}")
             raise FileNotFoundError(f"Model file not found: {self.model_path}")
 
         if not os.path.exists(self.vec_normalize_path):
-            logger.error(
+            self.logger.error(
                 f"VecNormalize statistics file not found at: {self.vec_normalize_path}"
             )
             raise FileNotFoundError(
@@ -85,11 +130,11 @@ class RLAgent:
             # Store the expected observation shape
             self.observation_shape = self.norm_env_wrapper.observation_space.shape
 
-            logger.info("RL Agent loaded successfully.")
-            logger.info(f"  Model observation space shape: {self.observation_shape}")
+            self.logger.info("RL Agent loaded successfully.")
+            self.logger.info(f"  Model observation space shape: {self.observation_shape}")
 
         except Exception as e:
-            logger.error(f"Failed to load RL agent: {e}", exc_info=True)
+            self.logger.error(f"Failed to load RL agent: {e}", exc_info=True)
             # Set to None to indicate failure
             self.model = None
             self.norm_env_wrapper = None
@@ -122,7 +167,7 @@ class RLAgent:
 
             # Check if the shape matches what the loaded model expects
             if self.observation_shape and obs.shape != self.observation_shape:
-                logger.warning(
+                self.logger.warning(
                     f"Observation shape mismatch. Expected {self.observation_shape}, got {obs.shape}."
                 )
                 if (
@@ -137,12 +182,12 @@ class RLAgent:
             return obs
 
         except KeyError as e:
-            logger.error(
+            self.logger.error(
                 f"Raw state dictionary missing expected key: {e}. State: {raw_state}"
             )
             return None
         except Exception as e:
-            logger.error(
+            self.logger.error(
                 f"Error converting state dict to observation array: {e}", exc_info=True
             )
             return None
@@ -159,14 +204,22 @@ class RLAgent:
             A dictionary containing the predicted action {'throttle': float, 'coldGas': float},
             or None if prediction fails or the agent wasn't loaded correctly.
         """
-        if self.model is None or self.norm_env_wrapper is None:
-            logger.warning("Agent not loaded or failed to load. Cannot predict.")
+        if not self.is_loaded:
+            self.logger.warning("Agent not loaded or failed to load. Cannot predict.")
             return None
 
+        if self.numpy_policy is not None:
+            obs_array = self._state_dict_to_obs_array(raw_state)
+            if obs_array is None:
+                self.logger.error("Failed to convert raw state to observation array.")
+                return None
+            action = self.numpy_policy.predict(obs_array)[0]
+            return {"throttle": float(action[0]), "coldGas": float(action[1])}
+
         # 1. Convert raw state dict to NumPy array
         obs_array = self._state_dict_to_obs_array(raw_state)
         if obs_array is None:
-            logger.error("Failed to convert raw state to observation array.")
+            self.logger.error("Failed to convert raw state to observation array.")
             return None  # Indicate prediction failure
 
         # 2. Normalize the observation
@@ -197,7 +250,7 @@ class RLAgent:
             return action_dict
 
         except Exception as e:
-            logger.error(f"Error during model prediction: {e}", exc_info=True)
+            self.logger.error(f"Error during model prediction: {e}", exc_info=True)
             return None
 
     def predict_batch(self, raw_states: List[Dict]) -> List[Dict[str, float]]:
@@ -205,7 +258,7 @@ class RLAgent:
         if not raw_states:
             return []
 
-        if self.model is None or self.norm_env_wrapper is None:
+        if not self.is_loaded:
             return [{"throttle": 0.0, "coldGas": 0.0} for _ in raw_states]
 
         # 1. Convert list of dicts to a single NumPy array (Batch Size, Obs Dim)
@@ -218,13 +271,7 @@ class RLAgent:
                 # Fallback for bad state
                 obs_list.append(np.zeros(self.observation_shape, dtype=np.float32))
 
-        obs_array = np.stack(obs_list)
-
-        # 2. Normalize observations
-        normalized_obs = self.norm_env_wrapper.normalize_obs(obs_array)
-
-        # 3. Predict (returns a batch of actions)
-        actions, _ = self.model.predict(normalized_obs, deterministic=True)
+        actions = self.predict_array(np.stack(obs_list))
 
         # 4. Convert back to list of dicts
         results = []
@@ -233,3 +280,18 @@ class RLAgent:
                 {"throttle": float(actions[i][0]), "coldGas": float(actions[i][1])}
             )
         return results
+
+    def predict_array(self, observations: np.ndarray) -> np.ndarray:
+        """
+        Predicts actions for an (N, obs_dim) array of raw observations and
+        returns an (N, 2) array of [throttle, coldGas].
+        """
+        if self.numpy_policy is not None:
+            return self.numpy_policy.predict(observations)
+
+        # 2. Normalize observations
+        normalized_obs = self.norm_env_wrapper.normalize_obs(observations)
+
+        # 3. Predict (returns a batch of actions)
+        actions, _ = self.model.predict(normalized_obs, deterministic=True)
+        return actions
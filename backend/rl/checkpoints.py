@@ -0,0 +1,201 @@
+import os
+import re
+import glob
+import json
+import time
+import numpy as np
+from typing import Callable, Dict, Optional
+
+from stable_baselines3.common.callbacks import BaseCallback
+
+LATEST_CHECKPOINT_FILE = "latest.json"
+_STEPS_PATTERN = re.compile(r"_(\d+)_steps\.zip$")
+
+
+def _atomic_write(path: str, write: Callable[[str], None]):
+    """Writes through `write(tmp_path)` and renames into place."""
+    tmp_path = f"{path}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+class AtomicCheckpointCallback(BaseCallback):
+    """
+    Saves the model and its VecNormalize statistics every `save_freq` calls
+    or every `save_interval` seconds of wall time, whichever comes first.
+
+    Files use CheckpointCallback's naming (`<prefix>_<steps>_steps.zip`,
+    `<prefix>_vecnormalize_<steps>_steps.pkl`). Each file is written under a
+    temporary name and renamed, and `latest.json` is only updated once both
+    are in place, so a crash mid-save never leaves a checkpoint that
+    `find_latest_checkpoint` would pick up half-written. Only the newest
+    `keep_last` checkpoints are kept (0 keeps all).
+    """
+
+    def __init__(
+        self,
+        save_freq: int,
+        save_path: str,
+        name_prefix: str = "rl_model",
+        save_interval: Optional[float] = None,
+        keep_last: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+        verbose: int = 0,
+    ):
+        super().__init__(verbose)
+        self.save_freq = save_freq
+        self.save_path = save_path
+        self.name_prefix = name_prefix
+        self.save_interval = save_interval
+        self.keep_last = keep_last
+        self.clock = clock
+        self._last_save = 0.0
+        self._last_saved_timesteps: Optional[int] = None
+
+    def _init_callback(self) -> None:
+        os.makedirs(self.save_path, exist_ok=True)
+        self._last_save = self.clock()
+
+    def _checkpoint_path(self, kind: str, extension: str) -> str:
+        infix = f"{kind}_" if kind else ""
+        return os.path.join(
+            self.save_path,
+            f"{self.name_prefix}_{infix}{self.num_timesteps}_steps.{extension}",
+        )
+
+    def save_checkpoint(self) -> Optional[Dict]:
+        """Writes a checkpoint for the current timestep; returns its latest.json entry."""
+        self.num_timesteps = self.model.num_timesteps
+        if self._last_saved_timesteps == self.num_timesteps:
+            return None
+        model_path = self._checkpoint_path("", "zip")
+
+        def write_model(tmp):
+            # A file object, so SB3 does not append ".zip" to the temp name
+            with open(tmp, "wb") as f:
+                self.model.save(f)
+
+        _atomic_write(model_path, write_model)
+
+        vec_normalize = self.model.get_vec_normalize_env()
+        vec_normalize_path = None
+        if vec_normalize is not None:
+            vec_normalize_path = self._checkpoint_path("vecnormalize", "pkl")
+            _atomic_write(vec_normalize_path, vec_normalize.save)
+
+        entry = {
+            "timesteps": self.num_timesteps,
+            "model": os.path.basename(model_path),
+            "vecnormalize": vec_normalize_path and os.path.basename(vec_normalize_path),
+            "saved_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+
+        def write_entry(tmp):
+            with open(tmp, "w") as f:
+                json.dump(entry, f, indent=2)
+
+        _atomic_write(os.path.join(self.save_path, LATEST_CHECKPOINT_FILE), write_entry)
+        self._last_save = self.clock()
+        self._last_saved_timesteps = self.num_timesteps
+        if self.verbose >= 1:
+            print(f"Saving checkpoint to {model_path}")
+        self._prune()
+        return entry
+
+    def _prune(self):
+        if self.keep_last <= 0:
+            return
+        checkpoints = sorted(_list_checkpoints(self.save_path, self.name_prefix).items())
+        for _, (model_path, vec_normalize_path) in checkpoints[: -self.keep_last]:
+            for path in (model_path, vec_normalize_path):
+                if path and os.path.exists(path):
+                    os.remove(path)
+
+    def _on_step(self) -> bool:
+        due_by_steps = self.save_freq > 0 and self.n_calls % self.save_freq == 0
+        due_by_time = (
+            self.save_interval is not None
+            and self.clock() - self._last_save >= self.save_interval
+        )
+        if due_by_steps or due_by_time:
+            self.save_checkpoint()
+        return True
+
+
+def _list_checkpoints(save_path: str, name_prefix: str) -> Dict[int, tuple]:
+    """{timesteps: (model path, vecnormalize path or None)} for complete checkpoint files."""
+    checkpoints = {}
+    for model_path in glob.glob(os.path.join(save_path, f"{name_prefix}_*_steps.zip")):
+        match = _STEPS_PATTERN.search(model_path)
+        if not match:
+            continue
+        steps = int(match.group(1))
+        vec_normalize_path = os.path.join(
+            save_path, f"{name_prefix}_vecnormalize_{steps}_steps.pkl"
+        )
+        checkpoints[steps] = (
+            model_path,
+            vec_normalize_path if os.path.exists(vec_normalize_path) else None,
+        )
+    return checkpoints
+
+
+def find_latest_checkpoint(save_path: str, name_prefix: str) -> Optional[Dict]:
+    """
+    The newest checkpoint in `save_path` as {"timesteps", "model",
+    "vecnormalize"} with full paths, or None. `latest.json` is trusted when
+    its files exist; otherwise (e.g. checkpoints written by SB3's
+    CheckpointCallback) the highest-step model that has a matching
+    vecnormalize file wins.
+    """
+    latest_path = os.path.join(save_path, LATEST_CHECKPOINT_FILE)
+    try:
+        with open(latest_path) as f:
+            entry = json.load(f)
+        model_path = os.path.join(save_path, entry["model"])
+        vec_normalize_path = entry["vecnormalize"] and os.path.join(
+            save_path, entry["vecnormalize"]
+        )
+        if os.path.exists(model_path) and (
+            vec_normalize_path is None or os.path.exists(vec_normalize_path)
+        ):
+            return {
+                "timesteps": entry["timesteps"],
+                "model": model_path,
+                "vecnormalize": vec_normalize_path,
+            }
+    except (OSError, ValueError, KeyError):
+        pass
+
+    complete = {
+        steps: paths
+        for steps, paths in _list_checkpoints(save_path, name_prefix).items()
+        if paths[1] is not None
+    }
+    if not complete:
+        return None
+    steps = max(complete)
+    return {"timesteps": steps, "model": complete[steps][0], "vecnormalize": complete[steps][1]}
+
+
+def restore_eval_history(eval_callback: BaseCallback, log_path: str) -> int:
+    """
+    Reloads evaluations.npz written by an EvalCallback-style callback before
+    a restart: its history is kept instead of being overwritten, and
+    best_mean_reward is restored so only genuinely better models replace
+    best_model.zip. Returns the number of evaluations restored.
+    """
+    path = os.path.join(log_path, "evaluations.npz")
+    if not os.path.exists(path):
+        return 0
+    with np.load(path) as data:
+        timesteps = data["timesteps"].tolist()
+        results = data["results"].tolist()
+        lengths = data["ep_lengths"].tolist()
+    eval_callback.evaluations_timesteps = timesteps
+    eval_callback.evaluations_results = results
+    eval_callback.evaluations_length = lengths
+    if results:
+        eval_callback.best_mean_reward = float(max(np.mean(r) for r in results))
+        eval_callback.last_mean_reward = float(np.mean(results[-1]))
+    return len(timesteps)
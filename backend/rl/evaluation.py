@@ -0,0 +1,210 @@
+import os
+import multiprocessing
+import numpy as np
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List, Optional, Tuple, Type
+
+from stable_baselines3.common.base_class import BaseAlgorithm
+from stable_baselines3.common.callbacks import BaseCallback, EventCallback
+from stable_baselines3.common.evaluation import evaluate_policy
+from stable_baselines3.common.running_mean_std import RunningMeanStd
+from stable_baselines3.common.vec_env import VecMonitor, VecNormalize
+
+from backend.envs.autotune import make_training_vec_env
+
+CANDIDATE_MODEL_NAME = "candidate_model"
+
+
+def make_eval_vec_env(
+    kind: str, n_envs: int, clip_obs: float = 10.0, seed: Optional[int] = None
+) -> VecNormalize:
+    """
+    Evaluation env, separate from the training env: `n_envs` envs of `kind`
+    that run evaluation episodes concurrently, behind a VecNormalize with
+    frozen statistics (training=False, no reward normalization). EvalCallback
+    copies the training env's observation statistics into it before every
+    evaluation.
+    """
+    vec_env = make_training_vec_env(kind, n_envs, seed=seed)
+    if kind == "native":
+        # subproc/dummy envs are Monitor-wrapped by make_vec_env already
+        vec_env = VecMonitor(vec_env)
+    return VecNormalize(
+        vec_env, training=False, norm_obs=True, norm_reward=False, clip_obs=clip_obs
+    )
+
+
+# State of an evaluation worker process, built once by _init_eval_worker
+_worker_env: Optional[VecNormalize] = None
+
+
+def _init_eval_worker(kind: str, n_envs: int, clip_obs: float, seed: Optional[int]):
+    global _worker_env
+    _worker_env = make_eval_vec_env(kind, n_envs, clip_obs=clip_obs, seed=seed)
+
+
+def _evaluate_candidate(
+    model_cls: Type[BaseAlgorithm],
+    model_path: str,
+    obs_rms: Optional[RunningMeanStd],
+    n_eval_episodes: int,
+    deterministic: bool,
+) -> Tuple[List[float], List[int]]:
+    if obs_rms is not None:
+        _worker_env.obs_rms = obs_rms
+    model = model_cls.load(model_path, device="cpu")
+    return evaluate_policy(
+        model,
+        _worker_env,
+        n_eval_episodes=n_eval_episodes,
+        deterministic=deterministic,
+        return_episode_rewards=True,
+    )
+
+
+class AsyncEvalCallback(EventCallback):
+    """
+    EvalCallback that evaluates in a separate worker process, overlapping
+    with the following rollouts.
+
+    Every `eval_freq` calls the current model is saved as a candidate and
+    handed to the worker, together with a copy of the training observation
+    statistics. The worker owns its evaluation env (see make_eval_vec_env).
+    Results are logged when they arrive, at the timestep the candidate was
+    taken. A better candidate is promoted to best_model.zip. If the previous
+    evaluation is still running when the next one is due, training waits
+    for it, so no evaluation is skipped.
+
+    Logs, evaluations.npz and best-model handling match SB3's EvalCallback.
+    """
+
+    def __init__(
+        self,
+        vec_env_kind: str,
+        n_envs: int,
+        n_eval_episodes: int = 5,
+        eval_freq: int = 10000,
+        best_model_save_path: Optional[str] = None,
+        log_path: Optional[str] = None,
+        deterministic: bool = True,
+        clip_obs: float = 10.0,
+        callback_on_new_best: Optional[BaseCallback] = None,
+        seed: Optional[int] = None,
+        verbose: int = 1,
+    ):
+        super().__init__(callback_on_new_best, verbose=verbose)
+        self.vec_env_kind = vec_env_kind
+        self.n_envs = n_envs
+        self.n_eval_episodes = n_eval_episodes
+        self.eval_freq = eval_freq
+        self.best_model_save_path = best_model_save_path
+        self.log_path = os.path.join(log_path, "evaluations") if log_path else None
+        self.deterministic = deterministic
+        self.clip_obs = clip_obs
+        self.seed = seed
+
+        self.best_mean_reward = -np.inf
+        self.last_mean_reward = -np.inf
+        self.evaluations_timesteps: List[int] = []
+        self.evaluations_results: List[List[float]] = []
+        self.evaluations_length: List[List[int]] = []
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: Optional[Future] = None
+        self._pending_timesteps = 0
+        self._candidate_dir = best_model_save_path or log_path or "."
+
+    def _init_callback(self) -> None:
+        if self.best_model_save_path is not None:
+            os.makedirs(self.best_model_save_path, exist_ok=True)
+        if self.log_path is not None:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        os.makedirs(self._candidate_dir, exist_ok=True)
+        # spawn: the worker must not inherit the trainer's torch threads
+        self._executor = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_eval_worker,
+            initargs=(self.vec_env_kind, self.n_envs, self.clip_obs, self.seed),
+        )
+
+    @property
+    def candidate_path(self) -> str:
+        return os.path.join(self._candidate_dir, f"{CANDIDATE_MODEL_NAME}.zip")
+
+    def _submit(self):
+        self.model.save(self.candidate_path)
+        vec_normalize = self.model.get_vec_normalize_env()
+        obs_rms = vec_normalize.obs_rms.copy() if vec_normalize is not None else None
+        self._pending_timesteps = self.num_timesteps
+        self._pending = self._executor.submit(
+            _evaluate_candidate,
+            type(self.model),
+            self.candidate_path,
+            obs_rms,
+            self.n_eval_episodes,
+            self.deterministic,
+        )
+
+    def _collect(self) -> bool:
+        """Waits for the pending evaluation and records it; returns continue_training."""
+        future, self._pending = self._pending, None
+        episode_rewards, episode_lengths = future.result()
+        timesteps = self._pending_timesteps
+        continue_training = True
+
+        if self.log_path is not None:
+            self.evaluations_timesteps.append(timesteps)
+            self.evaluations_results.append(episode_rewards)
+            self.evaluations_length.append(episode_lengths)
+            np.savez(
+                self.log_path,
+                timesteps=self.evaluations_timesteps,
+                results=self.evaluations_results,
+                ep_lengths=self.evaluations_length,
+            )
+
+        mean_reward, std_reward = np.mean(episode_rewards), np.std(episode_rewards)
+        mean_ep_length, std_ep_length = np.mean(episode_lengths), np.std(episode_lengths)
+        self.last_mean_reward = float(mean_reward)
+
+        if self.verbose >= 1:
+            print(f"Eval num_timesteps={timesteps}, episode_reward={mean_reward:.2f} +/- {std_reward:.2f}")
+            print(f"Episode length: {mean_ep_length:.2f} +/- {std_ep_length:.2f}")
+        self.logger.record("eval/mean_reward", float(mean_reward))
+        self.logger.record("eval/mean_ep_length", mean_ep_length)
+        self.logger.record("time/total_timesteps", timesteps, exclude="tensorboard")
+        self.logger.dump(timesteps)
+
+        if mean_reward > self.best_mean_reward:
+            if self.verbose >= 1:
+                print("New best mean reward!")
+            if self.best_model_save_path is not None:
+                os.replace(
+                    self.candidate_path,
+                    os.path.join(self.best_model_save_path, "best_model.zip"),
+                )
+            self.best_mean_reward = float(mean_reward)
+            if self.callback is not None:
+                continue_training = self._on_event()
+        return continue_training
+
+    def _on_step(self) -> bool:
+        continue_training = True
+        if self._pending is not None and self._pending.done():
+            continue_training = self._collect()
+
+        if self.eval_freq > 0 and self.n_calls % self.eval_freq == 0:
+            if self._pending is not None:
+                continue_training = self._collect() and continue_training
+            self._submit()
+        return continue_training
+
+    def _on_training_end(self) -> None:
+        if self._pending is not None:
+            self._collect()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if os.path.exists(self.candidate_path):
+            os.remove(self.candidate_path)
@@ -0,0 +1,78 @@
+import os
+import pickle
+import numpy as np
+
+from backend.rl.numpy_policy import POLICY_FORMAT_VERSION
+
+POLICY_FILE_NAME = "policy.npz"
+
+
+def export_policy(model_path: str, vec_normalize_path: str, output_path: str) -> str:
+    """
+    Writes the deterministic actor of a saved SB3 PPO model plus its
+    VecNormalize observation statistics to a compact `.npz` for NumpyPolicy.
+
+    Needs stable_baselines3/torch; the exported file does not.
+    """
+    # Deferred: stable_baselines3 imports torch
+    import torch
+    from stable_baselines3 import PPO
+
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Model file not found: {model_path}")
+    if not os.path.exists(vec_normalize_path):
+        raise FileNotFoundError(
+            f"VecNormalize statistics file not found: {vec_normalize_path}"
+        )
+
+    # Only the policy weights are needed; skip unpicklable training schedules
+    model = PPO.load(
+        model_path,
+        device="cpu",
+        custom_objects={"lr_schedule": 0.0, "clip_range": 0.0},
+    )
+    policy = model.policy
+
+    linear_layers = [
+        m for m in policy.mlp_extractor.policy_net if isinstance(m, torch.nn.Linear)
+    ]
+    activations = {
+        type(m).__name__
+        for m in policy.mlp_extractor.policy_net
+        if not isinstance(m, torch.nn.Linear)
+    }
+    if activations == {"Tanh"} or not activations:
+        activation = "tanh"
+    elif activations == {"ReLU"}:
+        activation = "relu"
+    else:
+        raise ValueError(f"Unsupported actor activations: {sorted(activations)}")
+
+    # VecNormalize drops its wrapped env when pickled, so no dummy env is needed
+    with open(vec_normalize_path, "rb") as f:
+        vec_normalize = pickle.load(f)
+
+    arrays = {
+        "format_version": np.array(POLICY_FORMAT_VERSION),
+        "num_layers": np.array(len(linear_layers)),
+        "activation": np.array(activation),
+        "action_w": policy.action_net.weight.detach().numpy().T.astype(np.float32),
+        "action_b": policy.action_net.bias.detach().numpy().astype(np.float32),
+        "squash_output": np.array(bool(policy.squash_output)),
+        "action_low": model.action_space.low.astype(np.float32),
+        "action_high": model.action_space.high.astype(np.float32),
+        "norm_obs": np.array(bool(vec_normalize.norm_obs)),
+        "obs_mean": vec_normalize.obs_rms.mean.astype(np.float64),
+        "obs_var": vec_normalize.obs_rms.var.astype(np.float64),
+        "clip_obs": np.array(float(vec_normalize.clip_obs)),
+        "epsilon": np.array(float(vec_normalize.epsilon)),
+    }
+    for i, layer in enumerate(linear_layers):
+        arrays[f"pi_w{i}"] = layer.weight.detach().numpy().T.astype(np.float32)
+        arrays[f"pi_b{i}"] = layer.bias.detach().numpy().astype(np.float32)
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    tmp_path = f"{output_path}.tmp.npz"
+    np.savez_compressed(tmp_path, **arrays)
+    os.replace(tmp_path, output_path)
+    return output_path
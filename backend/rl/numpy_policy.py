@@ -0,0 +1,135 @@
+import threading
+import numpy as np
+from typing import List
+
+# Keys written by backend.rl.export.export_policy
+POLICY_FORMAT_VERSION = 1
+
+_ACTIVATIONS = {
+    "tanh": lambda x: np.tanh(x, out=x),
+    "relu": lambda x: np.maximum(x, 0.0, out=x),
+}
+
+
+class NumpyPolicy:
+    """
+    Torch-free deterministic inference for an exported PPO actor.
+
+    Runs VecNormalize observation normalization, the actor MLP, optional tanh
+    squashing and clipping to the action bounds as one fused pass over
+    preallocated float32 buffers. Buffers grow to the largest batch seen and
+    are reused afterwards, so steady-state calls do not allocate except for
+    the returned action array.
+
+    Scratch buffers are kept per thread, so one instance can be shared by
+    several threads and ``predict`` may run concurrently; the loaded weights
+    are read-only after construction.
+    """
+
+    def __init__(self, policy_path: str):
+        with np.load(policy_path, allow_pickle=False) as data:
+            version = int(data["format_version"])
+            if version != POLICY_FORMAT_VERSION:
+                raise ValueError(
+                    f"Unsupported policy format version {version} in {policy_path}"
+                )
+
+            num_layers = int(data["num_layers"])
+            self.weights: List[np.ndarray] = [
+                np.ascontiguousarray(data[f"pi_w{i}"], dtype=np.float32)
+                for i in range(num_layers)
+            ]
+            self.biases: List[np.ndarray] = [
+                np.ascontiguousarray(data[f"pi_b{i}"], dtype=np.float32)
+                for i in range(num_layers)
+            ]
+            self.action_weight = np.ascontiguousarray(data["action_w"], dtype=np.float32)
+            self.action_bias = np.ascontiguousarray(data["action_b"], dtype=np.float32)
+
+            activation = str(data["activation"])
+            if activation not in _ACTIVATIONS:
+                raise ValueError(f"Unsupported activation '{activation}'")
+            self.activation = _ACTIVATIONS[activation]
+
+            self.norm_obs = bool(data["norm_obs"])
+            obs_mean = data["obs_mean"].astype(np.float64)
+            obs_var = data["obs_var"].astype(np.float64)
+            epsilon = float(data["epsilon"])
+            self.clip_obs = np.float32(data["clip_obs"])
+
+            self.squash_output = bool(data["squash_output"])
+            self.action_low = data["action_low"].astype(np.float32)
+            self.action_high = data["action_high"].astype(np.float32)
+
+        self.obs_dim = self.weights[0].shape[0] if num_layers else self.action_weight.shape[0]
+        self.action_dim = self.action_weight.shape[1]
+
+        # (obs - mean) / sqrt(var + eps) folded into a multiply-add
+        self.obs_mean = obs_mean.astype(np.float32)
+        self.obs_inv_std = (1.0 / np.sqrt(obs_var + epsilon)).astype(np.float32)
+
+        self._scratch = threading.local()
+
+    def _buffers(self, batch_size: int):
+        """The calling thread's (obs, hidden, action) buffers, grown to fit batch_size."""
+        scratch = self._scratch
+        capacity = getattr(scratch, "capacity", 0)
+        if batch_size > capacity:
+            capacity = max(batch_size, 2 * capacity)
+            scratch.obs = np.empty((capacity, self.obs_dim), dtype=np.float32)
+            scratch.hidden = [
+                np.empty((capacity, w.shape[1]), dtype=np.float32) for w in self.weights
+            ]
+            scratch.action = np.empty((capacity, self.action_dim), dtype=np.float32)
+            scratch.capacity = capacity
+        return scratch.obs, scratch.hidden, scratch.action
+
+    def predict(self, observations: np.ndarray) -> np.ndarray:
+        """
+        Deterministic actions for a batch of raw (unnormalized) observations.
+
+        Args:
+            observations: (N, obs_dim) or (obs_dim,) array.
+
+        Returns:
+            (N, action_dim) float32 array (a copy, safe to keep).
+        """
+        obs = np.asarray(observations, dtype=np.float32)
+        if obs.ndim == 1:
+            obs = obs.reshape(1, -1)
+        if obs.shape[1] != self.obs_dim:
+            raise ValueError(
+                f"Observation shape mismatch. Expected (N, {self.obs_dim}), got {obs.shape}."
+            )
+
+        n = obs.shape[0]
+        obs_buffer, hidden_buffers, action_buffer = self._buffers(n)
+
+        x = obs_buffer[:n]
+        if self.norm_obs:
+            np.subtract(obs, self.obs_mean, out=x)
+            np.multiply(x, self.obs_inv_std, out=x)
+            np.clip(x, -self.clip_obs, self.clip_obs, out=x)
+        else:
+            np.copyto(x, obs)
+
+        for weight, bias, buffer in zip(self.weights, self.biases, hidden_buffers):
+            h = buffer[:n]
+            np.matmul(x, weight, out=h)
+            h += bias
+            self.activation(h)
+            x = h
+
+        actions = action_buffer[:n]
+        np.matmul(x, self.action_weight, out=actions)
+        actions += self.action_bias
+
+        if self.squash_output:
+            # Policy outputs live in [-1, 1]; rescale to the action bounds
+            np.tanh(actions, out=actions)
+            actions += 1.0
+            actions *= 0.5 * (self.action_high - self.action_low)
+            actions += self.action_low
+
+        np.clip(actions, self.action_low, self.action_high, out=actions)
+        return actions.copy()
@@ -0,0 +1,256 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.config import BASE_DIR, Config
+from backend.rl.agent import RLAgent, get_agent_logger
+from backend.rl.export import POLICY_FILE_NAME
+
+MODEL_FILE_NAME = "best_model.zip"
+STATS_FILE_NAME = "vecnormalize.pkl"
+
+
+@dataclass(frozen=True)
+class ModelFiles:
+    version: str
+    model_path: str
+    stats_path: str
+    policy_path: Optional[str]
+
+
+@dataclass
+class _Entry:
+    key: Tuple
+    version: str
+    future: Future
+    refcount: int = 0
+
+
+def resolve_model_files(version: str, inference: Optional[str] = None) -> ModelFiles:
+    """
+    Locates the files of a model version under `paths.models_dir`.
+
+    `policy_path` is set only when `inference` is "numpy" and an exported
+    policy exists; otherwise the SB3 model is used.
+    """
+    config = Config()
+    models_dir = os.path.join(BASE_DIR, config.get("paths.models_dir"))
+    version_dir = os.path.join(models_dir, version)
+    model_path = os.path.join(version_dir, MODEL_FILE_NAME)
+    stats_path = os.path.join(version_dir, STATS_FILE_NAME)
+    if not (os.path.isfile(model_path) and os.path.isfile(stats_path)):
+        raise FileNotFoundError(f"Model version '{version}' not found in {models_dir}")
+
+    policy_path = os.path.join(version_dir, POLICY_FILE_NAME)
+    if inference == "numpy" and os.path.isfile(policy_path):
+        return ModelFiles(version, model_path, stats_path, policy_path)
+    if inference == "numpy":
+        get_agent_logger().warning(
+            f"No exported policy at {policy_path}; falling back to SB3. "
+            "Run `make export` to enable torch-free inference."
+        )
+    return ModelFiles(version, model_path, stats_path, None)
+
+
+def available_versions() -> List[str]:
+    config = Config()
+    models_dir = os.path.join(BASE_DIR, config.get("paths.models_dir"))
+    if not os.path.isdir(models_dir):
+        return []
+    return sorted(
+        name
+        for name in os.listdir(models_dir)
+        if os.path.isfile(os.path.join(models_dir, name, MODEL_FILE_NAME))
+        and os.path.isfile(os.path.join(models_dir, name, STATS_FILE_NAME))
+    )
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded RLAgents shared between connections.
+
+    Agents are keyed by version and the content hash of the files they were
+    loaded from, so re-exported or retrained weights get a fresh entry while
+    reconnects reuse the loaded one. `acquire` hands out a reference and
+    `release` returns it; when more than `capacity` agents are cached, the
+    least recently used agents with no references are evicted. Concurrent
+    acquires of a version that is still loading wait for the same load.
+
+    A cached agent is shared by every controller using its version, and each
+    controller predicts from its own compute thread, so agents must be safe
+    to call concurrently: NumpyPolicy keeps its scratch buffers per thread,
+    and the SB3 path only reads the loaded model and normalization stats.
+    Nothing else about an agent may be mutated once it is cached.
+    """
+
+    def __init__(self, capacity: int = 3, inference: Optional[str] = None):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        self.capacity = capacity
+        self.inference = inference
+        self.logger = get_agent_logger()
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, _Entry]" = OrderedDict()
+        self._agent_keys: Dict[int, Tuple] = {}
+        # (path, mtime, size) -> sha256, so unchanged files are hashed once
+        self._hashes: Dict[Tuple[str, float, int], str] = {}
+
+    def _file_hash(self, path: str) -> str:
+        stat = os.stat(path)
+        stamp = (path, stat.st_mtime, stat.st_size)
+        digest = self._hashes.get(stamp)
+        if digest is None:
+            sha = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    sha.update(chunk)
+            digest = sha.hexdigest()
+            self._hashes[stamp] = digest
+        return digest
+
+    def _key(self, files: ModelFiles) -> Tuple:
+        if files.policy_path:
+            return (files.version, "numpy", self._file_hash(files.policy_path))
+        return (
+            files.version,
+            "sb3",
+            self._file_hash(files.model_path),
+            self._file_hash(files.stats_path),
+        )
+
+    def _load(self, files: ModelFiles) -> RLAgent:
+        agent = RLAgent(
+            model_path=files.model_path,
+            vec_normalize_path=files.stats_path,
+            policy_path=files.policy_path,
+        )
+        self.logger.info(f"Model registry loaded version {files.version}.")
+        return agent
+
+    def acquire(self, version: str) -> RLAgent:
+        """
+        Returns the shared agent for `version`, loading it on first use.
+        Every successful call must be paired with `release(agent)`.
+        """
+        files = resolve_model_files(version, self.inference)
+        key = self._key(files)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            owner = entry is None
+            if owner:
+                entry = _Entry(key=key, version=version, future=Future())
+                self._entries[key] = entry
+            entry.refcount += 1
+            self._entries.move_to_end(key)
+
+        if owner:
+            try:
+                agent = self._load(files)
+            except Exception as e:
+                with self._lock:
+                    self._entries.pop(key, None)
+                entry.future.set_exception(e)
+                raise
+            with self._lock:
+                self._agent_keys[id(agent)] = key
+            entry.future.set_result(agent)
+            self._evict()
+
+        try:
+            return entry.future.result()
+        except Exception:
+            with self._lock:
+                entry.refcount -= 1
+            raise
+
+    def release(self, agent: Optional[RLAgent]):
+        """Drops one reference taken by `acquire`. Idle agents stay cached."""
+        if agent is None:
+            return
+        with self._lock:
+            key = self._agent_keys.get(id(agent))
+            entry = self._entries.get(key) if key else None
+            if entry is None:
+                return
+            entry.refcount = max(0, entry.refcount - 1)
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            excess = len(self._entries) - self.capacity
+            if excess <= 0:
+                return
+            for key in list(self._entries):
+                if excess <= 0:
+                    break
+                entry = self._entries[key]
+                if entry.refcount > 0 or not entry.future.done():
+                    continue
+                del self._entries[key]
+                if entry.future.exception() is None:
+                    self._agent_keys.pop(id(entry.future.result()), None)
+                excess -= 1
+                self.logger.info(f"Model registry evicted version {entry.version}.")
+
+    def preload(self, versions: Iterable[str]):
+        """Loads `versions` into the cache without holding references."""
+        for version in versions:
+            try:
+                self.release(self.acquire(version))
+            except Exception as e:
+                self.logger.error(f"Failed to preload model {version}: {e}")
+
+    def preload_async(self, versions: Iterable[str]) -> threading.Thread:
+        """Runs `preload` on a daemon thread so startup is not blocked."""
+        thread = threading.Thread(
+            target=self.preload,
+            args=(list(versions),),
+            name="model-preload",
+            daemon=True,
+        )
+        thread.start()
+        return thread
+
+    def is_cached(self, version: str) -> bool:
+        with self._lock:
+            return any(
+                entry.version == version
+                and entry.future.done()
+                and entry.future.exception() is None
+                for entry in self._entries.values()
+            )
+
+    def cached_versions(self) -> List[str]:
+        with self._lock:
+            return [entry.version for entry in self._entries.values()]
+
+    def refcount(self, version: str) -> int:
+        with self._lock:
+            return sum(
+                entry.refcount
+                for entry in self._entries.values()
+                if entry.version == version
+            )
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Returns the process-wide registry, sized from `model.cache_size`."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                config = Config()
+                _registry = ModelRegistry(
+                    capacity=int(config.get("model.cache_size")),
+                    inference=config.get("model.inference"),
+                )
+    return _registry
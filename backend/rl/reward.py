@@ -1,33 +1,70 @@
 import numpy as np
-from typing import Tuple, Dict, Any
+from typing import Any, Dict, Optional, Tuple
 
-from backend.config import Config
-from backend.utils import evaluate_landing
+from backend.config import Config, ConfigSnapshot, add_reload_listener
+from backend.physics.batch import FIELD_INDEX
+from backend.utils import (
+    evaluate_landing,
+    evaluate_landing_batch,
+    get_landing_thresholds,
+)
 
 # Load config immediately. If it fails, let it crash the app at startup.
 _config_loader = Config()
-_reward_config = _config_loader.get("rl.rewards")
-_rl_config = _config_loader.get("rl")
 
-# Get truncation thresholds from rl_config (Strict, no defaults)
-max_horizontal_pos = _rl_config["max_horizontal_position"]
-max_altitude = _rl_config["max_altitude"]
-tip_over_angle = _rl_config["tip_over_angle"]
 
-# Get the reward scales (Strict, no defaults)
-throttle_descent_reward_scale = _reward_config["throttle_descent_reward_scale"]
-free_fall_penalty_scale = _reward_config["free_fall_penalty_scale"]
-cold_gas_reward_scale = _reward_config["cold_gas_reward_scale"]
-angle_aware_throttle_scale = _reward_config["angle_aware_throttle_scale"]
-horizontal_correction_scale = _reward_config["horizontal_correction_scale"]
-correct_direction_bonus = _reward_config["correct_direction_bonus"]
-gamma = _reward_config["gamma"]
+class RewardParams:
+    """
+    Reward constants of one config snapshot.
+
+    Episodes take `reward_params()` when they reset and pass it to
+    calculate_reward(_batch), so a config reload only affects episodes that
+    start after it, never one in progress.
+    """
+
+    def __init__(self, snapshot: ConfigSnapshot):
+        self.landing = snapshot.landing
+        self.rewards = snapshot.rewards
+
+        # Truncation thresholds
+        self.max_horizontal_pos = snapshot.rl.max_horizontal_position
+        self.max_altitude = snapshot.rl.max_altitude
+        self.tip_over_angle = snapshot.rl.tip_over_angle
+
+        self.landing_thresholds = get_landing_thresholds(self.landing)
+        # Indexed by landing code (safe, good, ok, unsafe)
+        self.landing_base_rewards = np.array(
+            [
+                self.rewards.landing_perfect,
+                self.rewards.landing_good,
+                self.rewards.landing_ok,
+                self.rewards.crash_ground,
+            ]
+        )
+
+
+_params = RewardParams(_config_loader.snapshot)
+
+
+def _apply_config(snapshot: ConfigSnapshot):
+    """Reload listener: episodes reset from now on use the new constants."""
+    global _params
+    _params = RewardParams(snapshot)
+
+
+add_reload_listener(_apply_config)
+
+
+def reward_params() -> RewardParams:
+    """Reward constants for an episode starting now."""
+    return _params
 
 
 def calculate_reward(
     state_before: Dict[str, Any],
     action: np.ndarray,
     state_after: Dict[str, Any],
+    params: Optional[RewardParams] = None,
 ) -> Tuple[float, bool, bool]:
     """
     Calculates the reward for a state transition in the rocket landing environment.
@@ -36,6 +73,7 @@ def calculate_reward(
         state_before: Dictionary representing the rocket's state before the action.
         action: The action taken by the agent [throttle, cold_gas].
         state_after: Dictionary representing the rocket's state after the action.
+        params: Reward constants of the episode (default: the current config).
 
     Returns:
         A tuple containing:
@@ -44,6 +82,15 @@ def calculate_reward(
             - truncated (bool): True if the episode ended due to external limits (time, bounds, tipping over).
     """
 
+    params = params or _params
+    _rewards = params.rewards
+    gamma = _rewards.gamma
+    cold_gas_reward_scale = _rewards.cold_gas_reward_scale
+    correct_direction_bonus = _rewards.correct_direction_bonus
+    throttle_descent_reward_scale = _rewards.throttle_descent_reward_scale
+    free_fall_penalty_scale = _rewards.free_fall_penalty_scale
+    angle_aware_throttle_scale = _rewards.angle_aware_throttle_scale
+
     total_reward = 0.0
     terminated_on_ground = False
     truncated = False
@@ -72,7 +119,7 @@ def calculate_reward(
     # --- TERMINATION ON GROUND ---
     if y_after <= 0.1 and y_before > 0.1:
         terminated_on_ground = True
-        landing_eval = evaluate_landing(state_after, _config_loader)
+        landing_eval = evaluate_landing(state_after, params.landing)
 
         angle_bonus = max(0, 1.0 - (abs(angle_after) / 10.0))
         velocity_bonus = max(0, 1.0 - (abs(vy_after) / 5.0))
@@ -81,21 +128,21 @@ def calculate_reward(
         landing_quality = 0.6 * angle_bonus + 0.4 * velocity_bonus
 
         if landing_eval["landing_message"] == "safe":
-            total_reward += _reward_config["landing_perfect"] * (
+            total_reward += _rewards.landing_perfect * (
                 1.0 + 0.5 * landing_quality
             )
         elif landing_eval["landing_message"] == "good":
-            total_reward += _reward_config["landing_good"] * (
+            total_reward += _rewards.landing_good * (
                 0.8 + 0.2 * landing_quality
             )
         elif landing_eval["landing_message"] == "ok":
-            total_reward += _reward_config["landing_ok"]
+            total_reward += _rewards.landing_ok
         else:
             # Progressive crash penalty based on severity (focused on angle and vertical velocity)
             crash_severity = min(
                 1.0, (abs(vy_after) / 20.0 + abs(angle_after) / 45.0) / 2.0
             )
-            total_reward += _reward_config["crash_ground"] * (
+            total_reward += _rewards.crash_ground * (
                 0.7 + 0.3 * crash_severity
             )
 
@@ -271,11 +318,210 @@ def calculate_reward(
 
     # --- Truncation Penalties ---
     # Out of bounds check (position limits)
-    if abs(state_after.get("x", 0.0)) > max_horizontal_pos or y_after > max_altitude:
-        total_reward += _reward_config["out_of_bounds"]
+    if (
+        abs(state_after.get("x", 0.0)) > params.max_horizontal_pos
+        or y_after > params.max_altitude
+    ):
+        total_reward += _rewards.out_of_bounds
         truncated = True
 
-    if abs(angle_after) > tip_over_angle:
-        total_reward += _reward_config["tipped_over"]
+    if abs(angle_after) > params.tip_over_angle:
+        total_reward += _rewards.tipped_over
 
     return float(total_reward), terminated_on_ground, truncated
+
+
+def _potential_batch(y, vx, vy, angle, angular_velocity) -> np.ndarray:
+    """Vectorized `potential` from calculate_reward."""
+    y_potential = np.maximum(0.0, y)
+    near_ground = 2.0 - np.minimum(1.0, y_potential / 2000.0)
+
+    return (
+        -0.005 * y_potential
+        - 0.015 * near_ground * np.abs(vy)
+        - 0.005 * np.abs(vx)
+        - 0.01 * near_ground * np.abs(angle)
+        - 0.05 * near_ground * np.abs(angular_velocity)
+    )
+
+
+def calculate_reward_batch(
+    state_before: np.ndarray,
+    actions: np.ndarray,
+    state_after: np.ndarray,
+    params: Optional[RewardParams] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized calculate_reward for N transitions at once.
+
+    Every branch of the scalar version is evaluated for the whole batch and
+    selected with masks, so results match calculate_reward element-wise.
+
+    Args:
+        state_before: (fields, N) state block laid out as BatchPhysicsEngine.state.
+        actions: (N, 2) array of [throttle, cold_gas].
+        state_after: (fields, N) state block after the step.
+        params: Reward constants of the episodes (default: the current config).
+
+    Returns:
+        A tuple of (N,) arrays: reward (float64), terminated_on_ground (bool)
+        and truncated (bool).
+    """
+    actions = np.asarray(actions, dtype=np.float64)
+    if actions.ndim != 2 or actions.shape[1] != 2:
+        raise ValueError(f"Expected actions of shape (N, 2), got {actions.shape}.")
+    throttle = actions[:, 0]
+    cold_gas = actions[:, 1]
+
+    params = params or _params
+    _rewards = params.rewards
+    gamma = _rewards.gamma
+    cold_gas_reward_scale = _rewards.cold_gas_reward_scale
+    correct_direction_bonus = _rewards.correct_direction_bonus
+    throttle_descent_reward_scale = _rewards.throttle_descent_reward_scale
+    free_fall_penalty_scale = _rewards.free_fall_penalty_scale
+    angle_aware_throttle_scale = _rewards.angle_aware_throttle_scale
+
+    y_before = state_before[FIELD_INDEX["y"]]
+    angle_before = state_before[FIELD_INDEX["angle"]]
+    angular_velocity_before = state_before[FIELD_INDEX["angularVelocity"]]
+
+    x_after = state_after[FIELD_INDEX["x"]]
+    y_after = state_after[FIELD_INDEX["y"]]
+    vx_after = state_after[FIELD_INDEX["vx"]]
+    vy_after = state_after[FIELD_INDEX["vy"]]
+    angle_after = state_after[FIELD_INDEX["angle"]]
+    angular_velocity_after = state_after[FIELD_INDEX["angularVelocity"]]
+
+    abs_angle_after = np.abs(angle_after)
+    abs_vy_after = np.abs(vy_after)
+
+    # --- TERMINATION ON GROUND ---
+    terminated_on_ground = (y_after <= 0.1) & (y_before > 0.1)
+
+    landing_code = evaluate_landing_batch(
+        vx_after, vy_after, angle_after, params.landing_thresholds
+    )
+    angle_bonus = np.maximum(0.0, 1.0 - abs_angle_after / 10.0)
+    velocity_bonus = np.maximum(0.0, 1.0 - abs_vy_after / 5.0)
+    landing_quality = 0.6 * angle_bonus + 0.4 * velocity_bonus
+    crash_severity = np.minimum(
+        1.0, (abs_vy_after / 20.0 + abs_angle_after / 45.0) / 2.0
+    )
+    landing_multiplier = np.choose(
+        landing_code,
+        [
+            1.0 + 0.5 * landing_quality,
+            0.8 + 0.2 * landing_quality,
+            np.ones_like(landing_quality),
+            0.7 + 0.3 * crash_severity,
+        ],
+    )
+    landing_reward = params.landing_base_rewards[landing_code] * landing_multiplier
+
+    # --- SHAPING REWARDS ---
+    # 1. Angular Control Reward with Directional Awareness
+    angle_error_before = np.abs(angle_before)
+    angle_error_after = abs_angle_after
+    ang_vel_error_before = np.abs(angular_velocity_before)
+    ang_vel_error_after = np.abs(angular_velocity_after)
+
+    total_reward = -(angle_error_after - angle_error_before) * 0.5
+    total_reward -= (ang_vel_error_after - ang_vel_error_before) * 0.1
+
+    correction_needed = (angle_error_before > 0.1) | (ang_vel_error_before > 0.1)
+    correct_direction = ((angle_before > 0) & (cold_gas < 0)) | (
+        (angle_before < 0) & (cold_gas > 0)
+    )
+    direction_multiplier = np.where(
+        correct_direction, correct_direction_bonus, -correct_direction_bonus
+    )
+    correction_effectiveness = (angle_error_before - angle_error_after) + (
+        ang_vel_error_before - ang_vel_error_after
+    )
+    cold_gas_reward = (
+        np.abs(cold_gas)
+        * (angle_error_before + ang_vel_error_before)
+        * direction_multiplier
+        * cold_gas_reward_scale
+    )
+    cold_gas_reward = np.where(
+        correction_effectiveness > 0,
+        cold_gas_reward * (1.0 + correction_effectiveness**2),
+        cold_gas_reward,
+    )
+    cold_gas_penalty = np.abs(cold_gas) * 0.3 * cold_gas_reward_scale
+    total_reward += np.where(correction_needed, cold_gas_reward, -cold_gas_penalty)
+
+    airborne = y_after > 0.1
+    descending = airborne & (vy_after < 0)
+
+    # 2. Vertical Control Reward
+    angle_factor = np.maximum(0.0, 1.0 - abs_angle_after / 45.0)
+    descent_speed_factor = np.minimum(1.0, abs_vy_after / 10.0)
+    reward_throttle_descent = (
+        throttle
+        * (-vy_after)
+        * angle_factor
+        * (1.0 + descent_speed_factor)
+        * throttle_descent_reward_scale
+    )
+    total_reward += np.where(descending, reward_throttle_descent, 0.0)
+
+    # 3. Free Fall Penalty with proximity awareness
+    proximity_factor = 1.0 + (8.0 / np.maximum(y_after, 1.0))
+    speed_factor = np.minimum(1.0, abs_vy_after / 15.0)
+    free_fall_penalty = (
+        free_fall_penalty_scale * (-vy_after) * proximity_factor * (1.0 + speed_factor)
+    )
+    total_reward -= np.where(descending & (throttle < 0.1), free_fall_penalty, 0.0)
+
+    # 4. Angle-Aware Throttle Usage
+    throttling = (throttle > 0.1) & airborne
+    extreme_angle = abs_angle_after > 10.0
+    moderate_angle = (abs_angle_after > 5.0) & ~extreme_angle
+    throttle_inefficiency_penalty = np.where(
+        extreme_angle,
+        throttle * (abs_angle_after / 90.0) * angle_aware_throttle_scale,
+        throttle
+        * ((abs_angle_after - 5.0) / 5.0)
+        * angle_aware_throttle_scale
+        * 0.5,
+    )
+    total_reward -= np.where(
+        throttling & (extreme_angle | moderate_angle),
+        throttle_inefficiency_penalty,
+        0.0,
+    )
+
+    # 5. Penalize upward movement when airborne with altitude consideration
+    altitude_factor = np.minimum(1.0, y_after / 1000.0)
+    ascent_speed_factor = np.minimum(1.0, vy_after / 5.0)
+    ascent_penalty = vy_after * 0.5 * altitude_factor * (1.0 + ascent_speed_factor)
+    total_reward -= np.where(airborne & (vy_after > 0), ascent_penalty, 0.0)
+
+    # 6. Potential-Based Shaping
+    potential_before = _potential_batch(
+        y_before,
+        state_before[FIELD_INDEX["vx"]],
+        state_before[FIELD_INDEX["vy"]],
+        angle_before,
+        angular_velocity_before,
+    )
+    potential_after = _potential_batch(
+        y_after, vx_after, vy_after, angle_after, angular_velocity_after
+    )
+    total_reward += gamma * potential_after - potential_before
+
+    # --- Truncation Penalties ---
+    out_of_bounds = (np.abs(x_after) > params.max_horizontal_pos) | (
+        y_after > params.max_altitude
+    )
+    total_reward += np.where(out_of_bounds, _rewards.out_of_bounds, 0.0)
+    total_reward += np.where(
+        abs_angle_after > params.tip_over_angle, _rewards.tipped_over, 0.0
+    )
+
+    reward = np.where(terminated_on_ground, landing_reward, total_reward)
+    truncated = out_of_bounds & ~terminated_on_ground
+    return reward, terminated_on_ground, truncated
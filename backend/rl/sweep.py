@@ -0,0 +1,405 @@
+import os
+import math
+import json
+import time
+import sqlite3
+import traceback
+import multiprocessing
+import numpy as np
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Sequence
+
+from backend.config import Config
+from backend.utils import LANDING_MESSAGES, evaluate_landing_batch, get_landing_thresholds
+
+# Hyperparameters a sweep may vary; everything else comes from rl.training.algorithm.PPO
+SWEEP_PARAMETERS = ("learning_rate", "n_steps", "batch_size", "ent_coef", "gae_lambda", "net_arch")
+TRIAL_STATUSES = ("running", "pruned", "completed", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trials (
+    sweep TEXT NOT NULL,
+    trial INTEGER NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    timesteps INTEGER NOT NULL DEFAULT 0,
+    landing_rate REAL,
+    mean_reward REAL,
+    error TEXT,
+    cpu INTEGER,
+    started REAL,
+    finished REAL,
+    PRIMARY KEY (sweep, trial)
+);
+CREATE TABLE IF NOT EXISTS reports (
+    sweep TEXT NOT NULL,
+    trial INTEGER NOT NULL,
+    rung INTEGER NOT NULL,
+    timesteps INTEGER NOT NULL,
+    landing_rate REAL NOT NULL,
+    mean_reward REAL NOT NULL,
+    promoted INTEGER NOT NULL,
+    reported REAL NOT NULL,
+    PRIMARY KEY (sweep, trial, rung)
+);
+"""
+
+
+def sample_params(space: Dict[str, Dict], rng: np.random.Generator) -> Dict[str, Any]:
+    """
+    Draws one configuration from a search space of
+    {name: {type: choice|uniform|loguniform|int, ...}} entries.
+    """
+    params = {}
+    for name, spec in space.items():
+        if name not in SWEEP_PARAMETERS:
+            raise ValueError(f"Unknown sweep parameter '{name}'. Use one of {SWEEP_PARAMETERS}.")
+        kind = spec["type"]
+        if kind == "choice":
+            params[name] = spec["values"][int(rng.integers(len(spec["values"])))]
+        elif kind == "uniform":
+            params[name] = float(rng.uniform(spec["low"], spec["high"]))
+        elif kind == "loguniform":
+            params[name] = float(
+                math.exp(rng.uniform(math.log(spec["low"]), math.log(spec["high"])))
+            )
+        elif kind == "int":
+            params[name] = int(rng.integers(spec["low"], spec["high"] + 1))
+        else:
+            raise ValueError(f"Unknown search space type '{kind}' for '{name}'.")
+    return params
+
+
+def rung_budgets(min_timesteps: int, max_timesteps: int, reduction_factor: int) -> List[int]:
+    """Timestep budgets of the successive-halving rungs, ending at max_timesteps."""
+    if reduction_factor < 2 or min_timesteps < 1 or max_timesteps < min_timesteps:
+        raise ValueError("Need reduction_factor >= 2 and 1 <= min_timesteps <= max_timesteps.")
+    budgets = []
+    budget = min_timesteps
+    while budget < max_timesteps:
+        budgets.append(budget)
+        budget *= reduction_factor
+    budgets.append(max_timesteps)
+    return budgets
+
+
+class SweepLedger:
+    """
+    SQLite record of a sweep's trials and their rung reports.
+
+    The ledger is also the ASHA scheduler's shared state: trial processes
+    call `report`, which records a result and decides promotion against the
+    other results at the same rung in one transaction, so workers need no
+    other coordination. A sweep can be continued later from its ledger.
+    """
+
+    def __init__(self, path: str, sweep: str, reduction_factor: int = 3):
+        self.path = path
+        self.sweep = sweep
+        self.reduction_factor = reduction_factor
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None: transactions are opened explicitly
+        db = sqlite3.connect(self.path, timeout=60.0, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        return db
+
+    def add_trial(self, trial: int, params: Dict):
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR IGNORE INTO trials (sweep, trial, params, status) VALUES (?, ?, ?, 'running')",
+                (self.sweep, trial, json.dumps(params)),
+            )
+
+    def start_trial(self, trial: int, cpu: Optional[int]):
+        """Marks `trial` running and clears reports left by an interrupted attempt."""
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            db.execute(
+                "DELETE FROM reports WHERE sweep = ? AND trial = ?", (self.sweep, trial)
+            )
+            db.execute(
+                "UPDATE trials SET status = 'running', timesteps = 0, error = NULL, cpu = ?, "
+                "started = ?, finished = NULL WHERE sweep = ? AND trial = ?",
+                (cpu, time.time(), self.sweep, trial),
+            )
+            db.execute("COMMIT")
+
+    def report(
+        self, trial: int, rung: int, timesteps: int, landing_rate: float, mean_reward: float
+    ) -> bool:
+        """
+        Records the result of `trial` at `rung` and returns whether it is
+        promoted to the next rung: it must rank in the top
+        ceil(n / reduction_factor) of the n results at this rung so far
+        (asynchronous successive halving). Landing rate is compared first,
+        mean reward breaks ties. Early trials are judged only against those
+        that reached the rung before them, as in ASHA.
+        """
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            rows = db.execute(
+                "SELECT landing_rate, mean_reward FROM reports WHERE sweep = ? AND rung = ?",
+                (self.sweep, rung),
+            ).fetchall()
+            scores = [(row["landing_rate"], row["mean_reward"]) for row in rows]
+            score = (landing_rate, mean_reward)
+            rank = sum(1 for other in scores if other > score)
+            keep = math.ceil((len(scores) + 1) / self.reduction_factor)
+            promoted = rank < keep
+            db.execute(
+                "INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.sweep, trial, rung, timesteps, landing_rate, mean_reward, int(promoted), time.time()),
+            )
+            db.execute(
+                "UPDATE trials SET timesteps = ?, landing_rate = ?, mean_reward = ? "
+                "WHERE sweep = ? AND trial = ?",
+                (timesteps, landing_rate, mean_reward, self.sweep, trial),
+            )
+            db.execute("COMMIT")
+        return promoted
+
+    def finish_trial(self, trial: int, status: str, error: Optional[str] = None):
+        if status not in TRIAL_STATUSES:
+            raise ValueError(f"Unknown trial status '{status}'.")
+        with self._connect() as db:
+            db.execute(
+                "UPDATE trials SET status = ?, error = ?, finished = ? WHERE sweep = ? AND trial = ?",
+                (status, error, time.time(), self.sweep, trial),
+            )
+
+    def trials(self, status: Optional[str] = None) -> List[Dict]:
+        query = "SELECT * FROM trials WHERE sweep = ?"
+        args: List[Any] = [self.sweep]
+        if status is not None:
+            query += " AND status = ?"
+            args.append(status)
+        with self._connect() as db:
+            rows = db.execute(query + " ORDER BY trial", args).fetchall()
+        return [{**dict(row), "params": json.loads(row["params"])} for row in rows]
+
+    def leaderboard(self, limit: int = 10) -> List[Dict]:
+        """
+        Best trials first: completed before pruned, then by timesteps
+        trained, landing rate and reward.
+        """
+        trials = [t for t in self.trials() if t["landing_rate"] is not None]
+        trials.sort(
+            key=lambda t: (
+                t["status"] == "completed", t["timesteps"], t["landing_rate"], t["mean_reward"]
+            ),
+            reverse=True,
+        )
+        return trials[:limit]
+
+
+def evaluate_landing_rate(model, vec_normalize, n_episodes: int, n_envs: int, seed: int = 0) -> Dict:
+    """
+    Runs `n_episodes` deterministic episodes on a native eval env using the
+    training env's frozen observation statistics. Returns the landing rate
+    (episodes that touched down with any grade better than "unsafe") and
+    the mean episode reward.
+    """
+    from stable_baselines3.common.vec_env import VecNormalize
+    from backend.envs import RocketLandingVecEnv
+
+    n_envs = min(n_envs, n_episodes)
+    env = VecNormalize(
+        RocketLandingVecEnv(n_envs, seed=seed),
+        training=False,
+        norm_reward=False,
+        clip_obs=vec_normalize.clip_obs,
+    )
+    env.obs_rms = vec_normalize.obs_rms.copy()
+    thresholds = get_landing_thresholds(Config().snapshot.landing)
+    unsafe = LANDING_MESSAGES.index("unsafe")
+
+    # Each env runs its share of the episodes, so short episodes don't dominate
+    targets = np.array([(n_episodes + i) // n_envs for i in range(n_envs)])
+    counts = np.zeros(n_envs, dtype=int)
+    returns = np.zeros(n_envs)
+    episode_returns, landings = [], 0
+    obs = env.reset()
+    while (counts < targets).any():
+        actions, _ = model.predict(obs, deterministic=True)
+        obs, rewards, dones, infos = env.step(actions)
+        returns += rewards
+        for i in np.flatnonzero(dones):
+            if counts[i] < targets[i]:
+                counts[i] += 1
+                episode_returns.append(returns[i])
+                state = infos[i]["raw_state"]
+                if not infos[i]["TimeLimit.truncated"]:
+                    code = evaluate_landing_batch(
+                        np.array([state["vx"]]), np.array([state["vy"]]),
+                        np.array([state["angle"]]), thresholds,
+                    )[0]
+                    landings += int(code != unsafe)
+            returns[i] = 0.0
+    env.close()
+    return {
+        "landing_rate": landings / n_episodes,
+        "mean_reward": float(np.mean(episode_returns)),
+    }
+
+
+def run_trial(ledger: SweepLedger, trial: int, params: Dict, settings: Dict, output_dir: str) -> str:
+    """
+    Trains one trial rung by rung, reporting the eval landing rate at each
+    budget and stopping as soon as the ledger does not promote it.
+    Returns the final status.
+    """
+    from stable_baselines3 import PPO
+    from stable_baselines3.common.vec_env import VecMonitor, VecNormalize
+    from backend.envs.autotune import make_training_vec_env
+
+    ppo_config = dict(Config().get("rl.training.algorithm.PPO"))
+    for name in SWEEP_PARAMETERS:
+        if name in params and name != "net_arch":
+            ppo_config[name] = params[name]
+    n_envs = settings["n_envs"]
+    # A minibatch can't be larger than one rollout
+    ppo_config["batch_size"] = min(ppo_config["batch_size"], ppo_config["n_steps"] * n_envs)
+    net_arch = params.get("net_arch", [256, 256])
+
+    env = make_training_vec_env(settings["vec_env"], n_envs, seed=settings["seed"] + trial)
+    if settings["vec_env"] == "native":
+        env = VecMonitor(env)
+    env = VecNormalize(env, norm_obs=True, norm_reward=True, clip_obs=10.0, gamma=ppo_config["gamma"])
+    try:
+        model = PPO(
+            "MlpPolicy",
+            env,
+            policy_kwargs=dict(net_arch=dict(pi=list(net_arch), vf=list(net_arch))),
+            seed=settings["seed"] + trial,
+            device="cpu",
+            verbose=0,
+            **ppo_config,
+        )
+        budgets = rung_budgets(
+            settings["min_timesteps"], settings["max_timesteps"], settings["reduction_factor"]
+        )
+        for rung, budget in enumerate(budgets):
+            model.learn(
+                max(budget - model.num_timesteps, 1), reset_num_timesteps=False
+            )
+            result = evaluate_landing_rate(
+                model,
+                env,
+                n_episodes=settings["eval_episodes"],
+                n_envs=settings["eval_episodes"],  # one env per episode, all concurrent
+                seed=settings["seed"],
+            )
+            promoted = ledger.report(
+                trial, rung, model.num_timesteps, result["landing_rate"], result["mean_reward"]
+            )
+            if not promoted and rung < len(budgets) - 1:
+                return "pruned"
+
+        trial_dir = os.path.join(output_dir, f"trial_{trial:03d}")
+        os.makedirs(trial_dir, exist_ok=True)
+        model.save(os.path.join(trial_dir, "model"))
+        env.save(os.path.join(trial_dir, "vecnormalize.pkl"))
+        return "completed"
+    finally:
+        env.close()
+
+
+# Worker processes pin themselves to one CPU each, in start order
+_worker_cpu: Optional[int] = None
+
+
+def _init_worker(counter, cpus: Sequence[int]):
+    global _worker_cpu
+    with counter.get_lock():
+        slot = counter.value
+        counter.value += 1
+    if cpus and hasattr(os, "sched_setaffinity"):
+        _worker_cpu = cpus[slot % len(cpus)]
+        os.sched_setaffinity(0, {_worker_cpu})
+    # One trial per core: keep torch from spreading over the others
+    import torch
+
+    torch.set_num_threads(1)
+
+
+def _run_trial_job(ledger_args, trial: int, params: Dict, settings: Dict, output_dir: str) -> str:
+    ledger = SweepLedger(*ledger_args)
+    ledger.start_trial(trial, _worker_cpu)
+    try:
+        status = run_trial(ledger, trial, params, settings, output_dir)
+    except Exception:
+        ledger.finish_trial(trial, "failed", traceback.format_exc())
+        return "failed"
+    ledger.finish_trial(trial, status)
+    return status
+
+
+class _SerialExecutor:
+    """Runs trials inline for workers=1, without a process pool."""
+
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait: bool = True):
+        pass
+
+
+def run_sweep(
+    ledger: SweepLedger,
+    space: Dict[str, Dict],
+    num_trials: int,
+    settings: Dict,
+    output_dir: str,
+    workers: int = 0,
+    on_trial_done=None,
+) -> List[Dict]:
+    """
+    Runs `num_trials` trials of the sweep, `workers` at a time (0: one per
+    available CPU), each worker process pinned to its own core. Trials
+    already completed, pruned or failed in the ledger are kept; trials left
+    "running" by an interrupted sweep are rerun from the start.
+    Returns the ledger's trials.
+    """
+    rng_seed = settings["seed"]
+    for trial in range(num_trials):
+        ledger.add_trial(trial, sample_params(space, np.random.default_rng([rng_seed, trial])))
+    pending = [t for t in ledger.trials("running") if t["trial"] < num_trials]
+
+    cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else []
+    workers = workers or len(cpus) or os.cpu_count() or 1
+    workers = min(workers, len(pending)) or 1
+    if workers == 1:
+        executor = _SerialExecutor()
+    else:
+        context = multiprocessing.get_context("spawn")
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(context.Value("i", 0), cpus),
+        )
+
+    ledger_args = (ledger.path, ledger.sweep, ledger.reduction_factor)
+    try:
+        futures = {
+            executor.submit(
+                _run_trial_job, ledger_args, t["trial"], t["params"], settings, output_dir
+            ): t["trial"]
+            for t in pending
+        }
+        for future in as_completed(futures):
+            status = future.result()
+            if on_trial_done is not None:
+                on_trial_done(futures[future], status)
+    finally:
+        executor.shutdown(wait=True)
+    return ledger.trials()
@@ -1,4 +1,5 @@
+from .state import RocketState
 from .base import Rocket
 from .controls import RocketControls
 
-__all__ = ["Rocket", "RocketControls"]
+__all__ = ["RocketState", "Rocket", "RocketControls"]
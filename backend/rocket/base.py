@@ -1,15 +1,8 @@
-import numpy as np
 from backend.physics import PhysicsEngine
 from backend.config import Config
+from backend.rocket.state import RocketState
 
-from backend.simulation.config import (
-    get_initial_state,
-    get_physics_config,
-    get_environment_config,
-)
-
-env_config = get_environment_config()
-physics_config = get_physics_config()
+from backend.simulation.config import get_initial_state
 
 
 class Rocket:
@@ -17,33 +10,21 @@ class Rocket:
         try:
             self.config = Config()
             self.physics_engine = PhysicsEngine()
-            self.dt = env_config.get("time_step", 0.1)  # s
+            self.dt = self.config.snapshot.physics.time_step  # s
 
             if self.dt <= 0:
                 raise ValueError("Invalid time_step configured.")
 
             # Initialize state
-            self.state = get_initial_state()
-            required_keys = [
-                "x",
-                "y",
-                "vx",
-                "vy",
-                "ax",
-                "ay",
-                "angle",
-                "angularVelocity",
-                "mass",
-                "fuelMass",
-            ]
-            for key in required_keys:
-                if key not in self.state:
-                    if key in ["x", "y", "mass", "fuelMass"]:
-                        raise KeyError(
-                            f"Initial state from get_initial_state() is missing required key: {key}"
-                        )
-                    self.state[key] = 0.0
+            initial_values = get_initial_state()
+            for key in ["x", "y", "mass", "fuelMass"]:
+                if key not in initial_values:
+                    raise KeyError(
+                        f"Initial state from get_initial_state() is missing required key: {key}"
+                    )
 
+            # Missing optional keys default to 0.0
+            self.state = RocketState.from_mapping(initial_values)
             self.initial_state = self.state.copy()
 
             self.previous_state = self.calculate_consistent_previous_state(
@@ -63,16 +44,16 @@ class Rocket:
             raise
 
     def calculate_consistent_previous_state(
-        self, current_state: dict, dt: float
-    ) -> dict:
+        self, current_state: RocketState, dt: float
+    ) -> RocketState:
         """
         Calculates a previous state based on the current state and assumed dynamics
         at t=0 to properly initialize Verlet integration.
         x_prev = x_curr - v_curr*dt + 0.5*a_curr*dt^2
         angle_prev = angle_curr - omega_curr*dt + 0.5*alpha_curr*dt^2
         """
-        # Deep copy to avoid modifying the original current_state unintentionally
-        previous = {k: v for k, v in current_state.items()}
+        # Copy to avoid modifying the original current_state unintentionally
+        previous = RocketState.from_mapping(current_state)
 
         # Estimate accelerations at the current (initial) state *assuming zero controls*
         # This provides a baseline for the dynamics before the first control input.
@@ -132,16 +113,16 @@ class Rocket:
     def apply_action(self, throttle: float, cold_gas_control: float):
         try:
             dt = self.dt
-            throttle = np.clip(float(throttle), 0.0, 1.0)
-            cold_gas_control = np.clip(float(cold_gas_control), -1.0, 1.0)
+            state = self.state
+            throttle = min(max(float(throttle), 0.0), 1.0)
+            cold_gas_control = min(max(float(cold_gas_control), -1.0), 1.0)
 
-            current_fuel = self.state.get("fuelMass", 0.0)
+            current_fuel = state.fuelMass
             if current_fuel <= 0:
                 throttle = 0.0  # No fuel, no main thrust
-                self.state["fuelMass"] = 0.0
+                state.fuelMass = 0.0
 
-            current_mass = self.state.get("mass", 0.0)
-            total_mass = current_mass + current_fuel
+            total_mass = state.mass + current_fuel
             if total_mass <= 1e-6:
                 print("Warning: Total mass is near zero during apply_action.")
                 return
@@ -149,30 +130,32 @@ class Rocket:
             net_force = self.physics_engine.calculate_net_force(
                 total_mass=total_mass,
                 throttle=throttle,
-                angle_degrees=self.state.get("angle", 0.0),
-                state=self.state,
+                angle_degrees=state.angle,
+                state=state,
             )
 
             linear_acceleration = self.physics_engine.calculate_acceleration(
                 net_force, total_mass
             )
-            self.state["ax"] = linear_acceleration[0]
-            self.state["ay"] = linear_acceleration[1]
+            state.ax = float(linear_acceleration[0])
+            state.ay = float(linear_acceleration[1])
 
             angular_acceleration = self.physics_engine.calculate_angular_acceleration(
                 cold_gas_control=cold_gas_control, total_mass=total_mass
             )
-            self.state["angularAcceleration"] = angular_acceleration  # deg/s^2
+            state.angularAcceleration = float(angular_acceleration)  # deg/s^2
 
+            # update_state_verlet returns a fresh record; the current one becomes
+            # the previous state as-is, so no further copies are needed.
             new_state = self.physics_engine.update_state_verlet(
-                self.state, self.previous_state, dt
+                state, self.previous_state, dt
             )
 
-            self.previous_state = self.state.copy()
-            self.state.update(new_state)
-
             fuel_used = self.physics_engine.calculate_fuel_consumption(throttle, dt)
-            self.state["fuelMass"] = max(0.0, current_fuel - fuel_used)
+            new_state.fuelMass = max(0.0, current_fuel - fuel_used)
+
+            self.previous_state = state
+            self.state = new_state
 
             self.first_step = False
 
@@ -185,7 +168,7 @@ class Rocket:
 
     def reset(self):
         try:
-            self.state = get_initial_state()
+            initial_values = get_initial_state()
             required_keys = [
                 "x",
                 "y",
@@ -197,13 +180,12 @@ class Rocket:
                 "angularVelocity",
             ]
             for key in required_keys:
-                if key not in self.state:
+                if key not in initial_values:
                     raise KeyError(
                         f"Initial state from get_initial_state() after reset is missing required key: {key}"
                     )
-                if key not in ["ax", "ay", "angularAcceleration"]:
-                    self.state.setdefault(key, 0.0)
 
+            self.state = RocketState.from_mapping(initial_values)
             self.initial_state = self.state.copy()
             self.previous_state = self.calculate_consistent_previous_state(
                 self.state, self.dt
@@ -218,23 +200,14 @@ class Rocket:
             raise
 
     def get_state(self) -> dict:
-        """Returns a copy of the current rocket state with derived values."""
-        try:
-            state_copy = self.state.copy()
-
-            vx = state_copy.get("vx", 0.0)
-            vy = state_copy.get("vy", 0.0)
-            speed = np.sqrt(vx**2 + vy**2)
-            state_copy["speed"] = float(speed)
-
-            angle_deg = state_copy.get("angle", 0.0)
-            state_copy["relativeAngle"] = float(abs(angle_deg))
-
-            state_copy["totalMass"] = state_copy.get("mass", 0.0) + state_copy.get(
-                "fuelMass", 0.0
-            )
+        """
+        Returns a dict copy of the current rocket state with derived values.
 
-            return state_copy
+        Kept for JSON and logging consumers; hot paths should read the
+        `state` record directly and take `state.copy()` snapshots.
+        """
+        try:
+            return self.state.to_dict()
         except Exception as err:
             print(f"Error getting state: {err}")
             return {"error": str(err)}
@@ -1,4 +1,4 @@
-from backend.rl import calculate_reward
+from backend.rl import calculate_reward, reward_params
 from backend.rocket import Rocket
 from backend.config import Config
 import numpy as np
@@ -19,6 +19,8 @@ class RocketControls:
             self.rocket = Rocket()
             self.touchdown = False
             self.steps = 0
+            # Pinned per episode: config reloads apply from the next reset
+            self.reward_params = reward_params()
 
         except Exception as err:
             print(f"FATAL Error initializing RocketControls: {err}")
@@ -76,19 +78,19 @@ class RocketControls:
             action_np = np.array([throttle, cold_gas_control], dtype=np.float32)
 
             # --- Simulation Step ---
-            state_before = self.rocket.get_state()
+            state_before = self.rocket.state.copy()
             self.rocket.apply_action(throttle, cold_gas_control)
-            state_after = self.rocket.get_state()
-
-            if "error" in state_after:
-                print(f"Error retrieving state_after: {state_after['error']}")
-                return state_after, -500.0, True  # Terminate on simulation error
 
             # --- Reward Calculation ---
             # Pass the correctly formatted numpy action array
             reward, self.touchdown, _ = calculate_reward(
-                state_before, action_np, state_after
+                state_before, action_np, self.rocket.state, self.reward_params
             )
+
+            state_after = self.rocket.get_state()
+            if "error" in state_after:
+                print(f"Error retrieving state_after: {state_after['error']}")
+                return state_after, -500.0, True  # Terminate on simulation error
             reward = float(reward)
 
             # --- Check for Truncation (handled by environment, but RocketControls can signal done) ---
@@ -126,6 +128,7 @@ class RocketControls:
             self.rocket.reset()
             self.touchdown = False
             self.steps = 0
+            self.reward_params = reward_params()
             initial_state = self.rocket.get_state()
             if "error" in initial_state:
                 print(f"Error retrieving state after reset: {initial_state['error']}")
@@ -0,0 +1,97 @@
+import math
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator
+
+from backend.physics.batch import STATE_FIELDS
+
+DERIVED_FIELDS = ("speed", "relativeAngle", "totalMass")
+
+
+class RocketState(Mapping):
+    """
+    Fixed-layout state record for a single rocket.
+
+    Stores the fields of `STATE_FIELDS` as float slots, so the physics step reads
+    and writes plain attributes instead of copying dicts. It is also a read-only
+    Mapping over those fields plus the derived `speed`, `relativeAngle` and
+    `totalMass`, which are computed only when read. Item assignment is supported
+    for the stored fields so existing `state["x"] = ...` call sites keep working.
+
+    Use `to_dict()` where a real dict is needed (JSON, logging).
+    """
+
+    __slots__ = STATE_FIELDS
+
+    def __init__(self, **values: float):
+        for name in STATE_FIELDS:
+            setattr(self, name, float(values.get(name, 0.0)))
+
+    @classmethod
+    def from_mapping(cls, values: Mapping) -> "RocketState":
+        state = cls.__new__(cls)
+        for name in STATE_FIELDS:
+            setattr(state, name, float(values.get(name, 0.0)))
+        return state
+
+    @property
+    def speed(self) -> float:
+        return math.hypot(self.vx, self.vy)
+
+    @property
+    def relativeAngle(self) -> float:
+        return abs(self.angle)
+
+    @property
+    def totalMass(self) -> float:
+        return self.mass + self.fuelMass
+
+    def copy(self) -> "RocketState":
+        """Snapshot of the stored fields as a new record."""
+        state = RocketState.__new__(RocketState)
+        for name in STATE_FIELDS:
+            setattr(state, name, getattr(self, name))
+        return state
+
+    def to_dict(self) -> Dict[str, float]:
+        """Plain dict of stored and derived fields, as `Rocket.get_state` used to build."""
+        values = {name: getattr(self, name) for name in STATE_FIELDS}
+        values["speed"] = self.speed
+        values["relativeAngle"] = self.relativeAngle
+        values["totalMass"] = self.totalMass
+        return values
+
+    def __getitem__(self, key: str) -> float:
+        if key in STATE_FIELDS or key in DERIVED_FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: float):
+        if key not in STATE_FIELDS:
+            raise KeyError(f"'{key}' is not a stored RocketState field")
+        setattr(self, key, float(value))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in STATE_FIELDS or key in DERIVED_FIELDS:
+            return getattr(self, key)
+        return default
+
+    def __contains__(self, key: object) -> bool:
+        return key in STATE_FIELDS or key in DERIVED_FIELDS
+
+    def __iter__(self) -> Iterator[str]:
+        yield from STATE_FIELDS
+        yield from DERIVED_FIELDS
+
+    def __len__(self) -> int:
+        return len(STATE_FIELDS) + len(DERIVED_FIELDS)
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in STATE_FIELDS)
+
+    def __setstate__(self, values):
+        for name, value in zip(STATE_FIELDS, values):
+            setattr(self, name, value)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name):.3f}" for name in STATE_FIELDS)
+        return f"RocketState({fields})"
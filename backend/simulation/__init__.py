@@ -1,3 +1,11 @@
-from .controller import SimulationController
-
 __all__ = ["SimulationController"]
+
+
+def __getattr__(name):
+    # backend.simulation.config is a dependency of the rocket/physics layer,
+    # so the controller (which depends on that layer) is resolved lazily.
+    if name == "SimulationController":
+        from .controller import SimulationController
+
+        return SimulationController
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
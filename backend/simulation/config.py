@@ -1,6 +1,6 @@
 import numpy as np
 from backend.config import Config
-from typing import List
+from typing import Dict, List, Optional
 
 cfg = Config()
 
@@ -53,6 +53,30 @@ def get_initial_state():
     }
 
 
+def get_initial_state_batch(
+    n: int, rng: Optional[np.random.Generator] = None
+) -> Dict[str, np.ndarray]:
+    """Samples `n` initial states at once, one (n,) array per state key."""
+    sampler = rng if rng is not None else np.random
+
+    def sample(range_key: str) -> np.ndarray:
+        low, high = get_float_list(range_key)
+        return sampler.uniform(low, high, n)
+
+    return {
+        "x": sample("rocket.position_limits.x"),
+        "y": sample("rocket.position_limits.y"),
+        "vx": sample("rocket.velocity_limits.vx"),
+        "vy": sample("rocket.velocity_limits.vy"),
+        "ax": sample("rocket.acceleration_limits.ax"),
+        "ay": sample("rocket.acceleration_limits.ay"),
+        "angle": sample("rocket.attitude_limits.angle"),
+        "angularVelocity": sample("rocket.attitude_limits.angular_velocity"),
+        "mass": sample("rocket.mass_limits.dry_mass"),
+        "fuelMass": sample("rocket.mass_limits.fuel_mass"),
+    }
+
+
 def get_environment_config():
     return {
         "gravity": cfg.get("environment.gravity"),
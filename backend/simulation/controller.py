@@ -1,12 +1,19 @@
 from backend.rocket import RocketControls
 from backend.logger import Logger
+from backend.steplog import STEP_LOG_SUFFIX, StepLogWriter
 from datetime import datetime
 import asyncio
 import os
+import queue
+import threading
+import time
+import uuid
 from backend.config import Config
-import json
+import numpy as np
 from typing import Tuple, List, Dict, Optional, Callable, Any
 from backend.rl import RLAgent
+from backend.simulation.scheduler import FixedStepScheduler
+from backend.simulation.sharded import ShardedFleet
 
 
 class SimulationController:
@@ -21,43 +28,98 @@ class SimulationController:
             self.log_state = self.config.get("logging.log_state")
             self.log_action = self.config.get("logging.log_action")
             self.log_reward = self.config.get("logging.log_reward")
+            self.step_format = self.config.get("logging.step_format")
+            self.step_log: Optional[StepLogWriter] = None
 
             self.logger = None
+            self.log_writer = None
             self._setup_new_logger()
 
             self.num_rockets = num_rockets
-            self.rockets: List[RocketControls] = [
-                RocketControls() for _ in range(self.num_rockets)
-            ]
+            # Sharded mode keeps the fleet as arrays in worker processes
+            # instead of one RocketControls per rocket.
+            self.fleet: Optional[ShardedFleet] = None
+            shard_workers = self.config.get("simulation.shard_workers")
+            if shard_workers:
+                self.fleet = ShardedFleet(self.num_rockets, num_workers=shard_workers)
+                self.rockets: List[RocketControls] = []
+                self._manual_actions = np.zeros((self.num_rockets, 2))
+            else:
+                self.rockets = [RocketControls() for _ in range(self.num_rockets)]
 
             self.dt = (
                 self.rockets[0].dt
                 if self.rockets
+                else self.fleet.dt
+                if self.fleet
                 else self.config.get("simulation.time_step")
             )
 
             self.paused = True
+            self.sim_time = 0.0
+            self.scheduler = FixedStepScheduler(
+                dt=self.dt,
+                display_rate=self.config.get("simulation.display_rate"),
+                max_steps_per_frame=self.config.get("simulation.max_steps_per_frame"),
+                max_speed=self.config.get("simulation.max_speed"),
+            )
+            self.min_time_scale = self.config.get("simulation.min_time_scale")
+            # Warps past what max_steps_per_frame allows would overrun every
+            # frame and drop sim time, so they are never offered
+            self.max_time_scale = min(
+                self.config.get("simulation.max_time_scale"),
+                self.scheduler.max_time_scale,
+            )
+            self._steps_this_frame = 0
+            self._reported_overruns = 0
+            self._reported_dropped = 0.0
+            # (overruns, dropped sim time) when the current overrun streak began
+            self._overrun_start: Optional[Tuple[int, float]] = None
+            self._last_overrun_frame = 0
+            # A streak ends after one second of frames without an overrun
+            self._overrun_quiet_frames = max(
+                1, round(self.config.get("simulation.display_rate"))
+            )
             self.rocket_touchdown_status: List[bool] = [False] * self.num_rockets
             self.rocket_steps: List[int] = [0] * self.num_rockets
             self._running = False
             self.state_callback: Optional[
                 Callable[[List[Any], List[Any], List[bool]], None]
             ] = None
-            self.rl_agent = rl_agent
-            self.agent_enabled = bool(rl_agent)
-            self.agent_controlled_indices = (
-                set(range(self.num_rockets)) if self.agent_enabled else set()
-            )
+            self.rl_agent = None
+            self.agent_enabled = False
+            self.agent_controlled_indices = set()
+            self.set_agent(rl_agent)
             self.current_actions: List[Dict[str, float]] = [
                 {"throttle": 0.0, "coldGas": 0.0} for _ in range(self.num_rockets)
             ]
             self.prev_action_taken: List[Dict[str, float]] = [
                 {"throttle": 0.0, "coldGas": 0.0} for _ in range(self.num_rockets)
             ]
-
-            # --- BUFFERED LOGGING SETUP ---
-            self.log_buffer = []
-            self.BUFFER_SIZE = 100  # Flush to disk every 100 steps
+            # Actions and sim time of the frame last handed to state_callback
+            # (IOLoop side)
+            self.published_actions = self.prev_action_taken
+            self.published_sim_time = 0.0
+            # Guards manual actions: set on the IOLoop, read and cleared by
+            # the compute thread
+            self._action_lock = threading.Lock()
+
+            # --- COMPUTE PIPELINE ---
+            # Frames are computed on a worker thread and handed to the IOLoop
+            # through a bounded queue: the worker computes frame N+1 while the
+            # IOLoop serializes and sends frame N.
+            self._worker: Optional[threading.Thread] = None
+            self._loop: Optional[asyncio.AbstractEventLoop] = None
+            self._frame_lock = threading.Lock()
+            self._resume = threading.Event()
+            self._wake = threading.Event()
+            self._updates: "queue.Queue" = queue.Queue(
+                maxsize=self.config.get("simulation.pipeline_depth")
+            )
+            self.max_queued_frames = 0
+            self.stalls = 0
+            self.frames_published = 0
+            self.compute_time = 0.0
 
             self._log(
                 "info",
@@ -73,17 +135,13 @@ class SimulationController:
         elif level == "exception":
             print(f"EXCEPTION: {msg}")
 
-    def _flush_logs(self):
-        """Writes buffered logs to disk."""
-        if not self.log_buffer or not self.logger:
-            return
-        try:
-            for level, msg in self.log_buffer:
-                if hasattr(self.logger, level):
-                    getattr(self.logger, level)(msg)
-            self.log_buffer.clear()
-        except Exception as e:
-            print(f"Error flushing logs: {e}")
+    def _flush_logs(self, wait: bool = False):
+        """
+        Wakes the log writer thread; with `wait`, blocks until everything
+        logged so far is on disk (bounded by `logging.writer.drain_timeout`).
+        """
+        if self.log_writer:
+            self.log_writer.flush(self._drain_timeout if wait else 0.0)
 
     def _setup_new_logger(self):
         try:
@@ -91,42 +149,86 @@ class SimulationController:
                 for handler in self.logger.handlers[:]:
                     handler.close()
                     self.logger.removeHandler(handler)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # Rooms can reset within the same second: the suffix keeps their
+            # log files and logger names apart
+            run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{uuid.uuid4().hex[:6]}"
             log_dir = self.config.get("paths.logs_dir")
             sim_log_dir = os.path.join(log_dir, "simulations")
 
-            log_filename = f"{timestamp}.log"
-            self.logger = Logger(
+            log_filename = f"{run_id}.log"
+            self._step_log_path = os.path.join(sim_log_dir, run_id + STEP_LOG_SUFFIX)
+            writer_options = self.config.get("logging.writer")
+            self._drain_timeout = writer_options.pop("drain_timeout")
+            logger = Logger(
                 file_name=log_filename,
                 log_dir=sim_log_dir,
                 stream_handler=False,
-            ).get_logger()
+                writer_options=writer_options,
+            )
+            self.logger = logger.get_logger()
+            self.log_writer = logger.writer
         except Exception as e:
             print(f"Logger setup failed: {e}")
             self.logger = None
+            self.log_writer = None
+
+    def _open_step_log(self):
+        """Starts a binary step log for this run when `logging.step_format` is binary."""
+        if self.step_log:
+            self.step_log.close()
+            self.step_log = None
+        if self.step_format != "binary" or not (
+            self.log_state or self.log_action or self.log_reward
+        ):
+            return
+        try:
+            self.step_log = StepLogWriter(
+                self._step_log_path,
+                self.num_rockets,
+                self.dt,
+                metadata={"agent": bool(self.rl_agent and self.agent_enabled)},
+            )
+        except Exception as e:
+            self._log("exception", f"Step log setup failed: {e}")
 
     def reset(self) -> List[Dict]:
         try:
+            self._stop_worker()
             self._log("info", "Resetting simulation...")
             self._setup_new_logger()
-            states = [rocket.reset() for rocket in self.rockets]
+            self._open_step_log()
+            if self.fleet:
+                self.fleet.reset()
+                self._manual_actions[:] = 0.0
+                states = self._render()
+            else:
+                states = [rocket.reset() for rocket in self.rockets]
             self.paused = True
+            self.sim_time = 0.0
             self.rocket_touchdown_status = [False] * self.num_rockets
-            self.rocket_steps = [0] * self.num_rockets
+            self.rocket_steps = (
+                np.zeros(self.num_rockets, dtype=np.int64)
+                if self.fleet
+                else [0] * self.num_rockets
+            )
             self._running = False
             self.current_actions = [
                 {"throttle": 0.0, "coldGas": 0.0} for _ in range(self.num_rockets)
             ]
-            self.log_buffer = []
+            self.published_actions = list(self.current_actions)
+            self.published_sim_time = 0.0
+            self._discard_updates()
             return states
         except Exception as e:
             self._log("exception", f"Simulation reset failed: {e}")
             raise
 
     def start(self, state_callback: Callable[[List[Any], List[Any], List[bool]], None]):
+        """Starts or resumes the simulation. Must be called on the IOLoop thread."""
         try:
             if self._running and self.paused:
                 self.paused = False
+                self._resume.set()
                 self._log("info", "Simulation resumed.")
                 return
             if self._running:
@@ -134,8 +236,14 @@ class SimulationController:
             self.paused = False
             self._running = True
             self.state_callback = state_callback
+            self._loop = asyncio.get_event_loop()
+            self._resume.set()
+            self._wake.clear()
+            self._worker = threading.Thread(
+                target=self._compute_loop, name="simulation-compute", daemon=True
+            )
             self._log("info", "Simulation started.")
-            asyncio.create_task(self._simulation_loop())
+            self._worker.start()
         except Exception as e:
             self._log("exception", f"Simulation start failed: {e}")
             raise
@@ -144,6 +252,7 @@ class SimulationController:
         try:
             if not self.paused:
                 self.paused = True
+                self._resume.clear()
                 self._flush_logs()
                 self._log("info", "Simulation paused.")
         except Exception as e:
@@ -151,75 +260,300 @@ class SimulationController:
             raise
 
     def stop(self):
-        """Gracefully stops the simulation loop and flushes logs."""
-        self._running = False
+        """Gracefully stops the simulation loop and drains the log writer."""
+        self._stop_worker()
         self.paused = True
-        self._flush_logs()
+        if self.step_log:
+            self.step_log.flush()
+        self._flush_logs(wait=True)
+
+    def close(self):
+        """Stops the simulation and releases the step log and shard workers."""
+        self.stop()
+        if self.step_log:
+            self.step_log.close()
+            self.step_log = None
+        if self.fleet:
+            self.fleet.close()
+
+    def _stop_worker(self):
+        """Stops the compute thread and waits for its current frame to finish."""
+        self._running = False
+        self._resume.set()
+        self._wake.set()
+        worker = self._worker
+        if worker and worker.is_alive() and worker is not threading.current_thread():
+            worker.join(timeout=5.0)
+        self._worker = None
+
+    @property
+    def speed(self) -> float:
+        return self.scheduler.time_scale
+
+    def set_speed(self, speed: float) -> float:
+        """
+        Sets the time warp factor, clamped to the configured range and to
+        what the scheduler can run (`FixedStepScheduler.max_time_scale`),
+        and returns the applied value. Faster warps run more physics steps per
+        frame; telemetry stays at the display rate.
+        """
+        speed = max(self.min_time_scale, min(self.max_time_scale, float(speed)))
+        if speed != self.scheduler.time_scale:
+            self.scheduler.time_scale = speed
+            self._log("info", f"Simulation speed set to {speed:g}x.")
+        return speed
+
+    def set_agent(self, rl_agent: Optional[RLAgent]):
+        """
+        Replaces the controlling agent. Takes effect on the next loop step;
+        the enabled flag is kept when swapping one agent for another.
+        """
+        had_agent = self.rl_agent is not None
+        self.rl_agent = rl_agent
+        if rl_agent is None:
+            self.agent_enabled = False
+            self.agent_controlled_indices = set()
+            return
+        if not had_agent:
+            self.agent_enabled = True
+        self.agent_controlled_indices = set(range(self.num_rockets))
 
     def set_action(self, action: Dict[str, float], rocket_index: int):
         if not (0 <= rocket_index < self.num_rockets):
             return
-        throttle = action.get("throttle", 0.0)
-        cold_gas = action.get("coldGas", 0.0)
-        self.current_actions[rocket_index] = {
-            "throttle": max(0.0, min(1.0, float(throttle))),
-            "coldGas": max(-1.0, min(1.0, float(cold_gas))),
-        }
+        throttle = max(0.0, min(1.0, float(action.get("throttle", 0.0))))
+        cold_gas = max(-1.0, min(1.0, float(action.get("coldGas", 0.0))))
+        with self._action_lock:
+            self.current_actions[rocket_index] = {"throttle": throttle, "coldGas": cold_gas}
+            if self.fleet:
+                self._manual_actions[rocket_index] = (throttle, cold_gas)
+
+    def _select_actions(self) -> List[Dict[str, float]]:
+        """Manual actions, overridden by the agent for rockets it controls."""
+        with self._action_lock:
+            actions = list(self.current_actions)
+        # Read once: set_agent may swap it from the IOLoop thread
+        rl_agent = self.rl_agent
+        if not (self.agent_enabled and rl_agent):
+            return actions
+
+        indices_to_predict = [
+            i
+            for i in range(self.num_rockets)
+            if i in self.agent_controlled_indices and not self.rocket_touchdown_status[i]
+        ]
+        if indices_to_predict:
+            current_sim_states = self._render()
+            predicted_actions = rl_agent.predict_batch(
+                [current_sim_states[i] for i in indices_to_predict]
+            )
+            for idx, action in zip(indices_to_predict, predicted_actions):
+                actions[idx] = action
+        return actions
+
+    def run_frame(
+        self, steps_due: int
+    ) -> Optional[Tuple[List[Any], List[Any], List[bool]]]:
+        """
+        Advances up to `steps_due` physics steps and merges them into one
+        update: each rocket reports its latest state and reward within the
+        frame, so a touchdown is published even if later steps of the same
+        frame return None for it. Returns None if no step ran.
+
+        In sharded mode the update is array-based instead, see
+        `_run_sharded_frame`.
+        """
+        if self.fleet:
+            return self._run_sharded_frame(steps_due)
+
+        states: List[Any] = [None] * self.num_rockets
+        rewards: List[Any] = [None] * self.num_rockets
+        dones: List[bool] = list(self.rocket_touchdown_status)
+        steps_done = 0
+
+        while self.scheduler.step_allowed(steps_done, steps_due):
+            step_states, step_rewards, dones = self.step(self._select_actions())
+            steps_done += 1
+            for i, state in enumerate(step_states):
+                if state is not None:
+                    states[i] = state
+                    rewards[i] = step_rewards[i]
+            if all(dones):
+                break
 
-    async def _simulation_loop(self):
+        self._steps_this_frame = steps_done
+        if not steps_done:
+            return None
+        # Manual inputs hold for the whole frame, then must be re-sent
+        with self._action_lock:
+            self.current_actions = [
+                {"throttle": 0.0, "coldGas": 0.0} for _ in range(self.num_rockets)
+            ]
+        return states, rewards, dones
+
+    def _run_sharded_frame(
+        self, steps_due: int
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Sharded `run_frame`. Returns a copy of the (fields, N) state block, the
+        last reward of each rocket stepped in this frame (NaN otherwise) and
+        the (N,) done mask. Agent inference reads observations straight from
+        the shared block.
+        """
+        fleet = self.fleet
+        rewards = np.full(self.num_rockets, np.nan)
+        steps_done = 0
+
+        while self.scheduler.step_allowed(steps_done, steps_due):
+            active = fleet.active
+            with self._action_lock:
+                actions = self._manual_actions.copy()
+            rl_agent = self.rl_agent
+            if self.agent_enabled and rl_agent and active.any():
+                actions[active] = rl_agent.predict_array(fleet.observations[active])
+
+            step_rewards, _ = fleet.step(actions[:, 0], actions[:, 1])
+            if self.step_log:
+                self.step_log.record_arrays(
+                    fleet.state,
+                    actions[:, 0],
+                    actions[:, 1],
+                    step_rewards,
+                    active,
+                    ~fleet.active,
+                )
+            rewards[active] = step_rewards[active]
+            self.rocket_steps[active] += 1
+            self.prev_action_taken = actions
+            self.sim_time += self.dt
+            steps_done += 1
+            if not fleet.active.any():
+                break
+
+        self._steps_this_frame = steps_done
+        if not steps_done:
+            return None
+        with self._action_lock:
+            self._manual_actions[:] = 0.0
+        return fleet.state.copy(), rewards, ~fleet.active
+
+    def _compute_loop(self):
+        """Compute thread: runs scheduled frames and queues them for publishing."""
         self._log("info", "Simulation loop starting.")
+        self.scheduler.reset()
         while self._running:
             if self.paused:
-                await asyncio.sleep(0.1)
+                self._resume.wait(0.1)
+                self.scheduler.reset()
                 continue
-            loop_start_time = asyncio.get_event_loop().time()
             try:
-                current_sim_states = self.render()
-                indices_to_predict = []
-                states_to_predict: List[Dict] = []
-
-                actions_for_this_step = [
-                    self.current_actions[i] for i in range(self.num_rockets)
-                ]
-
-                if self.agent_enabled and self.rl_agent:
-                    for i in range(self.num_rockets):
-                        if (
-                            i in self.agent_controlled_indices
-                            and not self.rocket_touchdown_status[i]
-                        ):
-                            indices_to_predict.append(i)
-                            states_to_predict.append(current_sim_states[i])
-
-                if states_to_predict and self.rl_agent:
-                    predicted_actions = self.rl_agent.predict_batch(states_to_predict)
-                    for idx, action in zip(indices_to_predict, predicted_actions):
-                        actions_for_this_step[idx] = action
-
-                states, rewards, dones = self.step(actions_for_this_step)
-
-                if self.state_callback:
-                    self.state_callback(states, rewards, dones)
-
-                self.current_actions = [
-                    {"throttle": 0.0, "coldGas": 0.0} for _ in range(self.num_rockets)
-                ]
-
-                if all(dones):
-                    self._flush_logs()
-                    self._running = False
-                    break
-
-                loop_end_time = asyncio.get_event_loop().time()
-                elapsed_time = loop_end_time - loop_start_time
-                sleep_duration = max(0, self.dt - elapsed_time)
-                await asyncio.sleep(sleep_duration)
+                with self._frame_lock:
+                    if not self._running:
+                        break
+                    frame_start = time.perf_counter()
+                    update = self.run_frame(self.scheduler.begin_frame())
+                    self.compute_time = time.perf_counter() - frame_start
+                    actions = self.prev_action_taken
+                    sim_time = self.sim_time
+
+                sleep_duration = self.scheduler.end_frame(self._steps_this_frame)
+                self._report_overruns()
+
+                if update:
+                    self._publish((*update, actions, sim_time))
+                    if np.all(update[2]):
+                        self._running = False
+                        break
+
+                if sleep_duration:
+                    self._wake.wait(sleep_duration)
             except Exception as e:
                 self._log("exception", f"Error in simulation loop: {e}")
                 self._running = False
                 break
+        self._report_overruns(final=True)
         self._log("info", "Simulation loop finished.")
 
+    def _publish(self, update: Tuple):
+        """Hands a frame to the IOLoop, waiting while the pipeline is full."""
+        while self._running:
+            try:
+                self._updates.put(update, timeout=0.1)
+                break
+            except queue.Full:
+                # IOLoop is behind on sending; compute waits instead of piling up
+                self.stalls += 1
+        self.max_queued_frames = max(self.max_queued_frames, self._updates.qsize())
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._drain_updates)
+
+    def _drain_updates(self):
+        """IOLoop side: delivers queued frames to state_callback in order."""
+        while True:
+            try:
+                states, rewards, dones, actions, sim_time = self._updates.get_nowait()
+            except queue.Empty:
+                return
+            self.frames_published += 1
+            self.published_actions = actions
+            self.published_sim_time = sim_time
+            if self.state_callback:
+                self.state_callback(states, rewards, dones)
+            if np.all(dones):
+                self._flush_logs()
+
+    def _discard_updates(self):
+        while True:
+            try:
+                self._updates.get_nowait()
+            except queue.Empty:
+                return
+
+    @property
+    def pipeline_stats(self) -> Dict[str, Any]:
+        """Compute/publish queue metrics; a growing `stalls` count or
+        `queued_frames` at `pipeline_depth` means sending is the bottleneck,
+        scheduler overruns mean compute is."""
+        return {
+            "queued_frames": self._updates.qsize(),
+            "max_queued_frames": self.max_queued_frames,
+            "pipeline_depth": self._updates.maxsize,
+            "stalls": self.stalls,
+            "frames_published": self.frames_published,
+            "compute_ms": round(self.compute_time * 1000.0, 3),
+            **self.scheduler.stats,
+        }
+
+    def _report_overruns(self, final: bool = False):
+        """
+        Warns once when frames start overrunning and logs a summary when
+        the streak ends (or the loop stops), instead of once per overrun
+        frame, which under sustained overload would be every frame.
+        """
+        scheduler = self.scheduler
+        if scheduler.overruns > self._reported_overruns:
+            if self._overrun_start is None:
+                self._overrun_start = (self._reported_overruns, self._reported_dropped)
+                self._log(
+                    "warning",
+                    f"Simulation falling behind: frames need more than "
+                    f"{scheduler.max_steps_per_frame} steps, sim time is being dropped. "
+                    f"Stats: {self.pipeline_stats}",
+                )
+            self._reported_overruns = scheduler.overruns
+            self._reported_dropped = scheduler.dropped_time
+            self._last_overrun_frame = scheduler.frames
+        if self._overrun_start is not None and (
+            final or scheduler.frames - self._last_overrun_frame >= self._overrun_quiet_frames
+        ):
+            overruns, dropped = self._overrun_start
+            self._overrun_start = None
+            self._log(
+                "warning",
+                f"Simulation overrun streak ended: {scheduler.overruns - overruns} overrun "
+                f"frames, {scheduler.dropped_time - dropped:.2f}s of sim time dropped.",
+            )
+
     def step(
         self, actions: List[Dict[str, float]]
     ) -> Tuple[List[Any], List[Any], List[bool]]:
@@ -245,7 +579,9 @@ class SimulationController:
                 self.rocket_touchdown_status[i] = sim_done
                 self.rocket_steps[i] += 1
 
-                if self.log_state or self.log_action or self.log_reward:
+                if self.step_log is None and (
+                    self.log_state or self.log_action or self.log_reward
+                ):
                     log_entry = {
                         "step": self.rocket_steps[i],
                         "rocket_index": i,
@@ -254,18 +590,21 @@ class SimulationController:
                         "reward": f"{reward:.4f}" if self.log_reward else "omitted",
                         "done": sim_done,
                     }
-                    self.log_buffer.append(
-                        ("debug", f"StepLog: {json.dumps(log_entry)}")
-                    )
+                    # Encoded and written on the log writer thread
+                    if self.log_writer:
+                        self.log_writer.submit_step(self.logger.name, log_entry)
 
                 all_states.append(state)
                 all_rewards.append(reward)
                 all_dones.append(sim_done)
 
-            if len(self.log_buffer) >= self.BUFFER_SIZE:
-                self._flush_logs()
+            if self.step_log:
+                self.step_log.record_dicts(
+                    all_states, actual_actions_taken_this_step, all_rewards, all_dones
+                )
 
             self.prev_action_taken = actual_actions_taken_this_step
+            self.sim_time += self.dt
             return all_states, all_rewards, all_dones
 
         except Exception as e:
@@ -273,4 +612,15 @@ class SimulationController:
             raise
 
     def render(self) -> List[Dict]:
+        """
+        Current rocket states. Safe to call from the IOLoop while the compute
+        thread runs: waits for the frame in progress so states never mix
+        ticks or read the shared block mid-step.
+        """
+        with self._frame_lock:
+            return self._render()
+
+    def _render(self) -> List[Dict]:
+        if self.fleet:
+            return self.fleet.engine.get_states()
         return [rc.rocket.get_state() for rc in self.rockets]
@@ -0,0 +1,113 @@
+import sys
+import time
+from typing import Callable, Dict
+
+
+class FixedStepScheduler:
+    """
+    Fixed-timestep frame scheduler for the simulation loop.
+
+    Physics always advances in whole `dt` steps; frames (one published
+    telemetry update each) run at `display_rate`. Each frame converts the
+    elapsed wall time, scaled by `time_scale`, into due physics steps via an
+    accumulator. At most `max_steps_per_frame` steps run per frame: any
+    backlog beyond that is dropped and counted as an overrun, so a slow
+    frame slows the simulation down instead of stalling the loop in a
+    catch-up spiral.
+
+    In `max_speed` mode the wall clock is ignored: a frame runs as many steps
+    as fit in one frame interval, then publishes and yields, so frames keep
+    publishing at `display_rate`. `max_steps_per_frame` does not apply.
+    """
+
+    def __init__(
+        self,
+        dt: float,
+        display_rate: float,
+        max_steps_per_frame: int,
+        time_scale: float = 1.0,
+        max_speed: bool = False,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        if dt <= 0 or display_rate <= 0:
+            raise ValueError("dt and display_rate must be positive.")
+        if max_steps_per_frame < 1:
+            raise ValueError("max_steps_per_frame must be at least 1.")
+        self.dt = dt
+        self.frame_interval = 1.0 / display_rate
+        self.max_steps_per_frame = max_steps_per_frame
+        self.time_scale = time_scale
+        self.max_speed = max_speed
+        self.clock = clock
+
+        self.frames = 0
+        self.steps = 0
+        self.overruns = 0
+        self.late_frames = 0
+        self.dropped_time = 0.0
+        self.reset()
+
+    @property
+    def max_time_scale(self) -> float:
+        """Fastest time warp that runs without overruns: max_steps_per_frame steps per frame."""
+        return self.max_steps_per_frame * self.dt / self.frame_interval
+
+    def reset(self):
+        """Restarts timing, e.g. after a pause, without counting the gap."""
+        self.accumulator = 0.0
+        self.frame_start = self.clock()
+        self._last = self.frame_start
+
+    def begin_frame(self) -> int:
+        """
+        Starts a frame and returns the number of physics steps due. In
+        max-speed mode this is unbounded; `step_allowed` stops the frame at
+        its deadline.
+        """
+        now = self.clock()
+        elapsed = now - self._last
+        self._last = now
+        self.frame_start = now
+        self.frames += 1
+
+        if self.max_speed:
+            return sys.maxsize
+
+        self.accumulator += elapsed * self.time_scale
+        # Small epsilon so float error doesn't lose a step at exact multiples
+        due = int((self.accumulator + 1e-9) // self.dt)
+        if due > self.max_steps_per_frame:
+            self.overruns += 1
+            self.dropped_time += (due - self.max_steps_per_frame) * self.dt
+            due = self.max_steps_per_frame
+            self.accumulator = 0.0
+        else:
+            self.accumulator = max(0.0, self.accumulator - due * self.dt)
+        return due
+
+    def step_allowed(self, steps_done: int, steps_due: int) -> bool:
+        if steps_done >= steps_due:
+            return False
+        if self.max_speed and steps_done > 0:
+            return self.clock() - self.frame_start < self.frame_interval
+        return True
+
+    def end_frame(self, steps_done: int) -> float:
+        """Records the frame and returns how long to sleep before the next one."""
+        self.steps += steps_done
+        if self.max_speed:
+            return 0.0
+        busy = self.clock() - self.frame_start
+        if busy > self.frame_interval:
+            self.late_frames += 1
+        return max(0.0, self.frame_interval - busy)
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        return {
+            "frames": self.frames,
+            "steps": self.steps,
+            "overruns": self.overruns,
+            "late_frames": self.late_frames,
+            "dropped_time": self.dropped_time,
+        }
@@ -0,0 +1,244 @@
+import os
+import numpy as np
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from threading import BrokenBarrierError
+from typing import Optional, Tuple
+
+from backend.physics.batch import BatchPhysicsEngine, PREVIOUS_FIELDS, STATE_FIELDS
+from backend.simulation.config import get_initial_state_batch
+
+# Row layout of the shared block: the engine's state block followed by the
+# per-tick inputs written by the coordinator and outputs written by workers.
+ENGINE_ROWS = len(STATE_FIELDS) + len(PREVIOUS_FIELDS)
+THROTTLE_ROW = ENGINE_ROWS
+COLD_GAS_ROW = ENGINE_ROWS + 1
+REWARD_ROW = ENGINE_ROWS + 2
+ACTIVE_ROW = ENGINE_ROWS + 3
+TOTAL_ROWS = ENGINE_ROWS + 4
+
+CMD_STEP = 1
+CMD_STOP = 0
+
+
+def _shard_worker(shm_name, num_rockets, start, stop, barrier, command, timeout):
+    """
+    Worker process: steps rockets [start, stop) of the shared block in place,
+    one tick per pair of barrier waits.
+    """
+    # Deferred: reward pulls in the config snapshot, which must be parsed in
+    # this (spawned) process rather than inherited.
+    from backend.rl.reward import calculate_reward_batch
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        block = np.ndarray((TOTAL_ROWS, num_rockets), dtype=np.float64, buffer=shm.buf)
+        shard = block[:, start:stop]
+        engine = BatchPhysicsEngine(stop - start, data=shard[:ENGINE_ROWS])
+        actions = np.empty((stop - start, 2), dtype=np.float64)
+
+        while True:
+            barrier.wait(timeout)  # tick start: inputs are ready
+            if command.value == CMD_STOP:
+                break
+
+            active = shard[ACTIVE_ROW] > 0.5
+            actions[:, 0] = shard[THROTTLE_ROW]
+            actions[:, 1] = shard[COLD_GAS_ROW]
+            state_before = engine.state.copy()
+
+            engine.step(actions[:, 0], actions[:, 1], active)
+            rewards, terminated, _ = calculate_reward_batch(
+                state_before, actions, engine.state
+            )
+
+            shard[REWARD_ROW] = np.where(active, rewards, 0.0)
+            shard[ACTIVE_ROW][active & terminated] = 0.0
+
+            barrier.wait(timeout)  # tick end: outputs are written
+    except BrokenBarrierError:
+        pass
+    finally:
+        del block, shard, engine
+        shm.close()
+
+
+class ShardedFleet:
+    """
+    Fleet simulation split across worker processes.
+
+    All state lives in one `multiprocessing.shared_memory` block laid out as
+    rows of N float64 values: the BatchPhysicsEngine state block, then
+    throttle, cold gas, last reward and an active flag. Each worker owns a
+    contiguous column range and steps it in place; a barrier before and after
+    every tick hands control back and forth, so between `step` calls the
+    coordinator can read and write the whole block without copies.
+
+    Workers are spawned (not forked) since the coordinator usually runs
+    inside a threaded server process.
+    """
+
+    def __init__(
+        self,
+        num_rockets: int,
+        num_workers: Optional[int] = None,
+        seed: Optional[int] = None,
+        timeout: float = 30.0,
+    ):
+        if num_rockets < 1:
+            raise ValueError("num_rockets must be at least 1.")
+        num_workers = num_workers or os.cpu_count() or 1
+        num_workers = max(1, min(num_workers, num_rockets))
+
+        self.num_rockets = num_rockets
+        self.num_workers = num_workers
+        self.timeout = timeout
+        self.rng = np.random.default_rng(seed)
+        self._closed = False
+
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=TOTAL_ROWS * num_rockets * 8
+        )
+        self.block = np.ndarray(
+            (TOTAL_ROWS, num_rockets), dtype=np.float64, buffer=self._shm.buf
+        )
+        self.block[:] = 0.0
+
+        # Coordinator-side view for resets and readback; never stepped here
+        self.engine = BatchPhysicsEngine(num_rockets, data=self.block[:ENGINE_ROWS])
+        self.throttle = self.block[THROTTLE_ROW]
+        self.cold_gas = self.block[COLD_GAS_ROW]
+        self.rewards = self.block[REWARD_ROW]
+        self._active = self.block[ACTIVE_ROW]
+
+        ctx = mp.get_context("spawn")
+        self._command = ctx.Value("i", CMD_STEP, lock=False)
+        self._barrier = ctx.Barrier(num_workers + 1)
+        bounds = np.linspace(0, num_rockets, num_workers + 1).astype(int)
+        self.bounds = list(zip(bounds[:-1], bounds[1:]))
+        self.workers = [
+            ctx.Process(
+                target=_shard_worker,
+                args=(
+                    self._shm.name,
+                    num_rockets,
+                    int(start),
+                    int(stop),
+                    self._barrier,
+                    self._command,
+                    timeout,
+                ),
+                name=f"fleet-shard-{i}",
+                daemon=True,
+            )
+            for i, (start, stop) in enumerate(self.bounds)
+        ]
+        try:
+            for worker in self.workers:
+                worker.start()
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def dt(self) -> float:
+        return self.engine.dt
+
+    @property
+    def state(self) -> np.ndarray:
+        """(len(STATE_FIELDS), N) zero-copy view of the fleet state."""
+        return self.engine.state
+
+    @property
+    def observations(self) -> np.ndarray:
+        """(N, 8) zero-copy view in RocketLandingEnv observation order."""
+        return self.engine.state[:8].T
+
+    @property
+    def active(self) -> np.ndarray:
+        """(N,) bool mask of rockets still flying."""
+        return self._active > 0.5
+
+    def reset(self):
+        """Samples new initial states for the whole fleet."""
+        self._check_open()
+        self.engine.load_state_arrays(
+            get_initial_state_batch(self.num_rockets, self.rng)
+        )
+        self.throttle[:] = 0.0
+        self.cold_gas[:] = 0.0
+        self.rewards[:] = 0.0
+        self._active[:] = 1.0
+
+    def step(
+        self, throttle: np.ndarray, cold_gas: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Advances every active rocket by one tick across all workers.
+
+        Returns:
+            (rewards, terminated): zero-copy (N,) view of this tick's rewards
+            (0 for inactive rockets) and a bool mask of rockets that finished
+            on this tick.
+        """
+        self._check_open()
+        self.throttle[:] = throttle
+        self.cold_gas[:] = cold_gas
+        was_active = self.active
+
+        self._wait()  # release workers
+        self._wait()  # workers done
+
+        return self.rewards, was_active & ~self.active
+
+    def _wait(self):
+        try:
+            self._barrier.wait(self.timeout)
+        except BrokenBarrierError:
+            dead = [w.name for w in self.workers if not w.is_alive()]
+            self.close()
+            raise RuntimeError(f"Fleet shard workers stopped responding (dead: {dead}).")
+
+    def _check_open(self):
+        if self._closed:
+            raise RuntimeError("ShardedFleet is closed.")
+        # Fail fast instead of waiting out the barrier timeout
+        dead = [w.name for w in self.workers if not w.is_alive()]
+        if dead:
+            self.close()
+            raise RuntimeError(f"Fleet shard workers died: {dead}.")
+
+    def close(self):
+        """Stops the workers and releases the shared memory block."""
+        if self._closed:
+            return
+        self._closed = True
+        self._command.value = CMD_STOP
+        try:
+            self._barrier.wait(1.0)
+        except BrokenBarrierError:
+            pass
+        for worker in self.workers:
+            if worker.pid is None:
+                continue  # never started
+            worker.join(timeout=2.0)
+            if worker.is_alive():
+                worker.terminate()
+
+        # Drop views into the buffer before closing it
+        del self.engine, self.throttle, self.cold_gas, self.rewards, self._active
+        self.block = None
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -0,0 +1,252 @@
+import json
+import os
+import struct
+import time
+import numpy as np
+from itertools import chain
+from operator import itemgetter
+from typing import Dict, Optional, Sequence
+
+from backend.protocol import STATE_FIELDS
+
+_VALUE_FIELDS = [(name, "<f4") for name in STATE_FIELDS] + [
+    ("throttle", "<f4"),
+    ("coldGas", "<f4"),
+    ("reward", "<f4"),
+]
+
+# One 68-byte record per rocket per tick. rocket_index is 32-bit so sharded
+# fleets beyond 65,535 rockets keep distinct indices; `_pad` keeps the float
+# columns 4-byte aligned.
+STEP_DTYPE = np.dtype(
+    [
+        ("step", "<u4"),
+        ("rocket_index", "<u4"),
+        ("active", "u1"),
+        ("done", "u1"),
+        ("_pad", "<u2"),
+    ]
+    + _VALUE_FIELDS
+)
+
+# Version 1 records (16-bit rocket_index), still readable
+_STEP_DTYPE_V1 = np.dtype(
+    [("step", "<u4"), ("rocket_index", "<u2"), ("active", "u1"), ("done", "u1")]
+    + _VALUE_FIELDS
+)
+_DTYPES = {1: _STEP_DTYPE_V1, 2: STEP_DTYPE}
+
+STEP_LOG_SUFFIX = ".steps"
+MAGIC = b"RLSTEPS1"
+FORMAT_VERSION = 2
+# Records start at a multiple of this offset so memory maps stay aligned
+HEADER_ALIGN = 64
+_PREAMBLE = struct.Struct("<8sI")
+
+_state_getter = itemgetter(*STATE_FIELDS)
+
+
+class StepLogWriter:
+    """
+    Appends simulation steps to a columnar binary step log.
+
+    File layout: an 8-byte magic, a u32 header length and a JSON header
+    (dtype, num_rockets, dt, ...), space-padded to a 64-byte boundary, then
+    one STEP_DTYPE record for every rocket on every tick, tick-major. A
+    rocket that has finished repeats its last record with `active` = 0, so
+    tick t of rocket i is always record t * num_rockets + i, and every field
+    reshapes to a (ticks, rockets) array.
+
+    Ticks are buffered in a preallocated chunk and appended with one write
+    when it fills or on `flush`. A partial trailing tick (a crash mid-write)
+    is ignored by the reader.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        num_rockets: int,
+        dt: float,
+        chunk_ticks: int = 256,
+        metadata: Optional[Dict] = None,
+    ):
+        if num_rockets < 1 or chunk_ticks < 1:
+            raise ValueError("num_rockets and chunk_ticks must be at least 1.")
+        self.path = path
+        self.num_rockets = num_rockets
+        self.chunk = np.zeros((chunk_ticks, num_rockets), dtype=STEP_DTYPE)
+        self.chunk["rocket_index"] = np.arange(num_rockets)
+        self._last = np.zeros(num_rockets, dtype=STEP_DTYPE)
+        self._last["rocket_index"] = np.arange(num_rockets)
+        self._fill = 0
+        self.ticks = 0
+
+        header = {
+            "version": FORMAT_VERSION,
+            "dtype": STEP_DTYPE.descr,
+            "num_rockets": num_rockets,
+            "dt": dt,
+            "created": time.time(),
+            **(metadata or {}),
+        }
+        encoded = json.dumps(header).encode("utf-8")
+        size = _PREAMBLE.size + len(encoded)
+        padding = -size % HEADER_ALIGN
+        # "xb": an existing log is never truncated by a second writer
+        self._file = open(path, "xb")
+        self._file.write(_PREAMBLE.pack(MAGIC, len(encoded) + padding))
+        self._file.write(encoded + b" " * padding)
+        self._file.flush()
+
+    def record_arrays(
+        self,
+        states: np.ndarray,
+        throttle: np.ndarray,
+        cold_gas: np.ndarray,
+        rewards: np.ndarray,
+        active: np.ndarray,
+        done: np.ndarray,
+    ):
+        """
+        Records one tick from arrays: `states` is (len(STATE_FIELDS), N) in
+        STATE_FIELDS order, the rest are (N,). Rows of inactive rockets keep
+        their previous values.
+        """
+        active = np.asarray(active, dtype=bool)
+        row = self._last
+        row["active"] = active
+        row["done"] = done
+        if active.all():
+            for k, name in enumerate(STATE_FIELDS):
+                row[name] = states[k]
+            row["throttle"] = throttle
+            row["coldGas"] = cold_gas
+            row["reward"] = rewards
+            row["step"] += 1
+        elif active.any():
+            for k, name in enumerate(STATE_FIELDS):
+                row[name][active] = states[k][active]
+            row["throttle"][active] = throttle[active]
+            row["coldGas"][active] = cold_gas[active]
+            row["reward"][active] = rewards[active]
+            row["step"][active] += 1
+        self._append(row)
+
+    def record_dicts(
+        self,
+        states: Sequence[Optional[Dict]],
+        actions: Sequence[Dict[str, float]],
+        rewards: Sequence[Optional[float]],
+        dones: Sequence[bool],
+    ):
+        """Records one tick of SimulationController.step output; None marks a finished rocket."""
+        active = np.fromiter((s is not None for s in states), dtype=bool, count=len(states))
+        live = [s for s in states if s is not None]
+        values = np.zeros((len(STATE_FIELDS), self.num_rockets))
+        if live:
+            values[:, active] = np.fromiter(
+                chain.from_iterable(map(_state_getter, live)),
+                dtype=np.float64,
+                count=len(live) * len(STATE_FIELDS),
+            ).reshape(len(live), len(STATE_FIELDS)).T
+        self.record_arrays(
+            values,
+            np.array([a.get("throttle", 0.0) for a in actions]),
+            np.array([a.get("coldGas", 0.0) for a in actions]),
+            np.array([0.0 if r is None else r for r in rewards]),
+            active,
+            np.asarray(dones, dtype=bool),
+        )
+
+    def _append(self, row: np.ndarray):
+        self.chunk[self._fill] = row
+        self._fill += 1
+        self.ticks += 1
+        if self._fill == len(self.chunk):
+            self.flush()
+
+    def flush(self):
+        if self._fill and not self._file.closed:
+            self._file.write(memoryview(self.chunk[: self._fill]).cast("B"))
+            self._file.flush()
+            self._fill = 0
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+def read_header(path: str) -> Dict:
+    with open(path, "rb") as f:
+        magic, length = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a step log.")
+        header = json.loads(f.read(length).decode("utf-8"))
+    if header.get("version") not in _DTYPES:
+        raise ValueError(f"Unsupported step log version {header.get('version')}.")
+    header["data_offset"] = _PREAMBLE.size + length
+    return header
+
+
+class StepLog:
+    """
+    Memory-mapped reader for StepLogWriter files.
+
+    Nothing is parsed or copied on open. `records` is a (ticks, rockets)
+    structured view of the file, `field(name)` a (ticks, rockets) view of
+    one column and `rocket(i)` the (ticks,) record series of one rocket;
+    use `rocket_active(i)` to drop the frozen ticks after it finished.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.header = read_header(path)
+        self.num_rockets = self.header["num_rockets"]
+        self.dt = self.header["dt"]
+        dtype = np.dtype([tuple(field) for field in self.header["dtype"]])
+        if dtype != _DTYPES[self.header["version"]]:
+            raise ValueError(f"Unexpected step log record layout in {path}.")
+
+        offset = self.header["data_offset"]
+        tick_bytes = dtype.itemsize * self.num_rockets
+        self.num_ticks = (os.path.getsize(path) - offset) // tick_bytes
+        if self.num_ticks:
+            self.records = np.memmap(
+                path,
+                dtype=dtype,
+                mode="r",
+                offset=offset,
+                shape=(self.num_ticks, self.num_rockets),
+            )
+        else:
+            self.records = np.zeros((0, self.num_rockets), dtype=dtype)
+
+    @property
+    def fields(self):
+        return tuple(name for name in self.records.dtype.names if not name.startswith("_"))
+
+    def field(self, name: str) -> np.ndarray:
+        return self.records[name]
+
+    def rocket(self, index: int) -> np.ndarray:
+        return self.records[:, index]
+
+    def rocket_active(self, index: int) -> np.ndarray:
+        """Records of rocket `index` up to and including the tick it finished."""
+        series = self.records[:, index]
+        return series[: int(np.count_nonzero(series["active"]))]
+
+    def close(self):
+        # The map is released once no views of it remain
+        self.records = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_step_log(path: str) -> StepLog:
+    return StepLog(path)
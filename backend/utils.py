@@ -1,20 +1,23 @@
-def evaluate_landing(state, config):
+import numpy as np
+
+
+def evaluate_landing(state, thresholds):
+    """Grades a touchdown state against LandingThresholds (e.g. `snapshot.landing`)."""
     vx = state.get("vx", float("inf"))
     vy = state.get("vy", float("inf"))
     angle_deg = state.get("angle", float("inf"))
 
-    # Strict config retrieval - will raise error if missing
-    safe_vx = config.get("landing.thresholds.perfect.speed_vx")
-    safe_vy = config.get("landing.thresholds.perfect.speed_vy")
-    safe_angle = config.get("landing.thresholds.perfect.angle")
+    safe_vx = thresholds.perfect.speed_vx
+    safe_vy = thresholds.perfect.speed_vy
+    safe_angle = thresholds.perfect.angle
 
-    good_vx = config.get("landing.thresholds.good.speed_vx")
-    good_vy = config.get("landing.thresholds.good.speed_vy")
-    good_angle = config.get("landing.thresholds.good.angle")
+    good_vx = thresholds.good.speed_vx
+    good_vy = thresholds.good.speed_vy
+    good_angle = thresholds.good.angle
 
-    ok_vx = config.get("landing.thresholds.ok.speed_vx")
-    ok_vy = config.get("landing.thresholds.ok.speed_vy")
-    ok_angle = config.get("landing.thresholds.ok.angle")
+    ok_vx = thresholds.ok.speed_vx
+    ok_vy = thresholds.ok.speed_vy
+    ok_angle = thresholds.ok.angle
 
     is_perfect = abs(vx) < safe_vx and abs(vy) < safe_vy and abs(angle_deg) < safe_angle
     is_good = abs(vx) < good_vx and abs(vy) < good_vy and abs(angle_deg) < good_angle
@@ -35,3 +38,40 @@ def evaluate_landing(state, config):
         "angle": angle_deg,
         "landing_message": landing_message,
     }
+
+
+# Index into this tuple is the landing code returned by evaluate_landing_batch
+LANDING_MESSAGES = ("safe", "good", "ok", "unsafe")
+
+
+def get_landing_thresholds(landing):
+    """
+    LandingThresholds (e.g. `snapshot.landing`) as a (3, 3) array: rows
+    perfect/good/ok, columns speed_vx/speed_vy/angle.
+    """
+    return np.array(
+        [
+            [grade.speed_vx, grade.speed_vy, grade.angle]
+            for grade in (landing.perfect, landing.good, landing.ok)
+        ],
+        dtype=np.float64,
+    )
+
+
+def evaluate_landing_batch(vx, vy, angle_deg, thresholds):
+    """
+    Vectorized evaluate_landing. Takes (N,) arrays and the output of
+    get_landing_thresholds, returns (N,) landing codes indexing LANDING_MESSAGES.
+    """
+    abs_vx = np.abs(vx)[:, None]
+    abs_vy = np.abs(vy)[:, None]
+    abs_angle = np.abs(angle_deg)[:, None]
+
+    # (N, 3): within perfect / good / ok limits
+    within = (
+        (abs_vx < thresholds[:, 0])
+        & (abs_vy < thresholds[:, 1])
+        & (abs_angle < thresholds[:, 2])
+    )
+    # First grade met wins; rows meeting none fall through to "unsafe"
+    return np.where(within.any(axis=1), within.argmax(axis=1), len(thresholds))
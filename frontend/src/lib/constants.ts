@@ -1,6 +1,10 @@
+// `?room=<name>` in the page URL joins a shared simulation room
+const ROOM = new URLSearchParams(window.location.search).get("room");
+
 export const WS_URL =
-  import.meta.env.VITE_WS_URL ||
-  `${window.location.protocol === "https:" ? "wss:" : "ws:"}//${window.location.hostname}:9000/ws`;
+  (import.meta.env.VITE_WS_URL ||
+    `${window.location.protocol === "https:" ? "wss:" : "ws:"}//${window.location.hostname}:9000/ws`) +
+  (ROOM ? `?room=${encodeURIComponent(ROOM)}` : "");
 
 export const API_URL = "/api";
 
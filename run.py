@@ -2,9 +2,10 @@ import asyncio
 import signal
 import sys
 from backend import make_app
-from backend.config import Config
+from backend.config import Config, add_reload_listener, reload_if_changed
 from backend.settings import settings
-from backend.logger import Logger
+from backend.logger import Logger, drain_log_writers
+from backend.rl.registry import get_model_registry
 
 config = Config()
 
@@ -21,12 +22,32 @@ async def watch_stdin(shutdown_event: asyncio.Event, logger):
             break
 
 
+async def watch_config(shutdown_event: asyncio.Event, logger, interval: float):
+    """Polls config.yaml's mtime and reloads the shared config snapshot on change."""
+
+    def on_reload(snapshot):
+        logger.info(
+            f"config.yaml changed, reloaded (mtime {snapshot.mtime:.0f}). "
+            "New simulations will use the updated values."
+        )
+
+    add_reload_listener(on_reload)
+    while not shutdown_event.is_set():
+        await asyncio.sleep(interval)
+        reload_if_changed()
+
+
 async def main():
     logger_instance = Logger(file_name="app.log")
     logger = logger_instance.get_logger()
 
     app = make_app(settings, logger)
 
+    preload_versions = config.get("model.preload")
+    if preload_versions:
+        logger.info(f"Preloading models in the background: {preload_versions}")
+        get_model_registry().preload_async(preload_versions)
+
     port = config.get("app.PORT") or 8080
     server = app.listen(port)
     logger.info(f"Application started on http://localhost:{port}")
@@ -38,6 +59,9 @@ async def main():
         loop.add_signal_handler(sig, shutdown_event.set)
 
     input_task = asyncio.create_task(watch_stdin(shutdown_event, logger))
+    config_task = asyncio.create_task(
+        watch_config(shutdown_event, logger, config.get("app.config_reload_interval"))
+    )
 
     await shutdown_event.wait()
 
@@ -45,9 +69,11 @@ async def main():
 
     server.stop()
     input_task.cancel()
+    config_task.cancel()
 
     # Allow a brief moment for final IO/Logging flushes
     await asyncio.sleep(0.5)
+    drain_log_writers()
 
     logger.info("Shutdown complete.")
     sys.exit(0)
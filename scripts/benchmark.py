@@ -0,0 +1,387 @@
+import os
+import sys
+import gc
+import json
+import time
+import platform
+import argparse
+import subprocess
+import tracemalloc
+import numpy as np
+from typing import Callable, Dict, List, Optional
+
+from backend.config import Config
+
+config_loader = Config()
+MODEL_DIR = config_loader.get("paths.models_dir")
+
+BASELINE_PATH = "benchmarks/baseline.json"
+OUTPUT_DIR = "output/benchmarks"
+RESULTS_VERSION = 1
+
+SUITES = ("physics", "vec_env", "agent", "protocol", "memory")
+
+
+def metric(value: float, unit: str, higher_is_better: bool) -> Dict:
+    return {"value": float(value), "unit": unit, "higher_is_better": higher_is_better}
+
+
+def measure_rate(fn: Callable[[], None], min_time: float, batch: int = 100) -> float:
+    """Calls `fn` in batches of `batch` until `min_time` has passed; returns calls/s."""
+    fn()  # warm-up
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        for _ in range(batch):
+            fn()
+        calls += batch
+        elapsed = time.perf_counter() - start
+    return calls / elapsed
+
+
+def measure_latency(fn: Callable[[], None], min_time: float, min_runs: int = 5) -> float:
+    """Median seconds per call over at least `min_runs` calls and `min_time` seconds."""
+    fn()  # warm-up
+    samples = []
+    start = time.perf_counter()
+    while len(samples) < min_runs or time.perf_counter() - start < min_time:
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return float(np.median(samples))
+
+
+def bench_physics(args) -> Dict[str, Dict]:
+    from backend.envs import RocketLandingEnv
+    from backend.rocket import Rocket, RocketControls
+
+    rocket = Rocket()
+
+    def rocket_step():
+        rocket.apply_action(0.6, 0.1)
+
+    controls = RocketControls()
+
+    def controls_step():
+        _, _, done = controls.step({"throttle": 0.6, "coldGas": 0.1})
+        if done:
+            controls.reset()
+
+    env = RocketLandingEnv()
+    env.reset(seed=0)
+    action = np.array([0.6, 0.1], dtype=np.float32)
+
+    def env_step():
+        _, _, terminated, truncated, _ = env.step(action)
+        if terminated or truncated:
+            env.reset()
+
+    return {
+        "physics.rocket_apply_action": metric(
+            measure_rate(rocket_step, args.min_time), "steps/s", True
+        ),
+        "physics.rocket_controls_step": metric(
+            measure_rate(controls_step, args.min_time), "steps/s", True
+        ),
+        "physics.env_step": metric(measure_rate(env_step, args.min_time), "steps/s", True),
+    }
+
+
+def bench_vec_env(args) -> Dict[str, Dict]:
+    from backend.envs.autotune import make_training_vec_env
+
+    results = {}
+    for kind in ("dummy", "subproc", "native"):
+        for n_envs in args.n_envs:
+            vec_env = make_training_vec_env(kind, n_envs, seed=0)
+            try:
+                vec_env.reset()
+                actions = np.tile(np.array([0.6, 0.1], dtype=np.float32), (n_envs, 1))
+
+                def step():
+                    vec_env.step(actions)
+
+                rate = measure_rate(step, args.min_time, batch=10)
+            finally:
+                vec_env.close()
+            results[f"vec_env.{kind}.n{n_envs}"] = metric(rate * n_envs, "env-steps/s", True)
+    return results
+
+
+def find_policy_dir() -> Optional[str]:
+    for version in sorted(os.listdir(MODEL_DIR), reverse=True):
+        version_dir = os.path.join(MODEL_DIR, version)
+        if os.path.isfile(os.path.join(version_dir, "best_model.zip")):
+            return version_dir
+    return None
+
+
+def bench_agent(args) -> Dict[str, Dict]:
+    from backend.rl import RLAgent
+    from backend.rocket import RocketControls
+
+    version_dir = find_policy_dir()
+    if version_dir is None:
+        print(f"[WARNING] No model in '{MODEL_DIR}', skipping agent benchmarks")
+        return {}
+
+    agents = {
+        "sb3": RLAgent(
+            os.path.join(version_dir, "best_model.zip"),
+            os.path.join(version_dir, "vecnormalize.pkl"),
+        )
+    }
+    policy_path = os.path.join(version_dir, "policy.npz")
+    if os.path.isfile(policy_path):
+        agents["numpy"] = RLAgent(policy_path=policy_path)
+
+    state = RocketControls().rocket.get_state()
+    results = {}
+    for backend, agent in agents.items():
+        for batch_size in args.batch_sizes:
+            states = [state] * batch_size
+            latency = measure_latency(lambda: agent.predict_batch(states), args.min_time)
+            results[f"agent.{backend}.predict_batch.b{batch_size}"] = metric(
+                latency * 1e3, "ms/batch", False
+            )
+    return results
+
+
+def bench_protocol(args) -> Dict[str, Dict]:
+    from backend.protocol import BinaryProtocol, DeltaEncoder, FleetEncoder
+    from backend.rocket import RocketControls
+
+    n = args.fleet_size
+    state = RocketControls().rocket.get_state()
+    action = {"throttle": 0.6, "coldGas": 0.1}
+
+    def encode_dicts():
+        BinaryProtocol.encode_telemetry_header() + b"".join(
+            [BinaryProtocol.encode_rocket_state(state, 1.0, action, None) for _ in range(n)]
+        )
+
+    rng = np.random.default_rng(0)
+    states = rng.normal(size=(n, 11))
+    zeros = np.zeros(n)
+    active = np.ones(n, dtype=bool)
+    fleet = FleetEncoder(n)
+    delta = DeltaEncoder(n, keyframe_interval=1000)
+
+    def encode_fleet():
+        fleet.fill_arrays(states, zeros, zeros, zeros, zeros, active)
+        fleet.tobytes()
+
+    sim_time = [0.0]
+
+    def encode_delta():
+        states[:, 1] += 0.01
+        records = fleet.fill_arrays(states, zeros, zeros, zeros, zeros, active)
+        sim_time[0] += 0.1
+        delta.encode(records, sim_time[0])
+
+    results = {}
+    for name, fn in (
+        ("binary_dicts", encode_dicts),
+        ("fleet_arrays", encode_fleet),
+        ("delta_float16", encode_delta),
+    ):
+        latency = measure_latency(fn, args.min_time)
+        results[f"protocol.{name}.n{n}"] = metric(latency / n * 1e6, "us/rocket", False)
+    return results
+
+
+def peak_bytes_per_rocket(build: Callable[[int], object], num_rockets: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fleet = build(num_rockets)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del fleet
+    return peak / num_rockets
+
+
+def bench_memory(args) -> Dict[str, Dict]:
+    from backend.physics import BatchPhysicsEngine
+    from backend.rocket import RocketControls
+
+    def controls_fleet(n):
+        rockets = [RocketControls() for _ in range(n)]
+        for rocket in rockets:
+            rocket.step({"throttle": 0.6, "coldGas": 0.1})
+        return rockets
+
+    def batch_fleet(n):
+        engine = BatchPhysicsEngine(n)
+        engine.step(np.full(n, 0.6), np.full(n, 0.1))
+        return engine
+
+    n = args.fleet_size
+    return {
+        f"memory.rocket_controls.n{n}": metric(
+            peak_bytes_per_rocket(controls_fleet, n), "bytes/rocket", False
+        ),
+        f"memory.batch_engine.n{n}": metric(
+            peak_bytes_per_rocket(batch_fleet, n), "bytes/rocket", False
+        ),
+    }
+
+
+BENCHMARKS = {
+    "physics": bench_physics,
+    "vec_env": bench_vec_env,
+    "agent": bench_agent,
+    "protocol": bench_protocol,
+    "memory": bench_memory,
+}
+
+
+def environment_info() -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_benchmarks(args) -> Dict:
+    results = {}
+    for suite in args.suites:
+        print(f"Running {suite} benchmarks...")
+        results.update(BENCHMARKS[suite](args))
+    return {
+        "version": RESULTS_VERSION,
+        "environment": environment_info(),
+        "settings": {
+            "min_time": args.min_time,
+            "n_envs": args.n_envs,
+            "batch_sizes": args.batch_sizes,
+            "fleet_size": args.fleet_size,
+        },
+        "results": results,
+    }
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[Dict]:
+    """
+    Compares each metric with the baseline. A metric regresses when it is
+    worse than the baseline by more than `tolerance` (a fraction).
+    Metrics missing from either side are skipped.
+    """
+    rows = []
+    for name, current in results["results"].items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None or not reference["value"]:
+            continue
+        change = current["value"] / reference["value"] - 1.0
+        worse = -change if current["higher_is_better"] else change
+        rows.append(
+            {
+                "name": name,
+                "baseline": reference["value"],
+                "value": current["value"],
+                "unit": current["unit"],
+                "change": change,
+                "regression": worse > tolerance,
+            }
+        )
+    return rows
+
+
+def print_table(results: Dict, rows: Optional[List[Dict]] = None):
+    by_name = {row["name"]: row for row in rows or []}
+    for name, current in results["results"].items():
+        line = f"{name:<42} {current['value']:>14.3f} {current['unit']:<12}"
+        row = by_name.get(name)
+        if row:
+            flag = "  REGRESSION" if row["regression"] else ""
+            line += f" {row['change']:>+8.1%} vs {row['baseline']:.3f}{flag}"
+        print(line)
+
+
+def write_json(data: Dict, path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Throughput and latency benchmarks for the sim, env, agent and protocol layers."
+    )
+    parser.add_argument(
+        "suites", nargs="*", help=f"Suites to run: {', '.join(SUITES)} (default: all)"
+    )
+    parser.add_argument("--min-time", type=float, default=1.0, help="Seconds per measurement")
+    parser.add_argument("--n-envs", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 64, 256])
+    parser.add_argument("--fleet-size", type=int, default=1000)
+    parser.add_argument("--output", help=f"Results file (default: {OUTPUT_DIR}/<timestamp>.json)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="Allowed slowdown before failing (fraction)"
+    )
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Store these results as the new baseline"
+    )
+    args = parser.parse_args(argv)
+    args.suites = args.suites or list(SUITES)
+    unknown = sorted(set(args.suites) - set(SUITES))
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(unknown)}")
+
+    results = run_benchmarks(args)
+    output = args.output or os.path.join(
+        OUTPUT_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    write_json(results, output)
+    print(f"Results written to {output}")
+
+    if args.save_baseline:
+        write_json(results, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        print_table(results)
+        return 0
+
+    if not os.path.isfile(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        print_table(results)
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    recorded = baseline.get("environment", {})
+    if recorded.get("platform") != results["environment"]["platform"] or recorded.get(
+        "cpu_count"
+    ) != results["environment"]["cpu_count"]:
+        print(
+            f"[WARNING] Baseline was recorded on {recorded.get('platform')} "
+            f"with {recorded.get('cpu_count')} CPUs; numbers may not be comparable"
+        )
+    rows = compare(results, baseline, args.tolerance)
+    print_table(results, rows)
+    regressions = [row["name"] for row in rows if row["regression"]]
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+import os
+import argparse
+
+from backend.config import Config
+from backend.rl.export import POLICY_FILE_NAME, export_policy
+
+config_loader = Config()
+MODEL_DIR = config_loader.get("paths.models_dir")
+
+
+def find_versions(models_dir: str):
+    return sorted(
+        name
+        for name in os.listdir(models_dir)
+        if os.path.isfile(os.path.join(models_dir, name, "best_model.zip"))
+        and os.path.isfile(os.path.join(models_dir, name, "vecnormalize.pkl"))
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export trained PPO actors to torch-free .npz policies."
+    )
+    parser.add_argument(
+        "versions",
+        nargs="*",
+        help=f"Model versions under {MODEL_DIR} (default: all)",
+    )
+    args = parser.parse_args()
+
+    versions = args.versions or find_versions(MODEL_DIR)
+    if not versions:
+        print(f"No models found in '{MODEL_DIR}'")
+
+    for version in versions:
+        version_dir = os.path.join(MODEL_DIR, version)
+        output_path = export_policy(
+            os.path.join(version_dir, "best_model.zip"),
+            os.path.join(version_dir, "vecnormalize.pkl"),
+            os.path.join(version_dir, POLICY_FILE_NAME),
+        )
+        size_kb = os.path.getsize(output_path) / 1024
+        print(f"{version}: wrote {output_path} ({size_kb:.1f} KB)")
@@ -1,16 +1,97 @@
 import os
-import re
+import sys
 import json
 import math
+import argparse
+import shutil
+import hashlib
+import numpy as np
 import pandas as pd
+import matplotlib
+
+matplotlib.use("Agg")  # Figures are only saved; workers never need a display
 import matplotlib.pyplot as plt
-from typing import Union, List, Optional, Dict
+from array import array
 from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Union, List, Optional, Dict, Tuple
 from tqdm import tqdm
 
+if __package__ in (None, ""):
+    # Run as `python scripts/logeval.py`: make `backend` importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.steplog import STEP_LOG_SUFFIX, StepLog
+
+STEP_MARKER = b"StepLog: "
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+# Log timestamps are naive local wall time (JsonFormatter.formatTime); they are
+# stored as seconds from a naive epoch so no time zone is ever applied
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+MANIFEST_NAME = ".logeval-manifest.json"
+MANIFEST_VERSION = 1
+
+
+class _RocketColumns:
+    """
+    Growable typed columns for one rocket. Values are stored as C doubles
+    (`array.array`), never as per-row Python objects; fields that appear
+    late or go missing are NaN-padded.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.columns: Dict[str, array] = {}
+        self.timestamps = array("d")
+
+    def append(self, timestamp: float, values: Dict[str, float]):
+        columns = self.columns
+        for name, value in values.items():
+            column = columns.get(name)
+            if column is None:
+                column = columns[name] = array("d", [math.nan]) * self.rows
+            column.append(value)
+        self.rows += 1
+        if len(values) != len(columns):
+            for column in columns.values():
+                if len(column) < self.rows:
+                    column.append(math.nan)
+        self.timestamps.append(timestamp)
+
+    def to_frame(self, rocket_index: int) -> pd.DataFrame:
+        df = pd.DataFrame(
+            {name: np.frombuffer(column, dtype=np.float64) for name, column in self.columns.items()}
+        )
+        df["timestamp"] = pd.to_datetime(np.frombuffer(self.timestamps), unit="s")
+        df["rocket_index"] = rocket_index
+        if "step" in df.columns:
+            df["step"] = df["step"].astype(np.int64)
+            df.set_index("step", inplace=True)
+        return df
+
+
+def _step_values(entry: dict) -> Dict[str, float]:
+    """Flattens one StepLog entry to numeric columns, skipping omitted parts."""
+    values = {"step": float(entry["step"])}
+    state = entry.get("state")
+    if isinstance(state, dict):
+        values.update(state)
+    action = entry.get("action")
+    if isinstance(action, dict):
+        for name, value in action.items():
+            values[f"action_{name}"] = value
+    reward = entry.get("reward")
+    if reward is not None and reward != "omitted":
+        values["reward"] = float(reward)
+    values["done"] = float(bool(entry.get("done")))
+    return values
+
 
 class SimulationLogEval:
-    def __init__(self, log_dir: str, output_dir: str, csv_dir: str):
+    def __init__(
+        self, log_dir: str, output_dir: str, csv_dir: str, chunk_lines: int = 10000
+    ):
         self.log_dir = log_dir
         self.output_dir = output_dir
         self.csv_dir = csv_dir
@@ -31,9 +112,8 @@ class SimulationLogEval:
             "tab:olive",
             "tab:cyan",
         ]
-        self.log_pattern = re.compile(
-            r"^(?P<timestamp>[\d\-:, ]+) - .+? - DEBUG - StepLog: (?P<dict_data>\{.+\})$"
-        )
+        self.chunk_lines = chunk_lines
+        self._timestamp_cache: Tuple[str, float] = ("", 0.0)
 
     def _ensure_directories(self):
         for path, must_exist in self.dirs.items():
@@ -48,69 +128,97 @@ class SimulationLogEval:
                 except Exception as e:
                     raise OSError(f"Failed to create directory '{path}': {e}")
 
-    def _parse_step_log_line(
-        self, line: str
-    ) -> tuple[Optional[datetime], Optional[dict]]:
-        match = self.log_pattern.match(line)
-        if match:
-            timestamp_str = match.group("timestamp").strip()
+    def _parse_timestamp(self, text: str) -> float:
+        # Records share the same second-resolution timestamp in long runs, so
+        # strptime runs about once per logged second instead of per line
+        cached_text, cached_value = self._timestamp_cache
+        if text != cached_text:
+            cached_value = (
+                datetime.strptime(text, TIMESTAMP_FORMAT) - _NAIVE_EPOCH
+            ).total_seconds()
+            self._timestamp_cache = (text, cached_value)
+        return cached_value
+
+    def _parse_chunk(self, lines: List[bytes], rockets: Dict[int, _RocketColumns]):
+        for line in lines:
+            # Cheap byte test first: most lines of a session are not step logs
+            if STEP_MARKER not in line:
+                continue
             try:
-                timestamp = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S,%f")
-                dict_str = match.group("dict_data")
-                step_data = json.loads(dict_str)  # <- safer and correct
-                return timestamp, step_data
-            except Exception as e:
-                print(f"[ERROR] Failed to parse log line at {timestamp_str}: {e}")
-        return None, None
+                record = json.loads(line)
+                message = record["message"]
+                entry = json.loads(message[message.index("StepLog: ") + 9 :])
+                columns = rockets.get(entry["rocket_index"])
+                if columns is None:
+                    columns = rockets[entry["rocket_index"]] = _RocketColumns()
+                columns.append(
+                    self._parse_timestamp(record["timestamp"]), _step_values(entry)
+                )
+            except (ValueError, KeyError, TypeError) as e:
+                print(f"[ERROR] Failed to parse log line: {e}")
 
     def _extract_log_data(self, log_path: str) -> Dict[int, pd.DataFrame]:
-        """Extract data grouped by rocket index"""
+        """
+        Streams a JSON-lines simulation log in chunks of `chunk_lines` lines
+        and returns one DataFrame per rocket, indexed by step. Only the
+        current chunk is held as raw text; parsed values go straight into
+        typed per-rocket columns.
+        """
+        if log_path.endswith(STEP_LOG_SUFFIX):
+            return self._extract_step_log(log_path)
         try:
-            # Dictionary to store data for each rocket index
-            rocket_data = {}
-
-            with open(log_path, "r") as file:
-                for line in file:
-                    timestamp, data = self._parse_step_log_line(line)
-                    if timestamp and data:
-                        rocket_index = data["rocket_index"]
-
-                        if rocket_index not in rocket_data:
-                            rocket_data[rocket_index] = {
-                                "timestamps": [],
-                                "states": [],
-                                "rewards": [],
-                                "actions": [],
-                            }
-
-                        rocket_data[rocket_index]["timestamps"].append(timestamp)
-                        rocket_data[rocket_index]["states"].append(data["state"])
-                        rocket_data[rocket_index]["rewards"].append(data["reward"])
-                        rocket_data[rocket_index]["actions"].append(
-                            data.get("action", {})
-                        )
+            rockets: Dict[int, _RocketColumns] = {}
+            with open(log_path, "rb") as file:
+                while True:
+                    lines = list(islice(file, self.chunk_lines))
+                    if not lines:
+                        break
+                    self._parse_chunk(lines, rockets)
+
+            dataframes = {
+                rocket_index: columns.to_frame(rocket_index)
+                for rocket_index, columns in sorted(rockets.items())
+                if columns.rows
+            }
+            if not dataframes:
+                print(f"[WARNING] No valid data parsed from {log_path}")
+            return dataframes
 
-            dataframes = {}
-            for rocket_index, data in rocket_data.items():
-                if not data["timestamps"]:
-                    print(f"[WARNING] No valid data for rocket index {rocket_index}")
-                    continue
-
-                df_states = pd.DataFrame(data["states"])
-                df_actions = pd.DataFrame(data["actions"]).add_prefix("action_")
-                df = pd.concat([df_states, df_actions], axis=1)
-                df["timestamp"] = data["timestamps"]
-                df["reward"] = data["rewards"]
-                df["rocket_index"] = rocket_index
-                df.set_index("timestamp", inplace=True)
-                dataframes[rocket_index] = df
+        except Exception as e:
+            print(f"[ERROR] Failed to extract data from {log_path}: {e}")
+            return {}
 
+    def _extract_step_log(self, log_path: str) -> Dict[int, pd.DataFrame]:
+        """Per-rocket DataFrames from a binary step log (see backend/steplog.py)."""
+        try:
+            with StepLog(log_path) as log:
+                names = [
+                    name
+                    for name in log.fields
+                    if name not in ("step", "rocket_index", "active")
+                ]
+                dataframes = {}
+                for rocket_index in range(log.num_rockets):
+                    series = log.rocket_active(rocket_index)
+                    if not len(series):
+                        continue
+                    df = pd.DataFrame(
+                        {
+                            ("action_" + name if name in ("throttle", "coldGas") else name):
+                            series[name].astype(np.float64)
+                            for name in names
+                        },
+                        index=pd.Index(series["step"].astype(np.int64), name="step"),
+                    )
+                    # Derived like Rocket.get_state, which text logs record
+                    df["speed"] = np.hypot(df["vx"], df["vy"])
+                    df["relativeAngle"] = df["angle"].abs()
+                    df["totalMass"] = df["mass"] + df["fuelMass"]
+                    df["rocket_index"] = rocket_index
+                    dataframes[rocket_index] = df
             if not dataframes:
                 print(f"[WARNING] No valid data parsed from {log_path}")
-                return {}
-
             return dataframes
-
         except Exception as e:
             print(f"[ERROR] Failed to extract data from {log_path}: {e}")
             return {}
@@ -131,7 +239,7 @@ class SimulationLogEval:
             plt.plot(
                 df.index, df[state_keys[0]], label=f"Rocket {rocket_index}", color=color
             )
-            plt.xlabel("Time")
+            plt.xlabel("Step")
             plt.ylabel(ylabel[0])
             plt.title(f"{state_keys[0]} over time - Rocket {rocket_index}")
             plt.grid(True)
@@ -167,7 +275,7 @@ class SimulationLogEval:
             for j in range(len(state_keys), len(axes)):
                 fig.delaxes(axes[j])
 
-            fig.supxlabel("Time")
+            fig.supxlabel("Step")
             plt.tight_layout()
 
             output_path = os.path.join(
@@ -205,77 +313,154 @@ class SimulationLogEval:
             axes[i].set_title(f"{key} over time")
             axes[i].grid(True)
 
-            # Add legend to each plot
-            axes[i].legend()
+            # Add legend to each plot that has data
+            if axes[i].get_legend_handles_labels()[0]:
+                axes[i].legend()
 
         # Remove unused subplots
         for j in range(len(state_keys), len(axes)):
             fig.delaxes(axes[j])
 
-        fig.supxlabel("Time")
+        fig.supxlabel("Step")
         plt.tight_layout()
 
         output_path = os.path.join(output_dir, f"all.png")
         plt.savefig(output_path)
         plt.close()
 
-    def _save_csv(self, dataframes: Dict[int, pd.DataFrame], log_file: str):
-        # Create a directory for this log file
-        base_filename = os.path.splitext(log_file)[0]
-        log_dir = os.path.join(self.csv_dir, base_filename)
+    def _save_csv(self, dataframes: Dict[int, pd.DataFrame], log_dir: str):
         os.makedirs(log_dir, exist_ok=True)
 
-        # Save a CSV for each rocket
-        with tqdm(
-            dataframes.items(),
-            desc=f"Saving CSVs for {log_file}",
-            leave=False,
-            smoothing=0.5,  # Added smoothing
-            mininterval=0.05,  # Increased update frequency
-            bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}{postfix}]",  # Improved bar format
-        ) as rocket_csv_progress:
-            for rocket_index, df in rocket_csv_progress:
-                csv_filename = f"R{rocket_index}.csv"
-                csv_path = os.path.join(log_dir, csv_filename)
-                try:
-                    df.round(2).to_csv(csv_path, index=True)
-                    rocket_csv_progress.set_description(
-                        f"Saving CSVs for {log_file} - Rocket {rocket_index}"
-                    )
-                except Exception as e:
-                    print(
-                        f"[ERROR] Failed to save CSV for {log_file}, rocket {rocket_index}: {e}"
-                    )
-
-        # Also save a combined CSV with all rockets
-        try:
-            # Add rocket_index to index for combined dataframe
-            combined_df = pd.concat(
-                [df.assign(rocket_index=idx) for idx, df in dataframes.items()]
-            )
+        # Each rocket is formatted once; the combined CSV reuses the same text
+        # when all rockets share a column layout
+        bodies = []
+        for rocket_index, df in dataframes.items():
+            decimals = {name: 2 for name in df.columns if df[name].dtype.kind == "f"}
+            text = df.round(decimals).to_csv(index=True)
+            with open(os.path.join(log_dir, f"R{rocket_index}.csv"), "w") as f:
+                f.write(text)
+            bodies.append(text)
+
+        combined_csv_path = os.path.join(log_dir, "combined.csv")
+        headers = {body[: body.index("\n") + 1] for body in bodies}
+        if len(headers) == 1:
+            with open(combined_csv_path, "w") as f:
+                f.write(bodies[0])
+                for body in bodies[1:]:
+                    f.write(body[body.index("\n") + 1 :])
+        else:
+            combined_df = pd.concat(list(dataframes.values()))
             combined_df = combined_df.reset_index()
-            combined_df = combined_df.set_index(["timestamp", "rocket_index"])
+            combined_df = combined_df.set_index(["step", "rocket_index"])
+            decimals = {
+                name: 2 for name in combined_df.columns if combined_df[name].dtype.kind == "f"
+            }
+            combined_df.round(decimals).to_csv(combined_csv_path, index=True)
 
-            combined_csv_path = os.path.join(log_dir, f"combined.csv")
-            combined_df.round(2).to_csv(
-                combined_csv_path, index=True
-            )  # Explicitly save index
-        except Exception as e:
-            print(f"[ERROR] Failed to save combined CSV for {log_file}: {e}")
+    def _output_dirs(self, log_file: str) -> Tuple[str, str]:
+        base_filename = os.path.splitext(log_file)[0]
+        return (
+            os.path.join(self.csv_dir, base_filename),
+            os.path.join(self.output_dir, base_filename),
+        )
+
+    def process_log_file(
+        self, log_file: str, state_keys: List[str], ylabel: List[str]
+    ) -> int:
+        """Parses one log, writes its CSVs and plots; returns the number of rockets."""
+        dataframes = _extract_and_save(self._options(), log_file)
+        if dataframes:
+            _, plots_dir = self._output_dirs(log_file)
+            staging = _staging_dir(plots_dir)
+            for rocket_index, df in dataframes.items():
+                self._plot_state_for_single_rocket(
+                    df, rocket_index, state_keys, ylabel, staging
+                )
+            self._plot_all_metrics_combined(dataframes, state_keys, ylabel, staging)
+            self._publish_outputs(log_file)
+        return len(dataframes)
+
+    def _publish_outputs(self, log_file: str):
+        """Swaps the staged CSVs and plots of `log_file` into place together."""
+        for path in self._output_dirs(log_file):
+            if os.path.isdir(_staging_dir(path)):
+                _publish_dir(_staging_dir(path), path)
+
+    def _discard_outputs(self, log_file: str):
+        for path in self._output_dirs(log_file):
+            shutil.rmtree(_staging_dir(path), ignore_errors=True)
+
+    def _options(self) -> Tuple[str, str, str, int]:
+        return (self.log_dir, self.output_dir, self.csv_dir, self.chunk_lines)
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.output_dir, MANIFEST_NAME)
+
+    def _load_manifest(self) -> Dict[str, Dict]:
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {}
+        return manifest.get("logs", {})
+
+    def _save_manifest(self, logs: Dict[str, Dict]):
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "logs": logs}, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _is_current(self, log_file: str, entry: Optional[Dict], signature: Dict) -> bool:
+        """
+        True if the outputs of `log_file` are up to date. Size and mtime are
+        checked first; the content hash is only computed when the file was
+        touched, so an untouched log costs one stat call.
+        """
+        if not entry or entry.get("signature") != signature:
+            return False
+        if not all(os.path.isdir(path) for path in self._output_dirs(log_file)):
+            return False
+        stat = os.stat(os.path.join(self.log_dir, log_file))
+        if stat.st_size != entry["size"]:
+            return False
+        if stat.st_mtime_ns == entry["mtime_ns"]:
+            return True
+        if _file_digest(os.path.join(self.log_dir, log_file)) != entry["sha256"]:
+            return False
+        entry["mtime_ns"] = stat.st_mtime_ns
+        return True
 
     def process_all_logs(
         self,
         state_keys: List[str],
         ylabel: Optional[Union[str, List[str]]] = None,
-    ):
-        log_files = [
+        workers: Optional[int] = None,
+        incremental: bool = True,
+    ) -> List[str]:
+        """
+        Processes every .log and .steps file in `log_dir` and returns the
+        names of the files that were (re)processed.
+
+        With `incremental`, logs recorded in the manifest as unchanged are
+        skipped. Parsing and every figure are separate jobs on a process
+        pool of `workers` processes (default: CPU count), so the plots of a
+        single new session render in parallel too. Each log's CSVs and plots
+        are written to staging directories and swapped into place together
+        once every job of the log succeeded; if one fails, the staged outputs
+        are removed and the previous ones kept.
+        """
+        log_files = sorted(
             f
             for f in os.listdir(self.log_dir)
-            if f.endswith(".log") and os.path.isfile(os.path.join(self.log_dir, f))
-        ]
+            if f.endswith((".log", STEP_LOG_SUFFIX))
+            and os.path.isfile(os.path.join(self.log_dir, f))
+        )
         if not log_files:
-            print(f"[INFO] No .log files found in '{self.log_dir}'")
-            return
+            print(f"[INFO] No .log or {STEP_LOG_SUFFIX} files found in '{self.log_dir}'")
+            return []
 
         if ylabel is None:
             ylabel = state_keys
@@ -284,74 +469,212 @@ class SimulationLogEval:
         elif isinstance(ylabel, list) and len(ylabel) != len(state_keys):
             raise ValueError("Length of 'ylabel' must match the number of 'state_keys'")
 
-        for log_file in tqdm(
-            log_files,
+        signature = {"state_keys": list(state_keys), "ylabel": list(ylabel)}
+        manifest = self._load_manifest() if incremental else {}
+        manifest = {name: entry for name, entry in manifest.items() if name in log_files}
+        pending_files = [
+            f for f in log_files if not self._is_current(f, manifest.get(f), signature)
+        ]
+        if not pending_files:
+            self._save_manifest(manifest)
+            print(f"[INFO] All {len(log_files)} logs are up to date")
+            return []
+
+        workers = workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else _SerialExecutor()
+        options = self._options()
+        progress = tqdm(
+            total=len(pending_files),
             desc="Processing log files",
-            smoothing=0.5,  # Added smoothing
-            mininterval=0.05,  # Increased update frequency
-            bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}{postfix}]",  # Improved bar format
-        ):  # Use tqdm here for log files
-            log_path = os.path.join(self.log_dir, log_file)
-            dataframes = self._extract_log_data(log_path)
+            smoothing=0.5,
+            mininterval=0.05,
+            bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}{postfix}]",
+        )
+        with executor, progress:
+            # Fingerprint before parsing: a log that grows meanwhile is
+            # picked up again by the next run
+            fingerprints = {
+                f: _fingerprint(os.path.join(self.log_dir, f)) for f in pending_files
+            }
+            jobs: Dict[Future, Tuple[str, str]] = {
+                executor.submit(_extract_and_save, options, f): ("parse", f)
+                for f in pending_files
+            }
+            plots_left: Dict[str, int] = {}
+            failed = set()
+
+            def finish(log_file: str):
+                if log_file in failed:
+                    self._discard_outputs(log_file)
+                    print(f"[ERROR] Keeping previous outputs for {log_file}")
+                else:
+                    self._publish_outputs(log_file)
+                    manifest[log_file] = {**fingerprints[log_file], "signature": signature}
+                    self._save_manifest(manifest)
+                progress.set_postfix_str(log_file)
+                progress.update()
+
+            while jobs:
+                done, _ = wait(jobs, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, log_file = jobs.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"[ERROR] Failed to process {log_file}: {e}")
+                        failed.add(log_file)
+                        result = None
+
+                    if kind == "parse":
+                        if not result:
+                            finish(log_file)
+                            continue
+                        staging = _staging_dir(self._output_dirs(log_file)[1])
+                        for rocket_index, df in result.items():
+                            job = executor.submit(
+                                _render_rocket, options, df, rocket_index,
+                                state_keys, ylabel, staging,
+                            )
+                            jobs[job] = ("plot", log_file)
+                        job = executor.submit(
+                            _render_combined, options, result, state_keys, ylabel, staging
+                        )
+                        jobs[job] = ("plot", log_file)
+                        plots_left[log_file] = len(result) + 1
+                    else:
+                        plots_left[log_file] -= 1
+                        if not plots_left[log_file]:
+                            finish(log_file)
+        return pending_files
 
-            if dataframes:
-                self._save_csv(dataframes, log_file)
 
-                # Create a subdirectory for this log's plots
-                base_filename = os.path.splitext(log_file)[0]
-                plots_dir = os.path.join(self.output_dir, base_filename)
-                os.makedirs(plots_dir, exist_ok=True)
+class _SerialExecutor:
+    """Runs jobs inline when only one worker is requested."""
 
-                try:
-                    # 1. Create individual plots for each rocket
-                    with tqdm(
-                        dataframes.items(),
-                        desc=f"Creating plots for {log_file}",
-                        leave=False,
-                        smoothing=0.5,  # Added smoothing
-                        mininterval=0.05,  # Increased update frequency
-                        bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}{postfix}]",  # Improved bar format
-                    ) as rocket_plot_progress:
-                        for rocket_index, df in rocket_plot_progress:
-                            self._plot_state_for_single_rocket(
-                                df,
-                                rocket_index,
-                                state_keys,
-                                ylabel,
-                                plots_dir,
-                            )
-                            rocket_plot_progress.set_description(
-                                f"Creating plots for {log_file} - Rocket {rocket_index}"
-                            )
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
 
-                    # 2. Create a master plot with all metrics and all rockets
-                    self._plot_all_metrics_combined(
-                        dataframes, state_keys, ylabel, plots_dir
-                    )
+    def __enter__(self):
+        return self
 
-                except Exception as e:
-                    print(f"[ERROR] Plotting failed for {log_file}: {e}")
+    def __exit__(self, *exc):
+        return False
 
 
-if __name__ == "__main__":
-    state_keys = [
-        "x",
-        "y",
-        "vx",
-        "vy",
-        "ax",
-        "ay",
-        "angle",
-        "angularVelocity",
-        "angularAcceleration",
-        "fuelMass",
-        "speed",
-        "relativeAngle",
-    ]
-
-    eval = SimulationLogEval(
-        log_dir="logs/simulations",
-        output_dir="output/simulation-graphs",
-        csv_dir="output/simulation-data",
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _fingerprint(path: str) -> Dict:
+    stat = os.stat(path)
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": _file_digest(path),
+    }
+
+
+def _staging_dir(path: str) -> str:
+    head, tail = os.path.split(path)
+    return os.path.join(head, f".{tail}.partial")
+
+
+def _publish_dir(staging: str, path: str):
+    """Swaps a finished staging directory into place, replacing `path`."""
+    head, tail = os.path.split(path)
+    previous = os.path.join(head, f".{tail}.previous")
+    shutil.rmtree(previous, ignore_errors=True)
+    if os.path.isdir(path):
+        os.rename(path, previous)
+    os.rename(staging, path)
+    shutil.rmtree(previous, ignore_errors=True)
+
+
+def _make_evaluator(options: Tuple[str, str, str, int]) -> SimulationLogEval:
+    log_dir, output_dir, csv_dir, chunk_lines = options
+    return SimulationLogEval(log_dir, output_dir, csv_dir, chunk_lines=chunk_lines)
+
+
+# Process pool entry points: each job builds its own evaluator from `options`
+
+
+def _extract_and_save(
+    options: Tuple[str, str, str, int], log_file: str
+) -> Dict[int, pd.DataFrame]:
+    evaluator = _make_evaluator(options)
+    dataframes = evaluator._extract_log_data(os.path.join(evaluator.log_dir, log_file))
+    if dataframes:
+        csv_dir, plots_dir = evaluator._output_dirs(log_file)
+        # CSVs stay staged until the plots are done; both are published together
+        evaluator._discard_outputs(log_file)
+        evaluator._save_csv(dataframes, _staging_dir(csv_dir))
+        os.makedirs(_staging_dir(plots_dir))
+    return dataframes
+
+
+def _render_rocket(options, df, rocket_index, state_keys, ylabel, plots_dir):
+    _make_evaluator(options)._plot_state_for_single_rocket(
+        df, rocket_index, state_keys, ylabel, plots_dir
+    )
+
+
+def _render_combined(options, dataframes, state_keys, ylabel, plots_dir):
+    _make_evaluator(options)._plot_all_metrics_combined(
+        dataframes, state_keys, ylabel, plots_dir
+    )
+
+
+STATE_KEYS = [
+    "x",
+    "y",
+    "vx",
+    "vy",
+    "ax",
+    "ay",
+    "angle",
+    "angularVelocity",
+    "angularAcceleration",
+    "fuelMass",
+    "speed",
+    "relativeAngle",
+]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Evaluate simulation logs.")
+    parser.add_argument("--log-dir", default="logs/simulations")
+    parser.add_argument("--output-dir", default="output/simulation-graphs")
+    parser.add_argument("--csv-dir", default="output/simulation-data")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--chunk-lines", type=int, default=10000, help="Log lines parsed per chunk"
+    )
+    parser.add_argument(
+        "--full", action="store_true", help="Reprocess every log, ignoring the manifest"
+    )
+    args = parser.parse_args(argv)
+
+    evaluator = SimulationLogEval(
+        log_dir=args.log_dir,
+        output_dir=args.output_dir,
+        csv_dir=args.csv_dir,
+        chunk_lines=args.chunk_lines,
     )
-    eval.process_all_logs(state_keys=state_keys)
+    evaluator.process_all_logs(
+        state_keys=STATE_KEYS, workers=args.workers, incremental=not args.full
+    )
+
+
+if __name__ == "__main__":
+    main()
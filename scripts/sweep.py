@@ -0,0 +1,91 @@
+import os
+import sys
+import time
+import argparse
+from typing import Dict, List, Optional
+
+from backend.config import Config
+from backend.rl.sweep import SweepLedger, rung_budgets, run_sweep
+
+config_loader = Config()
+SWEEP_CONFIG = config_loader.get("rl.sweep")
+
+LEDGER_NAME = "ledger.sqlite"
+
+
+def print_leaderboard(trials: List[Dict]):
+    if not trials:
+        print("No trial has reported yet")
+        return
+    print(f"{'trial':>5}  {'status':<9}  {'timesteps':>9}  {'landing':>7}  {'reward':>9}  params")
+    for t in trials:
+        params = ", ".join(
+            f"{k}={v:.3g}" if isinstance(v, float) else f"{k}={v}" for k, v in t["params"].items()
+        )
+        print(
+            f"{t['trial']:>5}  {t['status']:<9}  {t['timesteps']:>9}  "
+            f"{t['landing_rate']:>7.1%}  {t['mean_reward']:>9.1f}  {params}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="PPO hyperparameter sweep with ASHA early stopping on eval landing rate."
+    )
+    parser.add_argument(
+        "--name",
+        default=None,
+        help="Sweep name; an existing sweep is continued (default: a new timestamped sweep)",
+    )
+    parser.add_argument("--trials", type=int, default=SWEEP_CONFIG["trials"])
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=SWEEP_CONFIG["workers"],
+        help="Trial processes, each pinned to one CPU; 0 uses every CPU, 1 runs inline",
+    )
+    parser.add_argument("--min-timesteps", type=int, default=SWEEP_CONFIG["min_timesteps"])
+    parser.add_argument("--max-timesteps", type=int, default=SWEEP_CONFIG["max_timesteps"])
+    parser.add_argument("--dir", default=SWEEP_CONFIG["dir"], help="Directory holding all sweeps")
+    args = parser.parse_args(argv)
+
+    name = args.name or time.strftime("sweep_%Y%m%d-%H%M%S")
+    sweep_dir = os.path.join(args.dir, name)
+    settings = {
+        "vec_env": SWEEP_CONFIG["vec_env"],
+        "n_envs": SWEEP_CONFIG["n_envs"],
+        "min_timesteps": args.min_timesteps,
+        "max_timesteps": args.max_timesteps,
+        "reduction_factor": SWEEP_CONFIG["reduction_factor"],
+        "eval_episodes": SWEEP_CONFIG["eval_episodes"],
+        "seed": SWEEP_CONFIG["seed"],
+    }
+    budgets = rung_budgets(
+        settings["min_timesteps"], settings["max_timesteps"], settings["reduction_factor"]
+    )
+    ledger = SweepLedger(
+        os.path.join(sweep_dir, LEDGER_NAME), name, settings["reduction_factor"]
+    )
+    print(f"Sweep '{name}': {args.trials} trials, rungs at {budgets} timesteps")
+    print(f"Ledger: {ledger.path}")
+
+    def report(trial: int, status: str):
+        print(f"Trial {trial}: {status}")
+
+    start = time.perf_counter()
+    run_sweep(
+        ledger,
+        SWEEP_CONFIG["search_space"],
+        args.trials,
+        settings,
+        sweep_dir,
+        workers=args.workers,
+        on_trial_done=report,
+    )
+    print(f"\nSweep finished in {time.perf_counter() - start:.0f} s")
+    print_leaderboard(ledger.leaderboard())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,27 @@
 import os
+import json
 import time
+import signal
+import argparse
 from stable_baselines3 import PPO
 from stable_baselines3.common.env_util import make_vec_env
-from stable_baselines3.common.vec_env import VecNormalize, SubprocVecEnv, DummyVecEnv
-from stable_baselines3.common.callbacks import EvalCallback, CheckpointCallback
+from stable_baselines3.common.vec_env import (
+    VecNormalize,
+    DummyVecEnv,
+    VecMonitor,
+)
+from stable_baselines3.common.callbacks import EvalCallback
 
 from multiprocessing import freeze_support
 
 from backend.envs import RocketLandingEnv
+from backend.envs.autotune import autotune_vec_env, make_training_vec_env
+from backend.rl.checkpoints import (
+    AtomicCheckpointCallback,
+    find_latest_checkpoint,
+    restore_eval_history,
+)
+from backend.rl.evaluation import AsyncEvalCallback, make_eval_vec_env
 from backend.config import Config
 
 config_loader = Config()
@@ -23,12 +37,14 @@ TOTAL_TIMESTEPS = train_config["total_timesteps"]
 N_ENVS = train_config["n_envs"]
 EVAL_FREQ_STEPS = train_config["eval_freq_steps"]
 CHECKPOINT_FREQ_STEPS = train_config["checkpoint_freq_steps"]
+CHECKPOINT_INTERVAL_MINUTES = train_config["checkpoint_interval_minutes"]
+KEEP_CHECKPOINTS = train_config["keep_checkpoints"]
+# "native" steps every env in one vectorized pass; "subproc"/"dummy" wrap RocketLandingEnv.
+# "auto" (here or for n_envs) calibrates at startup, see rl.training.autotune
+VEC_ENV = train_config["vec_env"]
+AUTOTUNE = train_config["autotune"]
+EVAL_CONFIG = train_config["eval"]
 
-# Calculate frequency based on parallel envs
-EVAL_FREQ = max(EVAL_FREQ_STEPS // N_ENVS, 1)
-CHECKPOINT_FREQ = max(CHECKPOINT_FREQ_STEPS // N_ENVS, 1)
-
-USE_SUBPROC_VEC_ENV = True
 TENSORBOARD_LOG_NAME = "PPO_RocketLander"
 MODEL_NAME_PREFIX = "ppo_rocket"
 
@@ -50,15 +66,100 @@ def make_env():
     return env
 
 
+def find_run_to_resume(run: str):
+    """
+    Returns (run_timestamp, checkpoint) for `run` ("latest" or a run
+    timestamp such as 20250101-120000). "latest" is the most recently
+    written run that has a usable checkpoint.
+    """
+    prefix = f"{MODEL_NAME_PREFIX}_"
+    if run == "latest":
+        run_dirs = sorted(
+            (
+                os.path.join(CHECKPOINT_DIR, name)
+                for name in os.listdir(CHECKPOINT_DIR)
+                if name.startswith(prefix)
+            ),
+            key=os.path.getmtime,
+            reverse=True,
+        )
+    else:
+        run_dirs = [os.path.join(CHECKPOINT_DIR, prefix + run)]
+
+    for run_dir in run_dirs:
+        if not os.path.isdir(run_dir):
+            continue
+        checkpoint = find_latest_checkpoint(run_dir, MODEL_NAME_PREFIX)
+        if checkpoint is not None:
+            return os.path.basename(run_dir)[len(prefix):], checkpoint
+    raise SystemExit(f"No checkpoint to resume from for run '{run}' in {CHECKPOINT_DIR}")
+
+
+def resolve_vec_env(run_model_dir: str, resume: bool = False):
+    """
+    Returns (vec_env kind, n_envs) from the config, running the autotune
+    calibration if either is "auto". The choice is written to
+    vec_env.json in the run directory; a resumed run reuses it, since
+    n_envs is part of the checkpointed rollout setup.
+    """
+    choice_path = os.path.join(run_model_dir, "vec_env.json")
+    if resume and os.path.exists(choice_path):
+        with open(choice_path) as f:
+            choice = json.load(f)
+        return choice["vec_env"], choice["n_envs"]
+
+    choice = {"vec_env": VEC_ENV, "n_envs": N_ENVS, "source": "config"}
+    if "auto" in (VEC_ENV, N_ENVS):
+        print("Calibrating vectorized env (rl.training.autotune)...")
+        tuning = autotune_vec_env(
+            AUTOTUNE["candidates"] if VEC_ENV == "auto" else [VEC_ENV],
+            AUTOTUNE["n_envs"] if N_ENVS == "auto" else [N_ENVS],
+            seconds=AUTOTUNE["calibration_seconds"],
+            memory_budget_mb=AUTOTUNE["memory_budget_mb"],
+            n_steps=N_STEPS,
+        )
+        choice = {**tuning, "source": "auto"}
+        for m in tuning["measurements"]:
+            print(
+                f"  {m['vec_env']:>7} x {m['n_envs']:<3} {m['steps_per_second']:>10.0f} steps/s"
+                f"{'' if m['fits_budget'] else '  (over memory budget)'}"
+            )
+
+    with open(choice_path, "w") as f:
+        json.dump(choice, f, indent=2)
+    return choice["vec_env"], choice["n_envs"]
+
+
+def raise_keyboard_interrupt(signum, frame):
+    # Preemption sends SIGTERM: stop like Ctrl+C so the final checkpoint is written
+    raise KeyboardInterrupt
+
+
 if __name__ == "__main__":
 
     freeze_support()
 
+    parser = argparse.ArgumentParser(description="Train the PPO rocket lander.")
+    parser.add_argument(
+        "--resume",
+        nargs="?",
+        const="latest",
+        metavar="RUN",
+        help="Continue a run from its newest checkpoint: a run timestamp, or the latest run",
+    )
+    args = parser.parse_args()
+    signal.signal(signal.SIGTERM, raise_keyboard_interrupt)
+
     os.makedirs(LOG_DIR, exist_ok=True)
     os.makedirs(MODEL_DIR, exist_ok=True)
     os.makedirs(CHECKPOINT_DIR, exist_ok=True)
 
-    run_timestamp = time.strftime("%Y%m%d-%H%M%S")
+    checkpoint = None
+    if args.resume:
+        run_timestamp, checkpoint = find_run_to_resume(args.resume)
+        print(f"Resuming run {run_timestamp} from {checkpoint['model']}")
+    else:
+        run_timestamp = time.strftime("%Y%m%d-%H%M%S")
     run_log_dir = os.path.join(LOG_DIR, f"{TENSORBOARD_LOG_NAME}_{run_timestamp}")
     run_model_dir = os.path.join(MODEL_DIR, f"{MODEL_NAME_PREFIX}_{run_timestamp}")
     best_model_save_path = os.path.join(run_model_dir, "best_model")
@@ -79,65 +180,106 @@ if __name__ == "__main__":
 
     # --- Environment Setup ---
     # Create the vectorized environment INSIDE the main block
-    vec_env_cls = SubprocVecEnv if USE_SUBPROC_VEC_ENV and N_ENVS > 1 else DummyVecEnv
-    train_vec_env = make_vec_env(make_env, n_envs=N_ENVS, vec_env_cls=vec_env_cls)
-
-    # Wrap with VecNormalize
-    norm_train_vec_env = VecNormalize(
-        train_vec_env, norm_obs=True, norm_reward=True, clip_obs=10.0, gamma=GAMMA
-    )
+    vec_env_kind, n_envs = resolve_vec_env(run_model_dir, resume=checkpoint is not None)
+    train_vec_env = make_training_vec_env(vec_env_kind, n_envs)
+    if vec_env_kind == "native":
+        train_vec_env = VecMonitor(train_vec_env)
+    print(f"Vectorized env: {vec_env_kind} x {n_envs}")
+
+    # Calculate frequency based on parallel envs
+    eval_freq = max(EVAL_FREQ_STEPS // n_envs, 1)
+    checkpoint_freq = max(CHECKPOINT_FREQ_STEPS // n_envs, 1)
+
+    # Wrap with VecNormalize, restoring the running statistics on resume
+    if checkpoint is not None and checkpoint["vecnormalize"]:
+        norm_train_vec_env = VecNormalize.load(checkpoint["vecnormalize"], train_vec_env)
+    else:
+        norm_train_vec_env = VecNormalize(
+            train_vec_env, norm_obs=True, norm_reward=True, clip_obs=10.0, gamma=GAMMA
+        )
 
     print(f"Observation Space (Normalized): {norm_train_vec_env.observation_space}")
     print(f"Action Space: {norm_train_vec_env.action_space}")
 
     # --- Callbacks ---
-    # 1. Checkpoint Callback: Saves model periodically
-    checkpoint_callback = CheckpointCallback(
-        save_freq=CHECKPOINT_FREQ,
+    # 1. Checkpoint Callback: Saves model and VecNormalize stats atomically,
+    #    on a step budget and on a wall-time budget
+    checkpoint_callback = AtomicCheckpointCallback(
+        save_freq=checkpoint_freq,
         save_path=checkpoint_save_path,
         name_prefix=MODEL_NAME_PREFIX,
-        save_replay_buffer=False,
-        save_vecnormalize=True,
+        save_interval=CHECKPOINT_INTERVAL_MINUTES * 60 or None,
+        keep_last=KEEP_CHECKPOINTS,
         verbose=1,
     )
 
-    # 2. Evaluation Callback: Evaluates and saves the best model
-    eval_callback = EvalCallback(
-        norm_train_vec_env,
-        best_model_save_path=best_model_save_path,
-        log_path=run_log_dir,
-        eval_freq=EVAL_FREQ,
-        n_eval_episodes=30,
-        deterministic=True,
-        render=False,
-        verbose=1,
-    )
+    # 2. Evaluation Callback: Evaluates and saves the best model on its own
+    #    env, so the training envs and their normalization stats are untouched
+    if EVAL_CONFIG["async"]:
+        eval_callback = AsyncEvalCallback(
+            EVAL_CONFIG["vec_env"],
+            EVAL_CONFIG["n_envs"],
+            n_eval_episodes=EVAL_CONFIG["n_episodes"],
+            eval_freq=eval_freq,
+            best_model_save_path=best_model_save_path,
+            log_path=run_log_dir,
+            deterministic=True,
+            verbose=1,
+        )
+    else:
+        eval_callback = EvalCallback(
+            make_eval_vec_env(EVAL_CONFIG["vec_env"], EVAL_CONFIG["n_envs"]),
+            best_model_save_path=best_model_save_path,
+            log_path=run_log_dir,
+            eval_freq=eval_freq,
+            n_eval_episodes=EVAL_CONFIG["n_episodes"],
+            deterministic=True,
+            render=False,
+            verbose=1,
+        )
 
     # --- Model Definition ---
-    policy_kwargs = dict(net_arch=dict(pi=[256, 256], vf=[256, 256]))
-
-    model = PPO(
-        "MlpPolicy",
-        norm_train_vec_env,
-        learning_rate=LEARNING_RATE,
-        n_steps=N_STEPS,
-        batch_size=BATCH_SIZE,
-        n_epochs=N_EPOCHS,
-        gamma=GAMMA,
-        gae_lambda=GAE_LAMBDA,
-        clip_range=CLIP_RANGE,
-        ent_coef=ENT_COEF,
-        max_grad_norm=MAX_GRAD_NORM,
-        policy_kwargs=policy_kwargs,
-        verbose=1,
-        tensorboard_log=LOG_DIR,
-    )
+    if checkpoint is not None:
+        # Restores weights, optimizer state, schedules and num_timesteps
+        model = PPO.load(
+            checkpoint["model"],
+            env=norm_train_vec_env,
+            tensorboard_log=LOG_DIR,
+        )
+        restored = restore_eval_history(eval_callback, run_log_dir)
+        print(
+            f"Restored {model.num_timesteps} timesteps and {restored} past evaluations"
+        )
+    else:
+        policy_kwargs = dict(net_arch=dict(pi=[256, 256], vf=[256, 256]))
+
+        model = PPO(
+            "MlpPolicy",
+            norm_train_vec_env,
+            learning_rate=LEARNING_RATE,
+            n_steps=N_STEPS,
+            batch_size=BATCH_SIZE,
+            n_epochs=N_EPOCHS,
+            gamma=GAMMA,
+            gae_lambda=GAE_LAMBDA,
+            clip_range=CLIP_RANGE,
+            ent_coef=ENT_COEF,
+            max_grad_norm=MAX_GRAD_NORM,
+            policy_kwargs=policy_kwargs,
+            verbose=1,
+            tensorboard_log=LOG_DIR,
+        )
 
     # --- Training ---
-    print(f"\nStarting training for {TOTAL_TIMESTEPS} timesteps...")
+    # With reset_num_timesteps=False, learn() adds num_timesteps to its
+    # budget, so a resumed run only asks for what is left. This keeps the
+    # learning-rate progress and the TensorBoard run (same tb_log_name)
+    # continuous.
+    remaining_timesteps = max(TOTAL_TIMESTEPS - model.num_timesteps, 0)
+    print(f"\nStarting training for {remaining_timesteps} of {TOTAL_TIMESTEPS} timesteps...")
     try:
         model.learn(
-            total_timesteps=TOTAL_TIMESTEPS,
+            total_timesteps=remaining_timesteps,
             callback=[eval_callback, checkpoint_callback],
             tb_log_name=f"{TENSORBOARD_LOG_NAME}_{run_timestamp}",
             reset_num_timesteps=False,
@@ -145,6 +287,10 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         print("\nTraining interrupted by user.")
     finally:
+        # Leave a resumable checkpoint at the exact stopping point
+        if model.num_timesteps and getattr(checkpoint_callback, "model", None):
+            checkpoint_callback.save_checkpoint()
+
         # --- Save Final Model and Normalization Stats ---
         final_model_path = os.path.join(run_model_dir, f"{MODEL_NAME_PREFIX}_final")
         print(f"\nSaving final model to: {final_model_path}")
@@ -155,6 +301,8 @@ if __name__ == "__main__":
 
         # Close the environment
         norm_train_vec_env.close()
+        if isinstance(eval_callback, EvalCallback):
+            eval_callback.eval_env.close()
         print("Training finished and environment closed.")
 
     # --- Example: Loading and Evaluating the BEST Model ---
@@ -0,0 +1,33 @@
+import pytest
+
+from backend.envs.autotune import autotune_vec_env, make_training_vec_env, rollout_buffer_bytes
+
+
+class TestAutotune:
+
+    def test_picks_fastest_measured_candidate(self):
+        tuning = autotune_vec_env(
+            ["native", "dummy"], [1, 4], seconds=0.05, memory_budget_mb=4096, n_steps=16
+        )
+        measured = {(m["vec_env"], m["n_envs"]) for m in tuning["measurements"]}
+        assert measured == {("native", 1), ("native", 4), ("dummy", 1), ("dummy", 4)}
+        best = max(tuning["measurements"], key=lambda m: m["steps_per_second"])
+        assert (tuning["vec_env"], tuning["n_envs"]) == (best["vec_env"], best["n_envs"])
+
+    def test_memory_budget_limits_env_count(self):
+        # The rollout buffer alone for 64 envs exceeds the budget
+        budget_mb = rollout_buffer_bytes(32, 2048) / 1024**2 + 2
+        tuning = autotune_vec_env(
+            ["native"], [2, 64, 4], seconds=0.02, memory_budget_mb=budget_mb, n_steps=2048
+        )
+        assert tuning["n_envs"] in (2, 4)
+        assert not tuning["measurements"][-1]["fits_budget"]
+
+        with pytest.raises(RuntimeError):
+            autotune_vec_env(["native"], [1], seconds=0.02, memory_budget_mb=0, n_steps=16)
+
+    def test_unknown_kind(self):
+        with pytest.raises(ValueError):
+            make_training_vec_env("threads", 2)
+        with pytest.raises(ValueError):
+            autotune_vec_env(["threads"], [2], seconds=0.02, memory_budget_mb=64, n_steps=16)
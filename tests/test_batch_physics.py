@@ -0,0 +1,60 @@
+import pytest
+import numpy as np
+from backend.physics import BatchPhysicsEngine
+from backend.rocket import Rocket
+
+
+class TestBatchPhysicsEngine:
+
+    def setup_method(self):
+        np.random.seed(0)
+        self.num_rockets = 5
+        self.rockets = [Rocket() for _ in range(self.num_rockets)]
+        self.engine = BatchPhysicsEngine(self.num_rockets)
+        self.engine.load_states([r.state for r in self.rockets])
+
+    def test_state_rows_are_views(self):
+        self.engine.x[0] = 123.0
+        assert self.engine.data[0, 0] == 123.0
+        assert self.engine.field("x")[0] == 123.0
+
+    def test_previous_state_matches_scalar(self):
+        for i, rocket in enumerate(self.rockets):
+            assert self.engine.prev_x[i] == pytest.approx(rocket.previous_state["x"])
+            assert self.engine.prev_y[i] == pytest.approx(rocket.previous_state["y"])
+            assert self.engine.prev_angle[i] == pytest.approx(
+                rocket.previous_state["angle"]
+            )
+
+    def test_step_matches_scalar_engine(self):
+        rng = np.random.default_rng(1)
+        for _ in range(50):
+            throttle = rng.uniform(-0.2, 1.2, self.num_rockets)
+            cold_gas = rng.uniform(-1.2, 1.2, self.num_rockets)
+            for i, rocket in enumerate(self.rockets):
+                rocket.apply_action(throttle[i], cold_gas[i])
+            self.engine.step(throttle, cold_gas)
+
+        for i, rocket in enumerate(self.rockets):
+            batch_state = self.engine.get_state(i)
+            scalar_state = rocket.get_state()
+            for key, value in batch_state.items():
+                assert value == pytest.approx(scalar_state[key], rel=1e-9, abs=1e-6)
+
+    def test_inactive_rockets_are_untouched(self):
+        before = self.engine.data.copy()
+        active = np.array([True, False, True, False, False])
+        self.engine.step(np.ones(self.num_rockets), np.zeros(self.num_rockets), active)
+        assert np.array_equal(self.engine.data[:, ~active], before[:, ~active])
+        assert not np.array_equal(self.engine.data[:, active], before[:, active])
+
+    def test_no_thrust_without_fuel(self):
+        self.engine.fuel_mass[:] = 0.0
+        self.engine.step(np.ones(self.num_rockets), np.zeros(self.num_rockets))
+        assert np.all(self.engine.fuel_mass == 0.0)
+        assert np.all(self.engine.ay < 0.0)
+
+    def test_normalize_angle_matches_scalar(self):
+        angles = np.array([-540.0, -181.0, -180.0, 0.0, 179.9, 180.0, 725.0])
+        expected = [self.engine.normalize_angle_180(a) for a in angles]
+        assert np.allclose(self.engine.normalize_angle_180_batch(angles), expected)
@@ -0,0 +1,43 @@
+import json
+
+from scripts.benchmark import compare, main, metric
+
+
+def results(**values):
+    return {
+        "results": {
+            name: metric(value, "steps/s" if rate else "ms", rate)
+            for name, (value, rate) in values.items()
+        }
+    }
+
+
+class TestBenchmarkCompare:
+
+    def test_regressions_respect_direction_and_tolerance(self):
+        baseline = results(fast=(100.0, True), slow=(10.0, False), gone=(1.0, True))
+        current = results(fast=(70.0, True), slow=(11.0, False), new=(5.0, True))
+        rows = {row["name"]: row for row in compare(current, baseline, tolerance=0.2)}
+
+        assert set(rows) == {"fast", "slow"}
+        assert rows["fast"]["regression"]  # 30% fewer steps/s
+        assert not rows["slow"]["regression"]  # 10% more latency is tolerated
+        assert compare(results(slow=(13.0, False)), baseline, 0.2)[0]["regression"]
+
+    def test_run_writes_json_and_fails_on_regression(self, tmp_path):
+        output, baseline = tmp_path / "run.json", tmp_path / "baseline.json"
+        argv = ["protocol", "--min-time", "0.01", "--fleet-size", "16", "--output", str(output)]
+        assert main(argv + ["--baseline", str(baseline), "--save-baseline"]) == 0
+
+        data = json.loads(baseline.read_text())
+        assert data["environment"]["cpu_count"]
+        assert set(data["results"]) == {
+            "protocol.binary_dicts.n16",
+            "protocol.fleet_arrays.n16",
+            "protocol.delta_float16.n16",
+        }
+        for entry in data["results"].values():
+            entry["value"] /= 100.0  # pretend the baseline was 100x faster
+        baseline.write_text(json.dumps(data))
+        assert main(argv + ["--baseline", str(baseline)]) == 1
+        assert json.loads(output.read_text())["results"]
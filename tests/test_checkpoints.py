@@ -0,0 +1,113 @@
+import itertools
+import json
+import os
+import numpy as np
+from stable_baselines3 import PPO
+from stable_baselines3.common.callbacks import EvalCallback
+from stable_baselines3.common.vec_env import VecMonitor, VecNormalize
+
+from backend.envs import RocketLandingVecEnv
+from backend.rl.checkpoints import (
+    AtomicCheckpointCallback,
+    find_latest_checkpoint,
+    restore_eval_history,
+)
+
+
+def make_model(env):
+    return PPO(
+        "MlpPolicy", env, n_steps=16, batch_size=16, n_epochs=1,
+        learning_rate=lambda progress: 1e-3 * progress,
+        policy_kwargs=dict(net_arch=[8]), seed=0, device="cpu",
+    )
+
+
+def find_checkpoints_steps(path):
+    return [int(name.split("_")[1]) for name in os.listdir(path) if name.endswith("_steps.zip")]
+
+
+def make_env():
+    return VecNormalize(VecMonitor(RocketLandingVecEnv(2, seed=0)))
+
+
+class TestAtomicCheckpoints:
+
+    def test_step_budget_and_pruning(self, tmp_path):
+        env = make_env()
+        model = make_model(env)
+        callback = AtomicCheckpointCallback(
+            save_freq=8, save_path=str(tmp_path), name_prefix="ppo", keep_last=2
+        )
+        model.learn(64, callback=callback)  # 32 calls: steps 16, 32, 48 and 64
+        assert sorted(os.listdir(tmp_path)) == [
+            "latest.json",
+            "ppo_48_steps.zip", "ppo_64_steps.zip",
+            "ppo_vecnormalize_48_steps.pkl", "ppo_vecnormalize_64_steps.pkl",
+        ]
+        assert json.loads((tmp_path / "latest.json").read_text())["timesteps"] == 64
+        assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+        env.close()
+
+    def test_time_budget(self, tmp_path):
+        ticks = itertools.count(0, 10)  # the clock advances 10 s per reading
+        env = make_env()
+        model = make_model(env)
+        callback = AtomicCheckpointCallback(
+            save_freq=0, save_path=str(tmp_path), name_prefix="ppo",
+            save_interval=100.0, clock=lambda: next(ticks),
+        )
+        model.learn(64, callback=callback)
+        saved = sorted(find_checkpoints_steps(tmp_path))
+        assert saved == [20, 40, 60]
+        env.close()
+
+    def test_resume_restores_counters_and_normalizer(self, tmp_path):
+        env = make_env()
+        model = make_model(env)
+        callback = AtomicCheckpointCallback(16, str(tmp_path), name_prefix="ppo")
+        model.learn(32, callback=callback)
+        checkpoint = find_latest_checkpoint(str(tmp_path), "ppo")
+        assert checkpoint["timesteps"] == 32
+
+        resumed_env = VecNormalize.load(checkpoint["vecnormalize"], VecMonitor(RocketLandingVecEnv(2)))
+        resumed = PPO.load(checkpoint["model"], env=resumed_env, device="cpu")
+        assert resumed.num_timesteps == 32
+        assert resumed_env.obs_rms.count == env.obs_rms.count
+        np.testing.assert_allclose(resumed_env.obs_rms.mean, env.obs_rms.mean)
+        for saved, loaded in zip(
+            model.policy.optimizer.state_dict()["state"].values(),
+            resumed.policy.optimizer.state_dict()["state"].values(),
+        ):
+            np.testing.assert_allclose(saved["exp_avg"], loaded["exp_avg"])
+
+        # Asking only for the remainder keeps the schedule's progress
+        resumed.learn(32, reset_num_timesteps=False)
+        assert resumed.num_timesteps == 64
+        assert resumed._current_progress_remaining == 0.0
+        env.close()
+        resumed_env.close()
+
+    def test_falls_back_to_scanning_without_latest_json(self, tmp_path):
+        for steps in (10, 20, 30):
+            (tmp_path / f"ppo_{steps}_steps.zip").write_bytes(b"")
+        for steps in (10, 20):
+            (tmp_path / f"ppo_vecnormalize_{steps}_steps.pkl").write_bytes(b"")
+        (tmp_path / "ppo_40_steps.zip.tmp").write_bytes(b"")  # interrupted save
+
+        checkpoint = find_latest_checkpoint(str(tmp_path), "ppo")
+        assert checkpoint["timesteps"] == 20  # 30 has no normalizer stats
+        assert find_latest_checkpoint(str(tmp_path / "missing"), "ppo") is None
+
+    def test_restore_eval_history(self, tmp_path):
+        np.savez(
+            tmp_path / "evaluations.npz",
+            timesteps=[100, 200],
+            results=[[1.0, 3.0], [5.0, 7.0]],
+            ep_lengths=[[10, 10], [12, 12]],
+        )
+        env = make_env()
+        callback = EvalCallback(env, log_path=str(tmp_path), verbose=0)
+        assert restore_eval_history(callback, str(tmp_path)) == 2
+        assert callback.best_mean_reward == 6.0
+        assert callback.evaluations_timesteps == [100, 200]
+        env.close()
@@ -0,0 +1,89 @@
+import os
+import pytest
+import backend.config as config_module
+from backend.config import Config, get_snapshot, reload_if_changed
+
+
+class TestConfigSnapshot:
+
+    def setup_method(self):
+        self.config = Config()
+        self.snapshot = get_snapshot()
+
+    def test_snapshot_is_shared(self):
+        assert Config().snapshot is self.snapshot
+        assert Config()._config is self.snapshot.raw
+
+    def test_typed_values_match_get(self):
+        assert self.snapshot.physics.gravity == self.config.get("environment.gravity")
+        assert self.snapshot.physics.time_step == self.config.get(
+            "simulation.time_step"
+        )
+        assert self.snapshot.landing.good.angle == self.config.get(
+            "landing.thresholds.good.angle"
+        )
+        assert self.snapshot.rewards.gamma == self.config.get("rl.rewards.gamma")
+        assert self.snapshot.rl.max_episode_steps == self.config.get(
+            "rl.max_episode_steps"
+        )
+
+    def test_snapshot_is_frozen(self):
+        with pytest.raises(Exception):
+            self.snapshot.physics.gravity = 0.0
+
+    def test_missing_key_raises(self):
+        with pytest.raises(KeyError):
+            self.config.get("environment.missing")
+
+    def test_no_reload_without_mtime_change(self):
+        assert reload_if_changed() is False
+        assert get_snapshot() is self.snapshot
+
+
+class TestConfigReload:
+
+    def setup_method(self, method):
+        self.original_path = config_module.CONFIG_PATH
+        self.original_snapshot = config_module._snapshot
+
+    def teardown_method(self, method):
+        config_module.CONFIG_PATH = self.original_path
+        config_module._snapshot = self.original_snapshot
+
+    def test_reload_on_mtime_change_notifies_listeners(self, tmp_path):
+        with open(self.original_path) as f:
+            text = f.read()
+        path = tmp_path / "config.yaml"
+        path.write_text(text)
+        config_module.CONFIG_PATH = str(path)
+        config_module._snapshot = None
+        first = get_snapshot()
+
+        seen = []
+        config_module.add_reload_listener(seen.append)
+        try:
+            path.write_text(text.replace("gravity: -9.81", "gravity: -1.62"))
+            os.utime(path, (first.mtime + 10, first.mtime + 10))
+            assert reload_if_changed() is True
+            assert get_snapshot().physics.gravity == -1.62
+            assert seen == [get_snapshot()]
+
+            # Broken file keeps the previous snapshot
+            path.write_text("environment: [")
+            os.utime(path, (first.mtime + 20, first.mtime + 20))
+            assert reload_if_changed() is False
+            assert get_snapshot().physics.gravity == -1.62
+        finally:
+            config_module.remove_reload_listener(seen.append)
+
+
+class TestConfigGet:
+
+    def test_containers_are_copies(self):
+        config = Config()
+        writer = config.get("logging.writer")
+        writer.pop("drain_timeout")
+        candidates = config.get("rl.training.autotune.candidates")
+        candidates.append("bogus")
+        assert "drain_timeout" in config.get("logging.writer")
+        assert "bogus" not in config.get("rl.training.autotune.candidates")
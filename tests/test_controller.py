@@ -0,0 +1,114 @@
+import asyncio
+import threading
+
+from backend.simulation import SimulationController
+
+
+def run_to_completion(sim, timeout=30.0):
+    """Runs `sim` at max speed on an asyncio loop and collects published frames."""
+    frames = []
+    callback_threads = set()
+
+    async def main():
+        done = asyncio.Event()
+
+        def on_frame(states, rewards, dones):
+            callback_threads.add(threading.get_ident())
+            frames.append((states, rewards, dones, sim.published_actions))
+            if all(dones):
+                done.set()
+
+        sim.start(on_frame)
+        await asyncio.wait_for(done.wait(), timeout)
+
+    asyncio.run(main())
+    return frames, callback_threads
+
+
+class TestComputePipeline:
+
+    def setup_method(self):
+        self.sim = SimulationController(4)
+        self.sim.reset()
+        self.sim.scheduler.max_speed = True
+
+    def teardown_method(self):
+        self.sim.stop()
+
+    def test_frames_arrive_in_order_on_loop_thread(self):
+        frames, threads = run_to_completion(self.sim)
+
+        assert threads == {threading.get_ident()}
+        assert frames and all(frames[-1][2])
+        # Once a rocket is done it stays done in later frames
+        for prev, cur in zip(frames, frames[1:]):
+            assert all(c or not p for p, c in zip(prev[2], cur[2]))
+        assert self.sim.frames_published == len(frames)
+        self.sim._worker.join(timeout=5.0)
+        assert not self.sim._worker.is_alive()
+
+        stats = self.sim.pipeline_stats
+        assert stats["pipeline_depth"] == 2
+        assert stats["queued_frames"] == 0
+        assert stats["steps"] >= len(frames)
+
+    def test_reset_stops_worker(self):
+        async def main():
+            self.sim.start(lambda *args: None)
+            await asyncio.sleep(0.05)
+            worker = self.sim._worker
+            self.sim.reset()
+            assert not worker.is_alive()
+            assert self.sim.pipeline_stats["queued_frames"] == 0
+            assert self.sim.rocket_steps == [0] * 4
+
+        asyncio.run(main())
+
+    def test_pause_holds_compute(self):
+        self.sim.scheduler.max_speed = False
+
+        async def main():
+            self.sim.start(lambda *args: None)
+            await asyncio.sleep(0.05)
+            self.sim.pause()
+            await asyncio.sleep(0.05)
+            steps = list(self.sim.rocket_steps)
+            await asyncio.sleep(0.1)
+            assert self.sim.rocket_steps == steps
+            assert self.sim._worker.is_alive()
+
+        asyncio.run(main())
+
+    def test_frames_carry_their_own_sim_time(self):
+        seen = []
+        self.sim.state_callback = lambda *args: seen.append(self.sim.published_sim_time)
+        actions = self.sim.prev_action_taken
+        for sim_time in (0.1, 0.2):
+            self.sim._updates.put(([None] * 4, [None] * 4, [False] * 4, actions, sim_time))
+        self.sim.sim_time = 0.5  # compute has moved on while the frames waited
+        self.sim._drain_updates()
+        assert seen == [0.1, 0.2]
+
+    def test_set_action_is_serialized_with_compute(self):
+        self.sim.set_action({"throttle": 0.7}, 1)
+        assert self.sim._select_actions()[1]["throttle"] == 0.7
+        with self.sim._action_lock:
+            # set_action from the IOLoop waits while compute holds the lock
+            writer = threading.Thread(target=self.sim.set_action, args=({"throttle": 0.2}, 2))
+            writer.start()
+            writer.join(timeout=0.1)
+            assert writer.is_alive()
+        writer.join()
+        assert self.sim.current_actions[2]["throttle"] == 0.2
+
+    def test_render_waits_for_the_frame_in_progress(self):
+        results = []
+        with self.sim._frame_lock:
+            # render from the IOLoop must not read states mid-frame
+            reader = threading.Thread(target=lambda: results.append(self.sim.render()))
+            reader.start()
+            reader.join(timeout=0.1)
+            assert reader.is_alive()
+        reader.join()
+        assert len(results[0]) == self.sim.num_rockets
+
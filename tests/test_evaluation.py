@@ -0,0 +1,55 @@
+import numpy as np
+from stable_baselines3 import PPO
+from stable_baselines3.common.callbacks import EvalCallback
+from stable_baselines3.common.vec_env import VecMonitor, VecNormalize
+
+from backend.envs import RocketLandingVecEnv
+from backend.rl.evaluation import AsyncEvalCallback, make_eval_vec_env
+
+
+def make_model():
+    train_env = VecNormalize(VecMonitor(RocketLandingVecEnv(2, seed=0)), clip_obs=10.0)
+    model = PPO(
+        "MlpPolicy", train_env, n_steps=32, batch_size=32, n_epochs=1,
+        policy_kwargs=dict(net_arch=[8]), seed=0, device="cpu",
+    )
+    return model, train_env
+
+
+class TestEvalEnv:
+
+    def test_eval_env_is_separate_and_frozen(self):
+        model, train_env = make_model()
+        eval_env = make_eval_vec_env("native", 3, seed=1)
+        assert not eval_env.training and not eval_env.norm_reward
+
+        callback = EvalCallback(eval_env, n_eval_episodes=3, eval_freq=16, verbose=0)
+        model.learn(64, callback=callback)
+
+        # Stats were copied from the training env, never updated by evaluation
+        assert eval_env.obs_rms is not train_env.obs_rms
+        assert eval_env.obs_rms.count <= train_env.obs_rms.count
+        assert np.isfinite(callback.last_mean_reward)
+        assert len(callback.evaluations_results) == 0  # no log_path given
+        eval_env.close()
+        train_env.close()
+
+
+class TestAsyncEvalCallback:
+
+    def test_results_arrive_and_best_model_is_saved(self, tmp_path):
+        model, train_env = make_model()
+        callback = AsyncEvalCallback(
+            "native", 2, n_eval_episodes=2, eval_freq=16,
+            best_model_save_path=str(tmp_path / "best"), log_path=str(tmp_path), verbose=0,
+        )
+        model.learn(64, callback=callback)
+        train_env.close()
+
+        # One evaluation per 16 calls, all collected by the end of training
+        assert callback.evaluations_timesteps == [32, 64]
+        assert all(len(r) == 2 for r in callback.evaluations_results)
+        assert (tmp_path / "best" / "best_model.zip").exists()
+        assert not (tmp_path / "best" / "candidate_model.zip").exists()
+        assert np.load(tmp_path / "evaluations.npz")["results"].shape == (2, 2)
+        PPO.load(tmp_path / "best" / "best_model.zip")
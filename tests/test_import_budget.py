@@ -0,0 +1,59 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold-start budget per entry point, in seconds. Override on slow machines.
+IMPORT_BUDGET_SECONDS = float(os.environ.get("ROCKET_IMPORT_BUDGET", "1.5"))
+
+# Modules that must only load once an RLAgent (or SB3 VecEnv) is actually used
+HEAVY_MODULES = ("torch", "stable_baselines3")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    __import__(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def probe_import(*modules):
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, *modules],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    "modules",
+    [
+        ("run",),  # server entry point
+        ("backend.envs", "backend.rl.reward"),  # SubprocVecEnv worker
+        ("backend.physics", "backend.rocket", "backend.simulation.controller"),
+    ],
+    ids=["server", "env-worker", "sim"],
+)
+def test_entry_point_import_budget(modules):
+    report = probe_import(*modules)
+    assert report["loaded"] == [], f"{modules} eagerly imported {report['loaded']}"
+    assert report["elapsed"] < IMPORT_BUDGET_SECONDS, (
+        f"Importing {modules} took {report['elapsed']:.2f}s "
+        f"(budget {IMPORT_BUDGET_SECONDS:.2f}s)"
+    )
+
+
+def test_rl_agent_resolves_lazily():
+    report = probe_import("backend.rl")
+    assert report["loaded"] == []
+    from backend.rl import RLAgent
+
+    assert RLAgent.__name__ == "RLAgent"
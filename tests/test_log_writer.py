@@ -0,0 +1,111 @@
+import json
+import logging
+import pytest
+
+from backend.logger import JsonFormatter, LogWriter, Logger, drain_log_writers
+from backend.simulation import SimulationController
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def make_writer(tmp_path, **options):
+    # Large batch and interval: the writer only runs when flushed
+    options.setdefault("batch_size", 10**6)
+    options.setdefault("flush_interval", 60.0)
+    return LogWriter(
+        str(tmp_path / "sim.log"), JsonFormatter(datefmt="%Y-%m-%d %H:%M:%S"), **options
+    )
+
+
+class TestLogWriter:
+
+    def test_records_and_steps_are_written_in_order(self, tmp_path):
+        logger = Logger(
+            file_name="writer_test.log",
+            log_dir=str(tmp_path),
+            stream_handler=False,
+            writer_options={"flush_interval": 0.05},
+        )
+        log = logger.get_logger()
+        log.info("started")
+        logger.writer.submit_step(log.name, {"step": 1, "rocket_index": 0})
+        log.warning("done")
+        assert logger.writer.flush()
+
+        lines = read_lines(tmp_path / "writer_test.log")
+        assert [line["level"] for line in lines] == ["INFO", "DEBUG", "WARNING"]
+        assert lines[1]["message"] == 'StepLog: {"step": 1, "rocket_index": 0}'
+        assert lines[1]["name"] == "writer_test.log"
+        for handler in log.handlers[:]:
+            handler.close()
+            log.removeHandler(handler)
+
+    def test_drop_policy(self, tmp_path):
+        writer = make_writer(tmp_path, policy="drop", max_queue=10)
+        accepted = [writer.submit_step("sim", {"i": i}) for i in range(15)]
+        # Warnings are never dropped
+        writer.submit(logging.makeLogRecord({"msg": "w"}), logging.WARNING)
+        writer.close()
+
+        assert accepted == [True] * 10 + [False] * 5
+        assert writer.stats["dropped"] == 5
+        assert len(read_lines(tmp_path / "sim.log")) == 11
+
+    def test_sample_policy(self, tmp_path):
+        writer = make_writer(tmp_path, policy="sample", max_queue=20, sample_every=5)
+        for i in range(100):
+            writer.submit_step("sim", {"i": i})
+        writer.close()
+
+        kept = [line["message"] for line in read_lines(tmp_path / "sim.log")]
+        # Everything until half full, then every 5th until full
+        assert len(kept) == 20
+        assert writer.stats["sampled_out"] + writer.stats["dropped"] == 80
+        assert 'StepLog: {"i": 9}' in kept and 'StepLog: {"i": 11}' not in kept
+
+    def test_block_policy_loses_nothing(self, tmp_path):
+        writer = make_writer(tmp_path, policy="block", max_queue=8, batch_size=4)
+        for i in range(200):
+            assert writer.submit_step("sim", {"i": i})
+        writer.close()
+
+        lines = read_lines(tmp_path / "sim.log")
+        assert [json.loads(line["message"][9:])["i"] for line in lines] == list(range(200))
+        assert writer.stats["dropped"] == 0
+        assert writer.stats["max_queued"] <= 8
+
+    def test_drain_on_shutdown(self, tmp_path):
+        writer = make_writer(tmp_path)
+        writer.submit_step("sim", {"i": 0})
+        drain_log_writers(timeout=5.0)
+        assert not writer._thread.is_alive()
+        assert len(read_lines(tmp_path / "sim.log")) == 1
+        assert not writer.submit_step("sim", {"i": 1})
+
+    def test_unknown_policy(self, tmp_path):
+        with pytest.raises(ValueError):
+            make_writer(tmp_path, policy="lossy")
+
+
+class TestControllerStepLog:
+
+    def test_step_logs_go_through_writer(self):
+        sim = SimulationController(2)
+        sim.reset()
+        sim.log_state = sim.log_reward = True
+        for _ in range(3):
+            sim.step(sim._select_actions())
+        sim.stop()
+
+        path = sim.log_writer.file_path
+        steps = [
+            json.loads(line["message"][len("StepLog: "):])
+            for line in read_lines(path)
+            if line["message"].startswith("StepLog: ")
+        ]
+        assert len(steps) == 6
+        assert {s["rocket_index"] for s in steps} == {0, 1}
+        assert "x" in steps[0]["state"] and steps[0]["action"] == "omitted"
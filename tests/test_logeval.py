@@ -0,0 +1,185 @@
+import json
+import os
+import shutil
+import time
+import numpy as np
+import pandas as pd
+
+from backend.protocol import STATE_FIELDS
+from backend.steplog import StepLogWriter
+from scripts.logeval import STATE_KEYS, SimulationLogEval
+
+
+def step_line(step, rocket_index, y, timestamp="2025-01-01 12:00:00"):
+    entry = {
+        "step": step,
+        "rocket_index": rocket_index,
+        "state": {"x": 0.0, "y": y},
+        "action": {"throttle": 0.5, "coldGas": 0.0},
+        "reward": 1.5,
+        "done": False,
+    }
+    record = {
+        "timestamp": timestamp,
+        "level": "DEBUG",
+        "name": "sim",
+        "message": "StepLog: " + json.dumps(entry),
+    }
+    return json.dumps(record) + "\n"
+
+
+def make_eval(tmp_path, **options):
+    return SimulationLogEval(
+        log_dir=str(tmp_path / "logs"),
+        output_dir=str(tmp_path / "graphs"),
+        csv_dir=str(tmp_path / "csv"),
+        **options,
+    )
+
+
+class TestLogEval:
+
+    def test_streams_json_log_across_chunks(self, tmp_path):
+        (tmp_path / "logs").mkdir()
+        path = tmp_path / "logs" / "run.log"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"timestamp": "2025-01-01 12:00:00", "message": "started"}) + "\n")
+            for step in range(1, 8):
+                for rocket_index in range(2):
+                    f.write(step_line(step, rocket_index, float(step * 10 + rocket_index)))
+            f.write("not json StepLog: {\n")
+
+        frames = make_eval(tmp_path, chunk_lines=3)._extract_log_data(str(path))
+        assert sorted(frames) == [0, 1]
+        df = frames[1]
+        assert list(df.index) == list(range(1, 8))
+        np.testing.assert_array_equal(df["y"], np.arange(1, 8) * 10 + 1)
+        assert df["action_throttle"].dtype == np.float64
+        assert df["timestamp"].iloc[0] == pd.Timestamp("2025-01-01 12:00:00")
+
+    def test_timestamps_stay_naive_local_time(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("TZ", "America/New_York")
+        time.tzset()
+        try:
+            (tmp_path / "logs").mkdir()
+            path = tmp_path / "logs" / "run.log"
+            path.write_text(step_line(1, 0, 1.0, timestamp="2025-07-01 23:30:05"))
+            df = make_eval(tmp_path)._extract_log_data(str(path))[0]
+        finally:
+            monkeypatch.undo()
+            time.tzset()
+        assert df["timestamp"].dt.tz is None
+        assert df["timestamp"].iloc[0] == pd.Timestamp("2025-07-01 23:30:05")
+
+    def test_fields_missing_on_some_lines_are_nan(self, tmp_path):
+        (tmp_path / "logs").mkdir()
+        path = tmp_path / "logs" / "run.log"
+        line = json.loads(step_line(2, 0, 5.0))
+        entry = json.loads(line["message"][9:])
+        entry["reward"] = "omitted"
+        line["message"] = "StepLog: " + json.dumps(entry)
+        path.write_text(step_line(1, 0, 1.0) + json.dumps(line) + "\n")
+
+        df = make_eval(tmp_path)._extract_log_data(str(path))[0]
+        assert df["reward"].iloc[0] == 1.5 and np.isnan(df["reward"].iloc[1])
+
+    def test_binary_step_log_and_parallel_outputs(self, tmp_path):
+        (tmp_path / "logs").mkdir()
+        writer = StepLogWriter(str(tmp_path / "logs" / "fleet.steps"), 2, dt=0.1)
+        for t in range(5):
+            states = np.full((len(STATE_FIELDS), 2), float(t))
+            writer.record_arrays(
+                states, np.ones(2), np.zeros(2), np.zeros(2),
+                np.ones(2, dtype=bool), np.zeros(2, dtype=bool),
+            )
+        writer.close()
+        (tmp_path / "logs" / "run.log").write_text(step_line(1, 0, 1.0))
+
+        evaluator = make_eval(tmp_path)
+        frames = evaluator._extract_log_data(str(tmp_path / "logs" / "fleet.steps"))
+        assert list(frames[1].index) == [1, 2, 3, 4, 5]
+        assert (frames[1]["action_throttle"] == 1.0).all()
+        # Derived columns the default plots use
+        np.testing.assert_allclose(frames[1]["speed"], np.hypot(frames[1]["vx"], frames[1]["vy"]))
+        assert (frames[1]["relativeAngle"] == frames[1]["angle"].abs()).all()
+
+        evaluator.process_all_logs(state_keys=STATE_KEYS[:3], workers=2)
+        combined = pd.read_csv(tmp_path / "csv" / "fleet" / "combined.csv")
+        assert len(combined) == 10
+        assert (tmp_path / "csv" / "run" / "R0.csv").exists()
+        assert (tmp_path / "graphs" / "fleet" / "R1.png").exists()
+
+
+class TestIncrementalLogEval:
+
+    def write_logs(self, tmp_path, names=("a", "b")):
+        (tmp_path / "logs").mkdir(exist_ok=True)
+        for name in names:
+            (tmp_path / "logs" / f"{name}.log").write_text(
+                "".join(step_line(s, r, float(s)) for s in range(1, 4) for r in range(2))
+            )
+
+    def test_unchanged_logs_are_skipped(self, tmp_path):
+        self.write_logs(tmp_path)
+        evaluator = make_eval(tmp_path)
+        keys = STATE_KEYS[:2]
+        assert evaluator.process_all_logs(keys, workers=1) == ["a.log", "b.log"]
+        assert evaluator.process_all_logs(keys, workers=1) == []
+
+        # Touched but identical content: the hash matches, nothing reruns
+        path = tmp_path / "logs" / "a.log"
+        os.utime(path, ns=(0, 10**9))
+        assert evaluator.process_all_logs(keys, workers=1) == []
+
+        with open(path, "a") as f:
+            f.write(step_line(4, 0, 4.0))
+        self.write_logs(tmp_path, names=("c",))
+        assert evaluator.process_all_logs(keys, workers=1) == ["a.log", "c.log"]
+        assert len(pd.read_csv(tmp_path / "csv" / "a" / "R0.csv")) == 4
+
+        # Different plot settings or missing outputs invalidate the cache
+        assert len(evaluator.process_all_logs(STATE_KEYS[:3], workers=1)) == 3
+        shutil.rmtree(tmp_path / "graphs" / "b")
+        assert evaluator.process_all_logs(STATE_KEYS[:3], workers=1) == ["b.log"]
+        assert evaluator.process_all_logs(STATE_KEYS[:3], incremental=False, workers=1)
+
+    def test_outputs_are_swapped_in_whole(self, tmp_path):
+        self.write_logs(tmp_path, names=("a",))
+        evaluator = make_eval(tmp_path)
+        evaluator.process_all_logs(STATE_KEYS[:2], workers=1)
+        stale = tmp_path / "graphs" / "a" / "stale.png"
+        stale.write_bytes(b"")
+
+        evaluator.process_all_logs(STATE_KEYS[:2], workers=1, incremental=False)
+        assert not stale.exists()
+        assert sorted(p.name for p in (tmp_path / "graphs" / "a").iterdir()) == [
+            "R0.png", "R1.png", "all.png",
+        ]
+        leftovers = [p.name for p in (tmp_path / "graphs").iterdir() if p.name.startswith(".")]
+        assert leftovers == [".logeval-manifest.json"]
+        combined = pd.read_csv(tmp_path / "csv" / "a" / "combined.csv")
+        assert list(combined["rocket_index"]) == [0, 0, 0, 1, 1, 1]
+
+    def test_failed_plot_keeps_previous_outputs(self, tmp_path, monkeypatch):
+        import scripts.logeval as logeval
+
+        self.write_logs(tmp_path, names=("a",))
+        evaluator = make_eval(tmp_path)
+        evaluator.process_all_logs(STATE_KEYS[:2], workers=1)
+
+        with open(tmp_path / "logs" / "a.log", "a") as f:
+            f.write(step_line(4, 0, 4.0))
+
+        def fail(*args):
+            raise RuntimeError("plot failed")
+
+        monkeypatch.setattr(logeval, "_render_combined", fail)
+        evaluator.process_all_logs(STATE_KEYS[:2], workers=1)
+        # Neither the CSVs nor the plots were replaced, and no staging is left
+        assert len(pd.read_csv(tmp_path / "csv" / "a" / "R0.csv")) == 3
+        for root in ("csv", "graphs"):
+            assert not [p for p in (tmp_path / root).iterdir() if p.name.endswith(".partial")]
+
+        monkeypatch.undo()
+        assert evaluator.process_all_logs(STATE_KEYS[:2], workers=1) == ["a.log"]
+        assert len(pd.read_csv(tmp_path / "csv" / "a" / "R0.csv")) == 4
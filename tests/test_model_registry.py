@@ -0,0 +1,103 @@
+import threading
+import time
+import pytest
+
+from backend.rl.registry import ModelRegistry, available_versions
+
+
+@pytest.fixture
+def registry():
+    return ModelRegistry(capacity=2, inference="numpy")
+
+
+class TestModelRegistry:
+
+    def test_available_versions(self):
+        assert {"v1", "v2", "v3"} <= set(available_versions())
+
+    def test_acquire_shares_one_agent(self, registry):
+        first = registry.acquire("v3")
+        second = registry.acquire("v3")
+        assert first is second
+        assert first.numpy_policy is not None
+        assert registry.refcount("v3") == 2
+
+        registry.release(first)
+        registry.release(second)
+        assert registry.refcount("v3") == 0
+        assert registry.is_cached("v3")
+
+    def test_lru_evicts_idle_agents_only(self, registry):
+        v3 = registry.acquire("v3")
+        registry.release(registry.acquire("v2"))
+        registry.release(registry.acquire("v1"))
+
+        # v2 is the least recently used idle entry; v3 is still referenced
+        assert registry.cached_versions() == ["v3", "v1"]
+        assert registry.acquire("v3") is v3
+
+        registry.release(v3)
+        registry.release(v3)
+        registry.release(registry.acquire("v2"))
+        assert registry.cached_versions() == ["v3", "v2"]
+
+    def test_concurrent_acquires_load_once(self, registry, monkeypatch):
+        loads = []
+        original_load = registry._load
+
+        def slow_load(files):
+            loads.append(files.version)
+            time.sleep(0.05)
+            return original_load(files)
+
+        monkeypatch.setattr(registry, "_load", slow_load)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(registry.acquire("v3")))
+            for _ in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert loads == ["v3"]
+        assert len(results) == 4 and all(r is results[0] for r in results)
+        assert registry.refcount("v3") == 4
+
+    def test_failed_load_is_not_cached(self, registry, monkeypatch):
+        def failing_load(files):
+            raise RuntimeError("corrupt model")
+
+        monkeypatch.setattr(registry, "_load", failing_load)
+        with pytest.raises(RuntimeError):
+            registry.acquire("v3")
+        assert registry.cached_versions() == []
+
+    def test_unknown_version(self, registry):
+        with pytest.raises(FileNotFoundError):
+            registry.acquire("v999")
+
+    def test_preload_async(self, registry):
+        registry.preload_async(["v2", "v3"]).join(timeout=30)
+        assert registry.is_cached("v2") and registry.is_cached("v3")
+        assert registry.refcount("v2") == registry.refcount("v3") == 0
+
+
+class TestControllerAgentSwap:
+
+    def test_set_agent_keeps_enabled_flag(self, registry):
+        from backend.simulation import SimulationController
+
+        sim = SimulationController(2)
+        assert not sim.agent_enabled
+
+        sim.set_agent(registry.acquire("v3"))
+        assert sim.agent_enabled and sim.agent_controlled_indices == {0, 1}
+
+        sim.agent_enabled = False
+        sim.set_agent(registry.acquire("v2"))
+        assert not sim.agent_enabled
+
+        sim.set_agent(None)
+        assert sim.rl_agent is None and not sim.agent_enabled
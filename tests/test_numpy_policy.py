@@ -0,0 +1,102 @@
+import os
+import threading
+import pytest
+import numpy as np
+from backend.rl.numpy_policy import NumpyPolicy
+from backend.rl.export import POLICY_FILE_NAME, export_policy
+
+MODEL_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "model"
+)
+
+
+def model_files(version):
+    version_dir = os.path.join(MODEL_DIR, version)
+    return (
+        os.path.join(version_dir, "best_model.zip"),
+        os.path.join(version_dir, "vecnormalize.pkl"),
+        os.path.join(version_dir, POLICY_FILE_NAME),
+    )
+
+
+class TestNumpyPolicy:
+
+    @pytest.mark.parametrize("version", ["v1", "v2", "v3"])
+    def test_matches_sb3_predict(self, version, tmp_path):
+        pytest.importorskip("stable_baselines3")
+        import pickle
+        from stable_baselines3 import PPO
+
+        model_path, stats_path, _ = model_files(version)
+        policy_path = export_policy(
+            model_path, stats_path, str(tmp_path / POLICY_FILE_NAME)
+        )
+        policy = NumpyPolicy(policy_path)
+
+        model = PPO.load(
+            model_path,
+            device="cpu",
+            custom_objects={"lr_schedule": 0.0, "clip_range": 0.0},
+        )
+        with open(stats_path, "rb") as f:
+            vec_normalize = pickle.load(f)
+
+        rng = np.random.default_rng(0)
+        obs = rng.normal(0.0, 500.0, (64, policy.obs_dim)).astype(np.float32)
+        expected, _ = model.predict(vec_normalize.normalize_obs(obs), deterministic=True)
+
+        actions = policy.predict(obs)
+        assert actions.shape == (64, 2)
+        assert np.allclose(actions, expected, atol=1e-4)
+
+    def test_committed_policy_loads_without_torch(self):
+        _, _, policy_path = model_files("v3")
+        policy = NumpyPolicy(policy_path)
+        assert policy.obs_dim == 8
+        actions = policy.predict(np.zeros(8, dtype=np.float32))
+        assert actions.shape == (1, 2)
+        assert 0.0 <= actions[0, 0] <= 1.0
+        assert -1.0 <= actions[0, 1] <= 1.0
+
+    def test_buffers_are_reused(self):
+        policy = NumpyPolicy(model_files("v3")[2])
+        policy.predict(np.zeros((32, 8), dtype=np.float32))
+        buffer = policy._scratch.obs
+        first = policy.predict(np.ones((16, 8), dtype=np.float32))
+        second = policy.predict(np.ones((16, 8), dtype=np.float32))
+        assert policy._scratch.obs is buffer
+        assert np.array_equal(first, second)
+
+    def test_shared_instance_predicts_concurrently(self):
+        policy = NumpyPolicy(model_files("v3")[2])
+        rng = np.random.default_rng(0)
+        # Different batch sizes per thread so buffer growth interleaves too
+        batches = {
+            name: [rng.normal(size=(size, 8)).astype(np.float32) for size in sizes]
+            for name, sizes in (("a", [1, 7, 64, 3, 200] * 20), ("b", [300, 2, 33, 5, 1] * 20))
+        }
+        serial = NumpyPolicy(model_files("v3")[2])
+        expected = {
+            name: [serial.predict(obs) for obs in obs_list] for name, obs_list in batches.items()
+        }
+        results = {}
+        start = threading.Barrier(2)
+
+        def run(name):
+            start.wait()
+            results[name] = [policy.predict(obs) for obs in batches[name]]
+
+        threads = [threading.Thread(target=run, args=(name,)) for name in batches]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for name in batches:
+            assert len(results[name]) == len(expected[name])
+            for got, want in zip(results[name], expected[name]):
+                assert np.array_equal(got, want)
+
+    def test_rejects_wrong_observation_size(self):
+        policy = NumpyPolicy(model_files("v3")[2])
+        with pytest.raises(ValueError):
+            policy.predict(np.zeros((4, 5), dtype=np.float32))
@@ -0,0 +1,146 @@
+import asyncio
+import numpy as np
+import pytest
+
+from backend.handler.outbox import ClientOutbox, OutboxOverflow
+from backend.protocol import BinaryProtocol, DeltaDecoder, DeltaEncoder, FleetEncoder
+
+
+class SlowSocket:
+    """Write target that only completes a write when `release()` is called."""
+
+    def __init__(self):
+        self.written = []
+        self.pending = []
+        self.fail = False
+
+    def write(self, payload, binary):
+        if self.fail:
+            raise ConnectionError("closed")
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((payload, future))
+        return future
+
+    async def release(self):
+        payload, future = self.pending.pop(0)
+        self.written.append(payload)
+        future.set_result(None)
+        await settle()
+
+    async def drain(self):
+        await settle()
+        while self.pending:
+            await self.release()
+
+
+async def settle():
+    """Lets the outbox task run until it waits on the socket again."""
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+def full_frame(i):
+    return bytes([BinaryProtocol.MSG_TELEMETRY, i])
+
+
+class TestClientOutbox:
+
+    def test_frames_coalesce_to_newest(self):
+        async def main():
+            socket = SlowSocket()
+            outbox = ClientOutbox(socket.write, max_frames=2)
+            outbox.push_frame(full_frame(0))
+            await settle()
+            for i in range(1, 10):
+                outbox.push_frame(full_frame(i))
+            await socket.drain()
+            return socket, outbox
+
+        socket, outbox = asyncio.run(main())
+        # First frame was in flight; of the rest only the newest two survive
+        assert [f[1] for f in socket.written] == [0, 8, 9]
+        assert outbox.dropped_frames == 7
+        assert outbox.max_queued <= 2
+        assert outbox.stats["sent_frames"] == 3
+
+    def test_messages_are_never_dropped_and_stay_ordered(self):
+        async def main():
+            socket = SlowSocket()
+            outbox = ClientOutbox(socket.write, max_frames=1)
+            outbox.push_message("a")
+            for i in range(5):
+                outbox.push_frame(full_frame(i))
+                outbox.push_message(f"m{i}")
+            await socket.drain()
+            return socket
+
+        socket = asyncio.run(main())
+        messages = [p for p in socket.written if isinstance(p, str)]
+        assert messages == ["a", "m0", "m1", "m2", "m3", "m4"]
+        # The newest frame comes after the message queued before it
+        assert socket.written[-2:] == [full_frame(4), "m4"]
+
+    def test_message_overflow(self):
+        async def main():
+            socket = SlowSocket()
+            outbox = ClientOutbox(socket.write, max_messages=3)
+            outbox.push_message("0")
+            await settle()  # first one goes in flight
+            for i in range(1, 4):
+                outbox.push_message(str(i))
+            with pytest.raises(OutboxOverflow):
+                outbox.push_message("x")
+
+        asyncio.run(main())
+
+    def test_dropped_delta_resyncs_on_keyframe(self):
+        encoder = DeltaEncoder(4, keyframe_interval=1000)
+        fleet = FleetEncoder(4)
+        decoder = DeltaDecoder(encoder.describe()["fields"])
+        states = np.zeros((4, 11))
+
+        async def main():
+            socket = SlowSocket()
+            outbox = ClientOutbox(
+                socket.write, max_frames=2, on_resync=encoder.request_keyframe
+            )
+            for t in range(8):
+                states[:, 1] = t
+                records = fleet.fill_arrays(
+                    states, np.zeros(4), np.zeros(4), np.zeros(4), np.zeros(4),
+                    np.ones(4, dtype=bool),
+                )
+                outbox.push_frame(encoder.encode(records, t * 0.1))
+            await socket.drain()
+            return socket, outbox
+
+        socket, outbox = asyncio.run(main())
+        assert outbox.resyncs >= 1
+        # Every frame the client receives decodes without a sequence gap
+        for frame in socket.written:
+            records = decoder.decode(frame)
+        assert socket.written[0][1] & DeltaEncoder.FLAG_KEYFRAME
+        np.testing.assert_array_equal(records["y"], 7.0)
+
+    def test_lag_metrics_and_closed_socket(self):
+        now = [0.0]
+
+        async def main():
+            socket = SlowSocket()
+            outbox = ClientOutbox(socket.write, clock=lambda: now[0])
+            outbox.push_message("a")
+            await settle()
+            now[0] = 0.25
+            await socket.release()
+            assert outbox.stats["lag_ms"] == 250.0
+
+            socket.fail = True
+            outbox.push_message("b")
+            await settle()
+            assert outbox.closed and outbox.queued == 0
+            outbox.push_frame(full_frame(1))  # ignored once closed
+            return outbox
+
+        outbox = asyncio.run(main())
+        assert outbox.stats["max_lag_ms"] == 250.0
+        assert outbox.queued == 0
@@ -0,0 +1,158 @@
+import numpy as np
+import pytest
+from backend.protocol import (
+    BinaryProtocol,
+    DeltaDecoder,
+    DeltaEncoder,
+    FleetEncoder,
+    RECORD_DTYPE,
+)
+from backend.rocket import RocketControls
+
+
+def reference_encode(states, rewards, actions, landing_statuses):
+    data = bytearray(BinaryProtocol.encode_telemetry_header())
+    for state, reward, action, status in zip(states, rewards, actions, landing_statuses):
+        data.extend(BinaryProtocol.encode_rocket_state(state, reward, action, status))
+    return bytes(data)
+
+
+class TestFleetEncoder:
+
+    def setup_method(self):
+        self.n = 6
+        self.encoder = FleetEncoder(self.n)
+        rockets = [RocketControls() for _ in range(self.n)]
+        self.states = [rocket.reset() for rocket in rockets]
+        self.rewards = [0.5 * i - 1.0 for i in range(self.n)]
+        self.actions = [
+            {"throttle": 0.1 * i, "coldGas": -0.2 * i} for i in range(self.n)
+        ]
+        self.statuses = [None] * self.n
+
+    def test_record_layout(self):
+        assert RECORD_DTYPE.itemsize == 64
+        assert len(self.encoder.encode(
+            self.states, self.rewards, self.actions, self.statuses
+        )) == 1 + 64 * self.n
+
+    def test_matches_per_rocket_encoding(self):
+        expected = reference_encode(self.states, self.rewards, self.actions, self.statuses)
+        actual = self.encoder.encode(self.states, self.rewards, self.actions, self.statuses)
+        assert actual == expected
+
+    def test_inactive_rockets_and_landing_codes(self):
+        states = list(self.states)
+        rewards = list(self.rewards)
+        states[1] = None
+        states[4] = None
+        rewards[2] = None
+        statuses = ["safe", "good", None, "ok", "unsafe", "crash"]
+        args = (states, rewards, self.actions, statuses)
+
+        actual = self.encoder.encode(*args)
+        expected = reference_encode(*args)
+        # NaN payloads compare by bit pattern, so compare the raw bytes
+        assert actual == expected
+
+        decoded = np.frombuffer(actual, dtype=RECORD_DTYPE, offset=1)
+        assert np.isnan(decoded["reward"][1])
+        assert decoded["is_active"].tolist() == [1, 0, 1, 1, 0, 1]
+        assert decoded["landing_code"].tolist() == [1, 2, 0, 3, 4, 4]
+
+    def test_buffer_reuse_does_not_leak_previous_frame(self):
+        first = self.encoder.encode(self.states, self.rewards, self.actions, self.statuses)
+        states = [None] * self.n
+        second = self.encoder.encode(states, self.rewards, self.actions, self.statuses)
+        assert second == reference_encode(states, self.rewards, self.actions, self.statuses)
+        # Returned bytes are independent of the reused buffer
+        assert first == reference_encode(
+            self.states, self.rewards, self.actions, self.statuses
+        )
+
+
+class TestDeltaProtocol:
+
+    def setup_method(self):
+        self.n = 10
+        self.fleet = FleetEncoder(self.n)
+        self.encoder = DeltaEncoder(
+            self.n, float32_fields=("x", "y", "mass", "fuelMass"), keyframe_interval=5
+        )
+        self.decoder = DeltaDecoder(self.encoder.describe()["fields"])
+        self.rockets = [RocketControls() for _ in range(self.n)]
+        self.states = [rocket.reset() for rocket in self.rockets]
+        self.actions = [{"throttle": 0.5, "coldGas": 0.0}] * self.n
+        self.statuses = [None] * self.n
+
+    def frame(self, states, rewards=None, statuses=None, sim_time=0.0):
+        rewards = rewards or [0.0] * self.n
+        records = self.fleet.fill(states, rewards, self.actions, statuses or self.statuses)
+        return records, self.encoder.encode(records, sim_time)
+
+    def test_keyframe_roundtrip(self):
+        records, frame = self.frame(self.states, sim_time=1.5)
+        decoded = self.decoder.decode(frame)
+        assert frame[1] & DeltaEncoder.FLAG_KEYFRAME
+        assert self.decoder.sim_time == 1.5
+        assert np.array_equal(decoded["x"], records["x"])
+        assert np.allclose(decoded["vy"], records["vy"], rtol=1e-3)
+        assert decoded["is_active"].tolist() == [1.0] * self.n
+
+    def test_unchanged_rockets_are_not_resent(self):
+        _, keyframe = self.frame(self.states)
+        _, repeat = self.frame(self.states)
+        header_and_masks = DeltaEncoder.HEADER.size + 2 * ((self.n + 7) // 8)
+        assert len(keyframe) == header_and_masks + self.n * self.encoder.dtype.itemsize
+        assert len(repeat) == header_and_masks
+
+        states = list(self.states)
+        states[3] = self.rockets[3].step({"throttle": 1.0, "coldGas": 0.0})[0]
+        _, delta = self.frame(states)
+        assert len(delta) == header_and_masks + self.encoder.dtype.itemsize
+
+        for frame in (keyframe, repeat, delta):
+            decoded = self.decoder.decode(frame)
+        assert np.isclose(decoded["y"][3], states[3]["y"])
+
+    def test_finished_rocket_sent_once(self):
+        self.decoder.decode(self.frame(self.states)[1])
+        states = list(self.states)
+        states[0] = None
+        statuses = ["safe"] + [None] * (self.n - 1)
+
+        _, first = self.frame(states, statuses=statuses)
+        _, second = self.frame(states, statuses=statuses)
+        decoded = self.decoder.decode(first)
+        assert decoded["landing_code"][0] == 1.0
+        assert decoded["is_active"][0] == 0.0
+        assert np.isnan(decoded["reward"][0])
+        assert len(second) == DeltaEncoder.HEADER.size + 2 * ((self.n + 7) // 8)
+
+    def test_periodic_and_requested_keyframes(self):
+        flags = [self.frame(self.states)[1][1] for _ in range(6)]
+        assert [f & 1 for f in flags] == [1, 0, 0, 0, 0, 1]
+        self.encoder.request_keyframe()
+        assert self.frame(self.states)[1][1] & 1
+
+    def test_sequence_gap_requires_keyframe(self):
+        self.decoder.decode(self.frame(self.states)[1])
+        self.frame(self.states)  # dropped
+        with pytest.raises(ValueError):
+            self.decoder.decode(self.frame(self.states)[1])
+
+        self.encoder.request_keyframe()
+        self.decoder.decode(self.frame(self.states)[1])
+
+    def test_float16_shrinks_records(self):
+        assert self.encoder.dtype.itemsize == 4 * 4 + 12 * 2
+        with pytest.raises(ValueError):
+            DeltaEncoder(self.n, precision="float8")
+
+    def test_float16_fields_saturate(self):
+        encoder = DeltaEncoder(self.n)
+        decoder = DeltaDecoder(encoder.describe()["fields"])
+        records = self.fleet.fill(self.states, [0.0] * self.n, self.actions, self.statuses)
+        decoded = decoder.decode(encoder.encode(records, 0.0))
+        assert np.isfinite(decoded["fuelMass"]).all()
+        assert decoded["fuelMass"].max() == np.finfo(np.float16).max
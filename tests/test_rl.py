@@ -0,0 +1,131 @@
+import pytest
+import numpy as np
+from backend.config import Config
+from backend.physics import BatchPhysicsEngine
+from backend.physics.batch import STATE_FIELDS
+from backend.rl import calculate_reward, calculate_reward_batch
+from backend.utils import (
+    LANDING_MESSAGES,
+    evaluate_landing,
+    evaluate_landing_batch,
+    get_landing_thresholds,
+)
+
+config = Config()
+
+
+def random_states(rng, n, y_range):
+    states = np.zeros((len(STATE_FIELDS), n))
+    limits = {
+        "x": (-60000.0, 60000.0),
+        "y": y_range,
+        "vx": (-120.0, 120.0),
+        "vy": (-120.0, 20.0),
+        "angle": (-120.0, 120.0),
+        "angularVelocity": (-20.0, 20.0),
+        "mass": (34000.0, 38000.0),
+        "fuelMass": (0.0, 410000.0),
+    }
+    for i, name in enumerate(STATE_FIELDS):
+        low, high = limits.get(name, (-5.0, 5.0))
+        states[i] = rng.uniform(low, high, n)
+    return states
+
+
+def as_dicts(states):
+    return [
+        {name: states[i, j] for i, name in enumerate(STATE_FIELDS)}
+        for j in range(states.shape[1])
+    ]
+
+
+class TestRewardBatch:
+
+    def setup_method(self):
+        self.rng = np.random.default_rng(42)
+        self.n = 500
+
+    def assert_matches_scalar(self, before, actions, after):
+        rewards, terminated, truncated = calculate_reward_batch(before, actions, after)
+        for j, (b, a) in enumerate(zip(as_dicts(before), as_dicts(after))):
+            reward, term, trunc = calculate_reward(b, actions[j], a)
+            assert rewards[j] == pytest.approx(reward, rel=1e-9, abs=1e-9)
+            assert terminated[j] == term
+            assert truncated[j] == trunc
+
+    def test_airborne_shaping_matches_scalar(self):
+        before = random_states(self.rng, self.n, (-10.0, 60000.0))
+        after = random_states(self.rng, self.n, (-10.0, 60000.0))
+        actions = self.rng.uniform([0.0, -1.0], [1.0, 1.0], (self.n, 2))
+        actions[::7, 0] = 0.05
+        actions[::11, 1] = 0.0
+        self.assert_matches_scalar(before, actions, after)
+
+    def test_ground_contact_matches_scalar(self):
+        before = random_states(self.rng, self.n, (0.2, 50.0))
+        after = random_states(self.rng, self.n, (-5.0, 0.1))
+        after[2, ::3] = self.rng.uniform(-35.0, 35.0, len(after[2, ::3]))
+        after[3, ::3] = self.rng.uniform(-35.0, 35.0, len(after[3, ::3]))
+        after[6, ::3] = self.rng.uniform(-6.0, 6.0, len(after[6, ::3]))
+        actions = self.rng.uniform([0.0, -1.0], [1.0, 1.0], (self.n, 2))
+        self.assert_matches_scalar(before, actions, after)
+
+    def test_engine_rollout_matches_scalar(self):
+        engine = BatchPhysicsEngine(8)
+        engine.load_states(as_dicts(random_states(self.rng, 8, (1800.0, 2200.0))))
+        for _ in range(30):
+            before = engine.state.copy()
+            actions = self.rng.uniform([0.0, -1.0], [1.0, 1.0], (8, 2))
+            engine.step(actions[:, 0], actions[:, 1])
+            self.assert_matches_scalar(before, actions, engine.state)
+
+    def test_rejects_bad_action_shape(self):
+        states = random_states(self.rng, 3, (0.0, 100.0))
+        with pytest.raises(ValueError):
+            calculate_reward_batch(states, np.zeros(3), states)
+
+
+class TestLandingEvaluationBatch:
+
+    def test_matches_scalar(self):
+        rng = np.random.default_rng(0)
+        vx = rng.uniform(-120.0, 120.0, 1000)
+        vy = rng.uniform(-120.0, 120.0, 1000)
+        angle = rng.uniform(-15.0, 15.0, 1000)
+        codes = evaluate_landing_batch(
+            vx, vy, angle, get_landing_thresholds(config.snapshot.landing)
+        )
+        for j in range(len(vx)):
+            expected = evaluate_landing(
+                {"vx": vx[j], "vy": vy[j], "angle": angle[j]}, config.snapshot.landing
+            )
+            assert LANDING_MESSAGES[codes[j]] == expected["landing_message"]
+
+
+class TestRewardReload:
+
+    def test_reload_applies_from_next_reset(self):
+        import dataclasses
+        from backend.rl import reward
+        from backend.rocket import RocketControls
+
+        controls = RocketControls()
+        controls.reset()
+        pinned = controls.reward_params
+        snapshot = config.snapshot
+        reloaded = dataclasses.replace(
+            snapshot, rewards=dataclasses.replace(snapshot.rewards, gamma=0.5)
+        )
+        try:
+            reward._apply_config(reloaded)
+            # The running episode keeps its constants
+            assert controls.reward_params is pinned
+            state = controls.rocket.state.copy()
+            action = np.array([0.5, 0.0])
+            assert calculate_reward(state, action, state, pinned) != calculate_reward(
+                state, action, state
+            )
+            controls.reset()
+            assert controls.reward_params.rewards.gamma == 0.5
+        finally:
+            reward._apply_config(snapshot)
@@ -0,0 +1,65 @@
+import json
+import pickle
+import pytest
+import numpy as np
+from backend.rocket import Rocket, RocketState
+
+
+class TestRocketState:
+
+    def setup_method(self):
+        self.state = RocketState(x=1.0, y=2.0, vx=3.0, vy=-4.0, angle=-7.5, mass=10.0)
+        self.state.fuelMass = 5.0
+
+    def test_missing_fields_default_to_zero(self):
+        assert self.state.ax == 0.0
+        assert self.state["angularAcceleration"] == 0.0
+
+    def test_derived_fields_are_lazy_views(self):
+        assert self.state["speed"] == pytest.approx(5.0)
+        assert self.state.get("relativeAngle") == pytest.approx(7.5)
+        assert self.state.get("totalMass") == pytest.approx(15.0)
+        self.state.vx = 0.0
+        assert self.state["speed"] == pytest.approx(4.0)
+
+    def test_mapping_api(self):
+        assert "x" in self.state and "speed" in self.state
+        assert "missing" not in self.state
+        assert self.state.get("missing", 1.5) == 1.5
+        with pytest.raises(KeyError):
+            self.state["missing"]
+        with pytest.raises(KeyError):
+            self.state["speed"] = 1.0
+
+    def test_copy_is_independent(self):
+        snapshot = self.state.copy()
+        self.state.x = 100.0
+        assert snapshot.x == 1.0
+
+    def test_to_dict_is_json_serializable(self):
+        values = json.loads(json.dumps(self.state.to_dict()))
+        assert values["vy"] == -4.0
+        assert values["totalMass"] == pytest.approx(15.0)
+
+    def test_pickle_roundtrip(self):
+        restored = pickle.loads(pickle.dumps(self.state))
+        assert restored.to_dict() == self.state.to_dict()
+
+
+class TestRocketStateInRocket:
+
+    def test_get_state_has_derived_keys(self):
+        rocket = Rocket()
+        state = rocket.get_state()
+        assert isinstance(state, dict)
+        for key in ("speed", "relativeAngle", "totalMass"):
+            assert key in state
+
+    def test_apply_action_rotates_records(self):
+        rocket = Rocket()
+        before = rocket.state
+        rocket.apply_action(0.5, 0.1)
+        assert rocket.previous_state is before
+        assert rocket.state is not before
+        assert rocket.state.fuelMass < before.fuelMass
+        assert np.isfinite(rocket.state.y)
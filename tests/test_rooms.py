@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import pytest
+
+from backend.handler.room import RoomManager, SimulationRoom
+from backend.protocol import DeltaDecoder
+
+
+class FakeSubscriber:
+    """Stands in for RocketWebSocketHandler: records what the room sends."""
+
+    def __init__(self, precision=None):
+        self.precision = precision
+        self.json = []
+        self.binary = []
+        self.send_stats = {}
+
+    def send_json(self, payload):
+        self.json.append(payload)
+
+    def send_binary(self, data):
+        self.binary.append(data)
+
+    def errors(self):
+        return [m["error"] for m in self.json if "error" in m]
+
+
+LOGGER = logging.getLogger("test_rooms")
+
+
+async def run_episode(room, owner, timeout=30.0):
+    room.sim.scheduler.max_speed = True
+    room.handle_command(owner, "start")
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not room._done_mask.all():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)  # let queued telemetry callbacks run
+
+
+class TestRoomManager:
+
+    def test_viewers_share_one_simulation(self):
+        async def main():
+            rooms = RoomManager(LOGGER)
+            owner, viewer = FakeSubscriber(), FakeSubscriber()
+            room = await rooms.join("demo", owner)
+            assert await rooms.join("demo", viewer) is room
+            assert room.subscribers == [owner, viewer]
+
+            await run_episode(room, owner)
+
+            assert owner.binary and len(owner.binary) == len(viewer.binary)
+            # Each frame is encoded once and the same bytes go to everyone
+            assert all(a is b for a, b in zip(owner.binary, viewer.binary))
+            assert owner.json[-1]["viewers"] == 2
+
+            rooms.leave(room, owner)
+            rooms.leave(room, viewer)
+            assert "demo" not in rooms.rooms
+            assert room._closed
+
+        asyncio.run(main())
+
+    def test_unnamed_connections_get_private_rooms(self):
+        async def main():
+            rooms = RoomManager(LOGGER)
+            a, b = FakeSubscriber(), FakeSubscriber()
+            room_a = await rooms.join(None, a)
+            room_b = await rooms.join(None, b)
+            assert room_a is not room_b
+            rooms.leave(room_a, a)
+            rooms.leave(room_b, b)
+            assert not rooms.rooms
+
+        asyncio.run(main())
+
+    def test_invalid_room_name(self):
+        async def main():
+            with pytest.raises(ValueError):
+                await RoomManager(LOGGER).join("../etc", FakeSubscriber())
+
+        asyncio.run(main())
+
+
+class TestRoomControl:
+
+    def test_only_owner_controls_and_ownership_passes_on(self):
+        async def main():
+            rooms = RoomManager(LOGGER)
+            owner, viewer = FakeSubscriber(), FakeSubscriber()
+            room = await rooms.join("ctl", owner)
+            await rooms.join("ctl", viewer)
+            assert owner.json[0]["room"]["owner"]
+            assert not viewer.json[0]["room"]["can_control"]
+
+            room.set_speed(viewer, 5.0)
+            room.handle_command(viewer, "start")
+            assert len(viewer.errors()) == 2
+            assert room.sim.paused and room.sim.speed == 1.0
+
+            # Read-only requests are open to viewers
+            room.handle_command(viewer, "stats")
+            assert viewer.json[-1]["stats"]["viewers"] == 2
+
+            rooms.leave(room, owner)
+            assert room.owner is viewer
+            assert viewer.json[-2]["room"]["owner"]
+            room.set_speed(viewer, 5.0)
+            assert room.sim.speed == 5.0
+            rooms.leave(room, viewer)
+
+        asyncio.run(main())
+
+    def test_anyone_policy(self):
+        async def main():
+            rooms = RoomManager(LOGGER, control="anyone")
+            owner, viewer = FakeSubscriber(), FakeSubscriber()
+            room = await rooms.join("open", owner)
+            await rooms.join("open", viewer)
+            room.set_speed(viewer, 2.0)
+            assert room.sim.speed == 2.0 and not viewer.errors()
+            rooms.leave(room, owner)
+            rooms.leave(room, viewer)
+
+        asyncio.run(main())
+
+    def test_unknown_policy(self):
+        with pytest.raises(ValueError):
+            SimulationRoom("x", LOGGER, control="everyone")
+
+
+class TestRoomFormats:
+
+    def test_mixed_formats_encode_once_per_format(self):
+        async def main():
+            rooms = RoomManager(LOGGER)
+            full, delta_a, delta_b = (
+                FakeSubscriber(),
+                FakeSubscriber("float16"),
+                FakeSubscriber("float16"),
+            )
+            room = await rooms.join("mixed", full)
+            await rooms.join("mixed", delta_a)
+            await rooms.join("mixed", delta_b)
+            assert list(room.delta_encoders) == ["float16"]
+
+            await run_episode(room, full)
+
+            assert all(frame[0] == 1 for frame in full.binary)
+            assert all(a is b for a, b in zip(delta_a.binary, delta_b.binary))
+            decoder = DeltaDecoder(room.delta_encoder("float16").describe()["fields"])
+            for frame in delta_a.binary:
+                decoder.decode(frame)
+            for sub in (full, delta_a, delta_b):
+                rooms.leave(room, sub)
+
+        asyncio.run(main())
@@ -0,0 +1,186 @@
+import pytest
+from backend.simulation.scheduler import FixedStepScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_scheduler(clock, **kwargs):
+    options = dict(dt=0.1, display_rate=30, max_steps_per_frame=5)
+    options.update(kwargs)
+    return FixedStepScheduler(clock=clock, **options)
+
+
+class TestFixedStepScheduler:
+
+    def test_real_time_step_rate(self):
+        clock = FakeClock()
+        scheduler = make_scheduler(clock)
+        steps = 0
+        for _ in range(300):  # 10 s of frames at 30 Hz
+            clock.now += 1 / 30
+            steps += scheduler.begin_frame()
+            scheduler.end_frame(0)
+        assert steps == 100
+        assert scheduler.overruns == 0
+
+    def test_time_scale(self):
+        clock = FakeClock()
+        scheduler = make_scheduler(clock, time_scale=3.0, max_steps_per_frame=50)
+        clock.now += 1.0
+        assert scheduler.begin_frame() == 30
+
+    def test_catch_up_is_capped(self):
+        clock = FakeClock()
+        scheduler = make_scheduler(clock)
+        clock.now += 2.0  # a 2 s stall would owe 20 steps
+        assert scheduler.begin_frame() == 5
+        assert scheduler.overruns == 1
+        assert scheduler.dropped_time == pytest.approx(1.5)
+        # The backlog is dropped rather than carried into the next frame
+        clock.now += 1 / 30
+        assert scheduler.begin_frame() == 0
+
+    def test_sleep_and_late_frames(self):
+        clock = FakeClock()
+        scheduler = make_scheduler(clock)
+        scheduler.begin_frame()
+        clock.now += 0.01
+        assert scheduler.end_frame(1) == pytest.approx(1 / 30 - 0.01)
+        scheduler.begin_frame()
+        clock.now += 0.1
+        assert scheduler.end_frame(1) == 0.0
+        assert scheduler.late_frames == 1
+
+    def test_reset_skips_pause_gap(self):
+        clock = FakeClock()
+        scheduler = make_scheduler(clock)
+        clock.now += 60.0
+        scheduler.reset()
+        clock.now += 0.1
+        assert scheduler.begin_frame() == 1
+        assert scheduler.overruns == 0
+
+    def test_max_speed_runs_until_frame_deadline(self):
+        clock = FakeClock()
+        scheduler = make_scheduler(clock, max_speed=True, max_steps_per_frame=1000)
+        due = scheduler.begin_frame()
+        steps = 0
+        while scheduler.step_allowed(steps, due):
+            steps += 1
+            clock.now += 0.001  # each step costs 1 ms of wall time
+        assert steps == 34
+        assert scheduler.end_frame(steps) == 0.0
+
+    def test_max_speed_ignores_the_catch_up_cap(self):
+        from backend.config import Config
+
+        config = Config()
+        clock = FakeClock()
+        scheduler = FixedStepScheduler(
+            dt=config.get("simulation.time_step"),
+            display_rate=config.get("simulation.display_rate"),
+            max_steps_per_frame=config.get("simulation.max_steps_per_frame"),
+            max_speed=True,
+            clock=clock,
+        )
+        due = scheduler.begin_frame()
+        steps = 0
+        while scheduler.step_allowed(steps, due):
+            steps += 1
+            clock.now += 0.0001
+        # Fast steps fill the whole frame interval instead of stopping at the cap
+        assert steps > scheduler.max_steps_per_frame
+        assert steps == pytest.approx(scheduler.frame_interval / 0.0001, abs=1)
+        assert scheduler.overruns == 0
+
+
+class TestControllerFrames:
+
+    def test_frame_merges_steps_and_keeps_touchdown_state(self):
+        from backend.simulation import SimulationController
+
+        sim = SimulationController(2)
+        sim.reset()
+        sim.rockets[0].rocket.state["y"] = 0.5
+        sim.rockets[0].rocket.state["vy"] = -1.0
+
+        states, rewards, dones = sim.run_frame(5)
+        assert sim._steps_this_frame == 5
+        assert dones == [True, False]
+        # Rocket 0 landed on the first step; its touchdown state is kept
+        assert states[0] is not None and rewards[0] is not None
+        assert sim.rocket_steps == [1, 5]
+        assert sim.sim_time == pytest.approx(5 * sim.dt)
+
+    def test_empty_frame(self):
+        from backend.simulation import SimulationController
+
+        sim = SimulationController(1)
+        sim.reset()
+        assert sim.run_frame(0) is None
+
+    def test_time_warp_capped_at_scheduler_limit(self, monkeypatch):
+        from backend.config import Config
+        from backend.simulation import SimulationController
+
+        get = Config.get
+        monkeypatch.setattr(
+            Config, "get",
+            lambda self, key: 200.0 if key == "simulation.max_time_scale" else get(self, key),
+        )
+        sim = SimulationController(1)
+        # 50 steps of 0.1 s per frame at 30 Hz
+        assert sim.scheduler.max_time_scale == pytest.approx(150.0)
+        assert sim.set_speed(200.0) == pytest.approx(150.0)
+
+    def test_time_warp(self):
+        from backend.simulation import SimulationController
+
+        sim = SimulationController(3)
+        sim.reset()
+        assert sim.set_speed(1000.0) == sim.max_time_scale
+        assert sim.set_speed(0.0) == sim.min_time_scale
+        assert sim.set_speed(100.0) == 100.0
+        assert sim.speed == 100.0
+
+        clock = FakeClock()
+        sim.scheduler.clock = clock
+        sim.scheduler.reset()
+        clock.now += 1 / 30
+        states, _, dones = sim.run_frame(sim.scheduler.begin_frame())
+        # 100x at 30 Hz is ~33 steps of 0.1 s coalesced into one update
+        assert sim._steps_this_frame == 33
+        assert sim.sim_time == pytest.approx(3.3)
+        assert len(states) == 3 and not any(dones)
+
+    def test_overruns_are_reported_per_streak(self):
+        from backend.simulation import SimulationController
+
+        sim = SimulationController(1)
+        logged = []
+        sim._log = lambda level, msg: logged.append(msg)
+        scheduler = sim.scheduler
+        for _ in range(100):  # sustained overload: every frame overruns
+            scheduler.frames += 1
+            scheduler.overruns += 1
+            scheduler.dropped_time += 0.5
+            sim._report_overruns()
+        assert len(logged) == 1 and "falling behind" in logged[0]
+
+        for _ in range(sim._overrun_quiet_frames):
+            scheduler.frames += 1
+            sim._report_overruns()
+        assert len(logged) == 2
+        assert "100 overrun frames, 50.00s of sim time dropped" in logged[1]
+
+        scheduler.frames += 1
+        scheduler.overruns += 1
+        sim._report_overruns()
+        sim._report_overruns(final=True)
+        assert "1 overrun frames" in logged[-1] and len(logged) == 4
@@ -0,0 +1,129 @@
+import asyncio
+import numpy as np
+import pytest
+from multiprocessing import shared_memory
+
+from backend.config import Config
+from backend.physics.batch import BatchPhysicsEngine
+from backend.protocol import FleetEncoder
+from backend.rl.reward import calculate_reward_batch
+from backend.simulation import SimulationController
+from backend.simulation.sharded import ShardedFleet
+
+
+@pytest.fixture
+def fleet():
+    fleet = ShardedFleet(10, num_workers=2, seed=7)
+    yield fleet
+    fleet.close()
+
+
+class TestShardedFleet:
+
+    def test_matches_single_process_engine(self, fleet):
+        fleet.reset()
+        reference = BatchPhysicsEngine(10)
+        reference.data[:] = fleet.engine.data
+        active = np.ones(10, dtype=bool)
+        rng = np.random.default_rng(0)
+
+        for _ in range(50):
+            actions = np.column_stack([rng.random(10), rng.uniform(-1, 1, 10)])
+            before = reference.state.copy()
+            reference.step(actions[:, 0], actions[:, 1], active)
+            expected, terminated, _ = calculate_reward_batch(
+                before, actions, reference.state
+            )
+
+            rewards, _ = fleet.step(actions[:, 0], actions[:, 1])
+
+            np.testing.assert_allclose(fleet.state, reference.state)
+            np.testing.assert_allclose(rewards[active], expected[active])
+            active &= ~terminated
+            np.testing.assert_array_equal(fleet.active, active)
+
+    def test_finished_rockets_are_frozen(self, fleet):
+        fleet.reset()
+        fleet._active[:5] = 0.0
+        frozen = fleet.state[:, :5].copy()
+
+        rewards, terminated = fleet.step(np.ones(10), np.zeros(10))
+
+        np.testing.assert_array_equal(fleet.state[:, :5], frozen)
+        assert not rewards[:5].any()
+        assert not terminated[:5].any()
+
+    def test_close_stops_workers_and_unlinks(self):
+        fleet = ShardedFleet(4, num_workers=2)
+        name = fleet._shm.name
+        fleet.reset()
+        fleet.close()
+
+        assert not any(worker.is_alive() for worker in fleet.workers)
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+        with pytest.raises(RuntimeError):
+            fleet.step(np.zeros(4), np.zeros(4))
+        fleet.close()  # idempotent
+
+    def test_dead_worker_fails_fast(self, fleet):
+        fleet.reset()
+        fleet.workers[0].terminate()
+        fleet.workers[0].join()
+        with pytest.raises(RuntimeError, match="died"):
+            fleet.step(np.zeros(10), np.zeros(10))
+
+    def test_workers_capped_by_fleet_size(self):
+        with ShardedFleet(2, num_workers=8) as fleet:
+            assert fleet.num_workers == 2
+            assert fleet.bounds == [(0, 1), (1, 2)]
+
+
+class TestShardedController:
+
+    @pytest.fixture(autouse=True)
+    def sharded_config(self, monkeypatch):
+        get = Config.get
+        monkeypatch.setattr(
+            Config,
+            "get",
+            lambda self, key: 2 if key == "simulation.shard_workers" else get(self, key),
+        )
+
+    def test_frames_are_arrays_and_finish(self):
+        sim = SimulationController(6)
+        try:
+            states = sim.reset()
+            assert sim.fleet is not None and len(states) == 6
+            sim.scheduler.max_speed = True
+            frames = []
+
+            async def main():
+                done = asyncio.Event()
+
+                def on_frame(states, rewards, dones):
+                    frames.append((states, rewards, dones, sim.published_actions))
+                    if dones.all():
+                        done.set()
+
+                sim.start(on_frame)
+                await asyncio.wait_for(done.wait(), 30.0)
+
+            asyncio.run(main())
+        finally:
+            sim.close()
+
+        states, rewards, dones, actions = frames[-1]
+        assert states.shape == (11, 6)
+        assert rewards.shape == dones.shape == (6,)
+        assert actions.shape == (6, 2)
+        assert dones.all()
+        assert (sim.rocket_steps > 0).all()
+
+        # Array frames encode directly, without per-rocket dicts
+        encoder = FleetEncoder(6)
+        records = encoder.fill_arrays(
+            states.T, rewards, actions[:, 0], actions[:, 1], np.ones(6), ~dones
+        )
+        assert not records["is_active"].any()
+        assert len(encoder.tobytes()) == 1 + 6 * 64
@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from backend.protocol import STATE_FIELDS
+from backend.simulation import SimulationController
+from backend.steplog import STEP_DTYPE, StepLog, StepLogWriter
+
+
+def write_run(path, ticks=10, num_rockets=3, chunk_ticks=4):
+    writer = StepLogWriter(str(path), num_rockets, dt=0.1, chunk_ticks=chunk_ticks)
+    active = np.ones(num_rockets, dtype=bool)
+    for t in range(ticks):
+        states = np.tile(np.arange(num_rockets, dtype=float), (len(STATE_FIELDS), 1)) + t
+        done = np.zeros(num_rockets, dtype=bool)
+        if t == 4:
+            done[0] = True  # rocket 0 finishes on tick 4
+        writer.record_arrays(
+            states, np.full(num_rockets, 0.5), np.zeros(num_rockets),
+            np.full(num_rockets, float(t)), active, done,
+        )
+        active = active & ~done
+    return writer
+
+
+class TestStepLog:
+
+    def test_round_trip_views(self, tmp_path):
+        path = tmp_path / "run.steps"
+        write_run(path).close()
+
+        with StepLog(str(path)) as log:
+            assert log.num_ticks == 10 and log.num_rockets == 3
+            assert log.records.dtype == STEP_DTYPE
+            assert isinstance(log.records, np.memmap)
+            y = log.field("y")
+            assert y.shape == (10, 3)
+            np.testing.assert_array_equal(y[:, 2], np.arange(10) + 2)
+
+            # Rocket 0 is frozen after finishing on tick 4
+            rocket = log.rocket(0)
+            assert rocket.base is not None  # a view, not a copy
+            np.testing.assert_array_equal(rocket["y"][4:], 4.0)
+            np.testing.assert_array_equal(rocket["step"], [1, 2, 3, 4, 5, 5, 5, 5, 5, 5])
+            finished = log.rocket_active(0)
+            assert len(finished) == 5 and finished["done"][-1]
+            assert (log.field("rocket_index") == np.arange(3)).all()
+
+    def test_flush_appends_chunks_and_partial_tick_is_ignored(self, tmp_path):
+        path = tmp_path / "run.steps"
+        writer = write_run(path, ticks=6, chunk_ticks=4)
+        assert StepLog(str(path)).num_ticks == 4  # one chunk on disk
+        writer.flush()
+        assert StepLog(str(path)).num_ticks == 6
+        writer.close()
+
+        with open(path, "ab") as f:
+            f.write(b"\0" * (STEP_DTYPE.itemsize + 5))  # torn write
+        assert StepLog(str(path)).num_ticks == 6
+
+    def test_rocket_index_beyond_16_bits(self, tmp_path):
+        path = tmp_path / "fleet.steps"
+        num_rockets = 70_000
+        writer = StepLogWriter(str(path), num_rockets, dt=0.1, chunk_ticks=1)
+        writer.record_arrays(
+            np.zeros((len(STATE_FIELDS), num_rockets)), np.zeros(num_rockets),
+            np.zeros(num_rockets), np.zeros(num_rockets),
+            np.ones(num_rockets, dtype=bool), np.zeros(num_rockets, dtype=bool),
+        )
+        writer.close()
+        with StepLog(str(path)) as log:
+            np.testing.assert_array_equal(log.field("rocket_index")[0], np.arange(num_rockets))
+            assert "_pad" not in log.fields
+
+    def test_never_overwrites_an_existing_log(self, tmp_path):
+        path = tmp_path / "run.steps"
+        write_run(path).close()
+        with pytest.raises(FileExistsError):
+            StepLogWriter(str(path), 3, dt=0.1)
+        assert StepLog(str(path)).num_ticks == 10
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "run.log"
+        path.write_text('{"level": "INFO"}\n')
+        with pytest.raises(ValueError):
+            StepLog(str(path))
+
+
+class TestControllerBinaryStepLog:
+
+    def test_controller_records_every_tick(self):
+        sim = SimulationController(2)
+        sim.step_format = "binary"
+        sim.log_state = True
+        sim.reset()
+        for _ in range(5):
+            sim.step(sim._select_actions())
+        sim.close()
+
+        log = StepLog(sim._step_log_path)
+        assert log.num_ticks == 5
+        np.testing.assert_array_equal(log.field("step")[-1], [5, 5])
+        states = sim.render()
+        np.testing.assert_allclose(
+            log.field("y")[-1], [s["y"] for s in states], rtol=1e-6
+        )
+
+    def test_controllers_resetting_together_use_separate_logs(self):
+        sims = [SimulationController(1) for _ in range(2)]
+        for sim in sims:
+            sim.step_format = "binary"
+            sim.log_state = True
+            sim.reset()
+        assert sims[0]._step_log_path != sims[1]._step_log_path
+        assert sims[0].logger is not sims[1].logger
+        for sim in sims:
+            sim.step(sim._select_actions())
+            sim.close()
+            assert StepLog(sim._step_log_path).num_ticks == 1
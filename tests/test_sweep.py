@@ -0,0 +1,128 @@
+import os
+import numpy as np
+import pytest
+
+from backend.rl.sweep import SweepLedger, rung_budgets, run_sweep, sample_params
+
+# Tiny trials: two rungs of a few rollouts each, two short eval episodes
+TINY_SPACE = {
+    "learning_rate": {"type": "loguniform", "low": 1e-4, "high": 1e-3},
+    "n_steps": {"type": "choice", "values": [16]},
+    "batch_size": {"type": "choice", "values": [16, 64]},
+    "net_arch": {"type": "choice", "values": [[8], [8, 8]]},
+}
+TINY_SETTINGS = {
+    "vec_env": "native",
+    "n_envs": 2,
+    "min_timesteps": 32,
+    "max_timesteps": 96,
+    "reduction_factor": 3,
+    "eval_episodes": 2,
+    "seed": 0,
+}
+
+
+def make_ledger(tmp_path, reduction_factor=3):
+    return SweepLedger(str(tmp_path / "ledger.sqlite"), "test", reduction_factor)
+
+
+class TestSearchSpace:
+
+    def test_sampling_respects_the_space(self):
+        space = {
+            "learning_rate": {"type": "loguniform", "low": 1e-5, "high": 1e-2},
+            "gae_lambda": {"type": "uniform", "low": 0.9, "high": 0.99},
+            "n_steps": {"type": "int", "low": 64, "high": 128},
+            "net_arch": {"type": "choice", "values": [[64, 64], [256, 256]]},
+        }
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            params = sample_params(space, rng)
+            assert 1e-5 <= params["learning_rate"] <= 1e-2
+            assert 0.9 <= params["gae_lambda"] <= 0.99
+            assert 64 <= params["n_steps"] <= 128
+            assert params["net_arch"] in ([64, 64], [256, 256])
+
+    def test_rejects_unknown_parameters_and_types(self):
+        rng = np.random.default_rng(0)
+        with pytest.raises(ValueError):
+            sample_params({"clip_range": {"type": "uniform", "low": 0.1, "high": 0.3}}, rng)
+        with pytest.raises(ValueError):
+            sample_params({"ent_coef": {"type": "normal"}}, rng)
+
+    def test_rung_budgets(self):
+        assert rung_budgets(50_000, 1_000_000, 3) == [50_000, 150_000, 450_000, 1_000_000]
+        assert rung_budgets(100, 100, 3) == [100]
+        with pytest.raises(ValueError):
+            rung_budgets(100, 50, 3)
+
+
+class TestAshaLedger:
+
+    def test_promotes_the_top_fraction_of_each_rung(self, tmp_path):
+        ledger = make_ledger(tmp_path)
+        for trial in range(6):
+            ledger.add_trial(trial, {})
+        # Reports arrive in order; each is ranked against those already at the rung
+        decisions = [
+            ledger.report(trial, 0, 100, rate, 0.0)
+            for trial, rate in enumerate([0.5, 0.2, 0.1, 0.9, 0.3, 0.4])
+        ]
+        assert decisions == [True, False, False, True, False, False]
+        # Rungs are ranked independently
+        assert ledger.report(0, 1, 300, 0.0, 0.0)
+
+    def test_reward_breaks_landing_rate_ties(self, tmp_path):
+        ledger = make_ledger(tmp_path, reduction_factor=2)
+        for trial in range(2):
+            ledger.add_trial(trial, {})
+        assert ledger.report(0, 0, 100, 0.0, -50.0)
+        assert ledger.report(1, 0, 100, 0.0, -10.0)
+
+    def test_restart_clears_stale_reports(self, tmp_path):
+        ledger = make_ledger(tmp_path)
+        ledger.add_trial(0, {"learning_rate": 0.001})
+        ledger.start_trial(0, cpu=None)
+        ledger.report(0, 0, 100, 0.5, 1.0)
+        ledger.start_trial(0, cpu=None)
+        (trial,) = ledger.trials()
+        assert trial["timesteps"] == 0 and trial["status"] == "running"
+        assert trial["params"] == {"learning_rate": 0.001}
+        # Trial 0's old, better report no longer counts against newcomers
+        ledger.add_trial(1, {})
+        assert ledger.report(1, 0, 100, 0.4, 0.0)
+
+
+class TestRunSweep:
+
+    def test_inline_sweep_prunes_and_completes(self, tmp_path):
+        ledger = make_ledger(tmp_path)
+        done = []
+        trials = run_sweep(
+            ledger, TINY_SPACE, 3, TINY_SETTINGS, str(tmp_path), workers=1,
+            on_trial_done=lambda trial, status: done.append(status),
+        )
+        statuses = [t["status"] for t in trials]
+        assert sorted(done) == sorted(statuses)
+        # The first trial at the first rung is always promoted, so at least one finishes
+        assert "completed" in statuses and "failed" not in statuses
+        for t in trials:
+            model_path = os.path.join(tmp_path, f"trial_{t['trial']:03d}", "model.zip")
+            assert os.path.exists(model_path) == (t["status"] == "completed")
+            assert 0.0 <= t["landing_rate"] <= 1.0
+            assert t["timesteps"] >= (96 if t["status"] == "completed" else 32)
+        assert ledger.leaderboard()[0]["status"] == "completed"
+
+        # Rerunning with more trials keeps finished trials and only runs the new one
+        finished = [t["finished"] for t in trials]
+        trials = run_sweep(ledger, TINY_SPACE, 4, TINY_SETTINGS, str(tmp_path), workers=1)
+        assert len(trials) == 4
+        assert [t["finished"] for t in trials[:3]] == finished
+        assert trials[3]["status"] in ("pruned", "completed")
+
+    def test_worker_pool(self, tmp_path):
+        ledger = make_ledger(tmp_path)
+        trials = run_sweep(ledger, TINY_SPACE, 2, TINY_SETTINGS, str(tmp_path), workers=2)
+        assert "failed" not in [t["status"] for t in trials]
+        cpus = sorted(os.sched_getaffinity(0))
+        assert all(t["cpu"] in cpus for t in trials)
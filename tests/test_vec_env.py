@@ -0,0 +1,73 @@
+import pytest
+import numpy as np
+from backend.envs import RocketLandingEnv, RocketLandingVecEnv
+
+
+class TestRocketLandingVecEnv:
+
+    def setup_method(self):
+        self.num_envs = 4
+        self.vec_env = RocketLandingVecEnv(self.num_envs, seed=0)
+
+    def test_reset_shapes(self):
+        obs = self.vec_env.reset()
+        assert obs.shape == (self.num_envs, 8)
+        assert obs.dtype == np.float32
+        assert self.vec_env.observation_space.contains(obs[0])
+
+    def test_step_matches_single_env(self):
+        np.random.seed(3)
+        envs = [RocketLandingEnv() for _ in range(self.num_envs)]
+        for env in envs:
+            env.reset()
+        self.vec_env.reset()
+        self.vec_env.engine.load_states([env.rocket.state for env in envs])
+
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            actions = rng.uniform([0.0, -1.0], [1.0, 1.0], (self.num_envs, 2))
+            actions = actions.astype(np.float32)
+            obs, rewards, dones, _ = self.vec_env.step(actions)
+            for i, env in enumerate(envs):
+                env_obs, env_reward, terminated, truncated, _ = env.step(actions[i])
+                assert not dones[i]
+                assert obs[i] == pytest.approx(env_obs, rel=1e-5, abs=1e-3)
+                assert rewards[i] == pytest.approx(env_reward, rel=1e-4, abs=1e-3)
+
+    def test_auto_reset_on_truncation(self):
+        self.vec_env.reset()
+        self.vec_env.max_episode_steps = 3
+        actions = np.zeros((self.num_envs, 2), dtype=np.float32)
+        for _ in range(2):
+            _, _, dones, _ = self.vec_env.step(actions)
+            assert not dones.any()
+
+        obs, _, dones, infos = self.vec_env.step(actions)
+        assert dones.all()
+        for i, info in enumerate(infos):
+            assert info["TimeLimit.truncated"]
+            assert "terminal_observation" in info
+            assert "raw_state" in info
+            assert not np.array_equal(info["terminal_observation"], obs[i])
+        assert np.all(self.vec_env.current_steps == 0)
+
+    def test_seeded_reset_is_reproducible(self):
+        self.vec_env.seed(7)
+        first = self.vec_env.reset()
+        self.vec_env.seed(7)
+        second = self.vec_env.reset()
+        assert np.array_equal(first, second)
+
+    def test_env_method_and_set_attr_are_batch_wide(self):
+        env = RocketLandingVecEnv(3, seed=0)
+        calls = []
+        env.count_call = lambda: calls.append(1) or len(calls)
+        assert env.env_method("count_call") == [1, 1, 1]
+        assert env.env_method("count_call", indices=[2, 0, 1]) == [2, 2, 2]
+        with pytest.raises(NotImplementedError):
+            env.env_method("reset", indices=[0])
+        env.set_attr("max_episode_steps", 10)
+        assert env.get_attr("max_episode_steps", indices=[1]) == [10]
+        with pytest.raises(NotImplementedError):
+            env.set_attr("max_episode_steps", 5, indices=1)
+        env.close()